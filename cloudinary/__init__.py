@@ -1,14 +1,17 @@
 from __future__ import absolute_import
 
 import abc
+import importlib
 import logging
 import numbers
 import os
 import re
+import sys
+import threading
+from contextlib import contextmanager
 from copy import deepcopy
 from math import ceil
 
-import certifi
 from six import python_2_unicode_compatible, add_metaclass
 
 logger = logging.getLogger("Cloudinary")
@@ -21,15 +24,10 @@ from cloudinary import utils
 from cloudinary.exceptions import GeneralError
 from cloudinary.cache import responsive_breakpoints_cache
 from cloudinary.http_client import HttpClient
-from cloudinary.compat import urlparse, parse_qs
+from cloudinary.compat import urlparse, parse_qs, ContextVar
 
 from platform import python_version, platform
 
-CERT_KWARGS = {
-    'cert_reqs': 'CERT_REQUIRED',
-    'ca_certs': certifi.where(),
-}
-
 CF_SHARED_CDN = "d3jpl91pxevbkh.cloudfront.net"
 OLD_AKAMAI_SHARED_CDN = "cloudinary-a.akamaihd.net"
 AKAMAI_SHARED_CDN = "res.cloudinary.com"
@@ -111,6 +109,14 @@ class BaseConfig(object):
     def __getattr__(self, i):
         return self.__dict__.get(i)
 
+    def __setattr__(self, name, value):
+        self.__dict__[name] = value
+        self._changed()
+
+    def _changed(self):
+        """Called after the configuration is changed."""
+        pass
+
     @staticmethod
     def _is_nested_key(key):
         return re.match(r'\w+\[\w+\]', key)
@@ -173,6 +179,8 @@ class BaseConfig(object):
     def update(self, **keywords):
         for k, v in keywords.items():
             self.__dict__[k] = v
+        if keywords:
+            self._changed()
 
 
 class Config(BaseConfig):
@@ -186,6 +194,11 @@ class Config(BaseConfig):
         if not self.signature_version:
             self.signature_version = 2
 
+    def _changed(self):
+        global _config_version
+        with _config_lock:
+            _config_version += 1
+
     def _config_from_parsed_url(self, parsed_url):
         if not self._is_url_scheme_valid(parsed_url):
             raise ValueError("Invalid CLOUDINARY_URL scheme. Expecting to start with 'cloudinary://'")
@@ -218,25 +231,215 @@ class Config(BaseConfig):
             self._load_from_url(os.environ.get("CLOUDINARY_URL"))
 
 
-_config = Config()
+class _ScopedConfig(Config):
+    """
+    The configuration of a config_context.
+
+    Changing it only invalidates the snapshot of its context, the version of the global configuration is unchanged.
+    """
+    __slots__ = ("_scope",)
+
+    def _changed(self):
+        scope = self._scope
+        if scope is not None:
+            with _config_lock:
+                scope.version += 1
+
+
+class ConfigSnapshot(object):
+    """
+    An immutable copy of the configuration, taken at a given version of the configuration.
+    The version of a snapshot taken within a config_context is the version of the configuration of the context.
+
+    Reading a snapshot once per operation gives consistent values even when the configuration is changed by another
+    thread, and avoids looking up the configuration for each value. Like Config, missing values are None.
+    """
+    def __init__(self, values, version):
+        self.__dict__.update(values)
+        self.__dict__["version"] = version
+
+    def __getattr__(self, i):
+        return None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Configuration snapshots are immutable, use cloudinary.config() to change the "
+                             "configuration")
+
+    __delattr__ = __setattr__
+
+
+class _ConfigScope(object):
+    """
+    The configuration of a config_context, along with its version and its cached snapshot
+    """
+    def __init__(self, config):
+        self.config = config
+        self.version = 0
+        self.snapshot = None, None
+
+
+_config_lock = threading.RLock()
+_config_version = 0
+# Created on first use, as loading the configuration may import the Django settings
+_config = None
+_global_scope = _ConfigScope(None)
+_context_scope = ContextVar("cloudinary_config_scope", default=None)
 
 
 def config(**keywords):
+    scope = _context_scope.get()
+    if scope is not None:
+        current = scope.config
+        current.update(**keywords)
+    else:
+        if _config is None:
+            _load_config()
+
+        current = _config
+        if keywords:
+            with _config_lock:
+                current.update(**keywords)
+
+    if "url_signature_cache_size" in keywords:
+        utils.url_signature_cache.max_size = int(keywords["url_signature_cache_size"] or 0)
+    if "api_secret" in keywords:
+        utils.url_signature_cache.clear()
+
+    return current
+
+
+def _load_config():
     global _config
-    _config.update(**keywords)
-    return _config
+    with _config_lock:
+        if _config is None:
+            _config = Config()
 
 
 def reset_config():
-    global _config
-    _config = Config()
+    global _config, _config_version
+    new_config = Config()
+    with _config_lock:
+        _config = new_config
+        _config_version += 1
+    utils.url_signature_cache.clear()
+
+
+def config_version():
+    """
+    Returns the version of the configuration, which changes whenever the configuration is changed.
+
+    Values derived from the configuration can be cached along with the version they were computed at.
+    Changes to mutable values (for example, updating the auth_token dict in place) do not change the version.
+
+    :return: The version of the configuration
+    :rtype: int
+    """
+    return _config_version
+
+
+def config_snapshot():
+    """
+    Returns an immutable snapshot of the current configuration.
+
+    The snapshot is shared until the configuration changes, it is replaced atomically on the first call after a change.
+    Within a config_context, the snapshot is taken from the configuration of the context.
+
+    :return: The snapshot, with the version it was taken at
+    :rtype: ConfigSnapshot
+    """
+    current = config()
+    scope = _context_scope.get() or _global_scope
+    version = _config_version if scope is _global_scope else scope.version
+    source, snapshot = scope.snapshot
+    if source is current and snapshot.version == version:
+        return snapshot
+
+    with _config_lock:
+        version = _config_version if scope is _global_scope else scope.version
+        snapshot = ConfigSnapshot(vars(current), version)
+        scope.snapshot = current, snapshot
+
+    return snapshot
+
+
+@contextmanager
+def config_context(**overrides):
+    """
+    Overrides the configuration within a block, for the current thread or asyncio task only.
+
+    Within the block, cloudinary.config() returns a copy of the enclosing configuration with the overrides, so all the
+    calls of the block use it, and changing it does not change the configuration of other threads or tasks. Threads
+    started by the SDK (concurrent uploads, prefetched pages) inherit it. For example, to serve multiple product
+    environments from one process::
+
+        with cloudinary.config_context(cloud_name="tenant", api_key="key", api_secret="secret"):
+            cloudinary.uploader.upload(file)
+
+    Calls with different cloud names are sent over separate connection pools. Entering a context does not change the
+    version of the global configuration, so the snapshots and the values cached for it remain valid.
+
+    :param overrides: The configuration values to override.
+    :return: The configuration of the context.
+    :rtype: Config
+    """
+    scoped = _ScopedConfig.__new__(_ScopedConfig)
+    # the scope is kept in a slot, out of the configuration values
+    object.__setattr__(scoped, "_scope", None)
+    # nested values (auth_token, for example) are copied, so changing them in place does not leak out of the context
+    scoped.__dict__.update((name, deepcopy(value) if isinstance(value, (dict, list)) else value)
+                           for name, value in vars(config()).items())
+    scoped.update(**overrides)
+
+    scope = _ConfigScope(scoped)
+    object.__setattr__(scoped, "_scope", scope)
+
+    token = _context_scope.set(scope)
+    try:
+        yield scoped
+    finally:
+        _context_scope.reset(token)
 
 
 _http_client = HttpClient()
 
-# FIXME: circular import issue
-from cloudinary.search import Search
-from cloudinary.search_folders import SearchFolders
+# The submodules loaded on first access as attributes of the package
+_LAZY_SUBMODULES = frozenset(("api", "uploader", "search", "search_folders", "provisioning", "poster"))
+
+
+def _cert_kwargs():
+    import certifi
+
+    return {
+        'cert_reqs': 'CERT_REQUIRED',
+        'ca_certs': certifi.where(),
+    }
+
+
+def __getattr__(name):
+    """
+    Loads the attributes of the package on first access (PEP 562), so importing cloudinary does not import urllib3,
+    certifi or the API clients.
+    """
+    if name == "CERT_KWARGS":
+        value = _cert_kwargs()
+    elif name == "Search":
+        from cloudinary.search import Search as value
+    elif name == "SearchFolders":
+        from cloudinary.search_folders import SearchFolders as value
+    elif name in _LAZY_SUBMODULES:
+        return importlib.import_module("cloudinary." + name)
+    else:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+    globals()[name] = value
+    return value
+
+
+if sys.version_info < (3, 7):
+    # Modules do not support __getattr__ before Python 3.7
+    CERT_KWARGS = _cert_kwargs()
+    from cloudinary.search import Search
+    from cloudinary.search_folders import SearchFolders
 
 
 @python_2_unicode_compatible
@@ -316,9 +519,37 @@ class CloudinaryResource(object):
         public_id = combined_options.get('public_id') or self.public_id
         return utils.cloudinary_url(public_id, **combined_options)
 
-    def build_url(self, **options):
+    def build_url(self, template=None, **options):
+        """
+        Builds the URL of the resource.
+
+        :param template: A prepared utils.CloudinaryUrlTemplate to build the URL with. When provided, only the
+                         public_id, version and format options are accepted, overriding the ones of the resource
+        :param options:  Delivery URL and transformation options
+
+        :return: The resulting URL
+
+        :raises ValueError: In case the template does not match the resource type and type of the resource, or
+                            other options are combined with the template
+        """
+        if template is not None:
+            return self.__build_template_url(template, **options)
+
         return self.__build_url(**options)[0]
 
+    def __build_template_url(self, template, public_id=None, version=None, format=None, **options):
+        if options:
+            raise ValueError("Options cannot be combined with a URL template: {0}".format(", ".join(sorted(options))))
+
+        resource_type = self.resource_type or template.resource_type
+        if (resource_type, self.type) != (template.resource_type, template.type):
+            raise ValueError("URL template of {0}/{1} cannot build URLs of {2}/{3} resources".format(
+                template.resource_type, template.type, resource_type, self.type))
+
+        return template.url(public_id or self.public_id,
+                            version=self.version if version is None else version,
+                            format=self.format if format is None else format)
+
     @staticmethod
     def default_poster_options(options):
         options["format"] = options.get("format", "jpg")
@@ -0,0 +1,16 @@
+"""
+Asyncio interface of the SDK (Python 3 only).
+
+Awaitable Upload API, Admin API and Search API calls. The requests are built and signed like the blocking ones and
+sent by a pluggable async transport, see cloudinary.aio.transport.
+"""
+from cloudinary.aio import api, uploader
+from cloudinary.aio.search import Search
+from cloudinary.aio.search_folders import SearchFolders
+from cloudinary.aio.transport import (
+    AsyncTransport,
+    ThreadedTransport,
+    AiohttpTransport,
+    get_transport,
+    set_transport
+)
@@ -0,0 +1,162 @@
+"""
+Awaitable Admin API functions.
+
+Each function takes the arguments of its blocking counterpart in cloudinary.api, and an optional transport.
+The request is built and signed by the blocking function and sent by the async transport.
+"""
+import asyncio
+import functools
+import socket
+
+from urllib3.exceptions import HTTPError
+
+import cloudinary
+from cloudinary import api
+from cloudinary.aio.retry import call_with_retries
+from cloudinary.aio.transport import RecordedRequest, get_transport, record_request
+from cloudinary.api_client import rate_limiter, retry
+from cloudinary.api_client.execute_request import parse_response
+from cloudinary.exceptions import (
+    BadRequest,
+    AuthorizationRequired,
+    NotAllowed,
+    NotFound,
+    AlreadyExists,
+    RateLimited,
+    GeneralError
+)
+from cloudinary.utils import to_bool
+
+
+async def call(func, *args, **options):
+    """
+    Calls a blocking Admin API function asynchronously.
+
+    :param func:    The blocking Admin API function
+    :param args:    The positional arguments of the function
+    :param options: The options of the function
+    :keyword transport: The async transport sending the request, defaults to the default transport
+
+    :return: The result of the API call
+    :rtype: Response
+    """
+    transport = options.pop("transport", None) or get_transport()
+
+    conf = cloudinary.config_snapshot()
+    retry_policy = retry.RetryPolicy.from_options(options, conf)
+    paced = to_bool(options.pop("rate_limiter", conf.rate_limiter))
+    limiter = rate_limiter.get_rate_limiter(options.get("api_key", conf.api_key))
+
+    # the call is paced and retried here, without blocking the event loop
+    request = record_request(func, *args, rate_limiter=False, **options)
+    if not isinstance(request, RecordedRequest):
+        return request
+
+    async def send():
+        if paced:
+            await asyncio.sleep(limiter.reserve())
+
+        response = await transport.request(request.method, request.url, fields=request.fields, body=request.body,
+                                           headers=request.headers, timeout=request.timeout)
+        limiter.update(response)
+
+        return response
+
+    try:
+        response = await call_with_retries(send, retry_policy, request.method.upper() in retry.IDEMPOTENT_METHODS)
+    except HTTPError as e:
+        raise GeneralError("Unexpected error %s" % str(e))
+    except socket.error as e:
+        raise GeneralError("Socket Error: %s" % str(e))
+
+    return parse_response(response)
+
+
+def _awaitable(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **options):
+        return await call(func, *args, **options)
+
+    return wrapper
+
+
+ping = _awaitable(api.ping)
+usage = _awaitable(api.usage)
+config = _awaitable(api.config)
+resource_types = _awaitable(api.resource_types)
+resources = _awaitable(api.resources)
+resources_by_tag = _awaitable(api.resources_by_tag)
+resources_by_moderation = _awaitable(api.resources_by_moderation)
+resources_by_ids = _awaitable(api.resources_by_ids)
+resources_by_asset_folder = _awaitable(api.resources_by_asset_folder)
+resources_by_asset_ids = _awaitable(api.resources_by_asset_ids)
+resources_by_context = _awaitable(api.resources_by_context)
+visual_search = _awaitable(api.visual_search)
+resource = _awaitable(api.resource)
+resource_by_asset_id = _awaitable(api.resource_by_asset_id)
+update = _awaitable(api.update)
+delete_resources = _awaitable(api.delete_resources)
+delete_resources_by_asset_ids = _awaitable(api.delete_resources_by_asset_ids)
+delete_resources_by_prefix = _awaitable(api.delete_resources_by_prefix)
+delete_all_resources = _awaitable(api.delete_all_resources)
+delete_resources_by_tag = _awaitable(api.delete_resources_by_tag)
+delete_derived_resources = _awaitable(api.delete_derived_resources)
+delete_derived_by_transformation = _awaitable(api.delete_derived_by_transformation)
+delete_backed_up_assets = _awaitable(api.delete_backed_up_assets)
+add_related_assets = _awaitable(api.add_related_assets)
+add_related_assets_by_asset_ids = _awaitable(api.add_related_assets_by_asset_ids)
+delete_related_assets = _awaitable(api.delete_related_assets)
+delete_related_assets_by_asset_ids = _awaitable(api.delete_related_assets_by_asset_ids)
+tags = _awaitable(api.tags)
+transformations = _awaitable(api.transformations)
+transformation = _awaitable(api.transformation)
+delete_transformation = _awaitable(api.delete_transformation)
+update_transformation = _awaitable(api.update_transformation)
+create_transformation = _awaitable(api.create_transformation)
+publish_by_ids = _awaitable(api.publish_by_ids)
+publish_by_prefix = _awaitable(api.publish_by_prefix)
+publish_by_tag = _awaitable(api.publish_by_tag)
+upload_presets = _awaitable(api.upload_presets)
+upload_preset = _awaitable(api.upload_preset)
+delete_upload_preset = _awaitable(api.delete_upload_preset)
+update_upload_preset = _awaitable(api.update_upload_preset)
+create_upload_preset = _awaitable(api.create_upload_preset)
+root_folders = _awaitable(api.root_folders)
+subfolders = _awaitable(api.subfolders)
+create_folder = _awaitable(api.create_folder)
+rename_folder = _awaitable(api.rename_folder)
+delete_folder = _awaitable(api.delete_folder)
+restore = _awaitable(api.restore)
+restore_by_asset_ids = _awaitable(api.restore_by_asset_ids)
+upload_mappings = _awaitable(api.upload_mappings)
+upload_mapping = _awaitable(api.upload_mapping)
+delete_upload_mapping = _awaitable(api.delete_upload_mapping)
+update_upload_mapping = _awaitable(api.update_upload_mapping)
+create_upload_mapping = _awaitable(api.create_upload_mapping)
+list_streaming_profiles = _awaitable(api.list_streaming_profiles)
+get_streaming_profile = _awaitable(api.get_streaming_profile)
+delete_streaming_profile = _awaitable(api.delete_streaming_profile)
+create_streaming_profile = _awaitable(api.create_streaming_profile)
+update_streaming_profile = _awaitable(api.update_streaming_profile)
+triggers = _awaitable(api.triggers)
+create_trigger = _awaitable(api.create_trigger)
+update_trigger = _awaitable(api.update_trigger)
+delete_trigger = _awaitable(api.delete_trigger)
+test_trigger = _awaitable(api.test_trigger)
+notifications = _awaitable(api.notifications)
+ack_notifications = _awaitable(api.ack_notifications)
+list_metadata_fields = _awaitable(api.list_metadata_fields)
+metadata_field_by_field_id = _awaitable(api.metadata_field_by_field_id)
+add_metadata_field = _awaitable(api.add_metadata_field)
+update_metadata_field = _awaitable(api.update_metadata_field)
+delete_metadata_field = _awaitable(api.delete_metadata_field)
+delete_datasource_entries = _awaitable(api.delete_datasource_entries)
+update_metadata_field_datasource = _awaitable(api.update_metadata_field_datasource)
+restore_metadata_field_datasource = _awaitable(api.restore_metadata_field_datasource)
+reorder_metadata_field_datasource = _awaitable(api.reorder_metadata_field_datasource)
+reorder_metadata_fields = _awaitable(api.reorder_metadata_fields)
+list_metadata_rules = _awaitable(api.list_metadata_rules)
+add_metadata_rule = _awaitable(api.add_metadata_rule)
+update_metadata_rule = _awaitable(api.update_metadata_rule)
+delete_metadata_rule = _awaitable(api.delete_metadata_rule)
+analyze = _awaitable(api.analyze)
@@ -0,0 +1,35 @@
+import asyncio
+import socket
+
+from urllib3.exceptions import HTTPError
+
+
+async def call_with_retries(send, policy, idempotent):
+    """
+    Sends a request asynchronously, retrying it according to the policy without blocking the event loop.
+
+    See: cloudinary.api_client.retry.call_with_retries
+
+    :param send:        A coroutine function sending the request and returning its HTTP response
+    :param policy:      The retry policy
+    :type policy: cloudinary.api_client.retry.RetryPolicy
+    :param idempotent:  Whether the request can be repeated without side effects
+
+    :return: The HTTP response of the last attempt
+    :raises: The exception raised by the last attempt
+    """
+    attempt = 0
+    while True:
+        try:
+            response = await send()
+        except (HTTPError, socket.error) as e:
+            delay = policy.retry_delay(attempt, idempotent, error=e)
+            if delay is None:
+                raise
+        else:
+            delay = policy.retry_delay(attempt, idempotent, response=response)
+            if delay is None:
+                return response
+
+        await asyncio.sleep(delay)
+        attempt += 1
@@ -0,0 +1,46 @@
+import asyncio
+
+from cloudinary import search
+from cloudinary.aio import api
+from cloudinary.api_client.paginator import rate_limit_delay
+
+
+class Search(search.Search):
+    """Build and execute a search query asynchronously."""
+
+    async def execute(self, **options):
+        """Execute the search and return results."""
+        return await api.call(super(Search, self).execute, **options)
+
+    async def iterate(self, page_size=None, **options):
+        """
+        Execute the search and iterate asynchronously over the results of all pages.
+
+        Unlike cloudinary.search.Search.iterate, the pages are requested on demand, without a background thread,
+        and waiting for the rate limit to reset does not block the event loop.
+
+        :param page_size: The number of results per page, defaults to the max_results of the query,
+                          or to PAGINATION_MAX_RESULTS if not set.
+        :param options: Additional options of the API call.
+        :return: An async generator of the results (resources, or folders when searching folders).
+        """
+        query = self.as_dict()
+        next_cursor = query.pop("next_cursor", None)
+        page_size = self._page_size(query, page_size)
+
+        while True:
+            page_query = dict(query, max_results=page_size)
+            if next_cursor:
+                page_query["next_cursor"] = next_cursor
+
+            page = await api.call(self._execute, page_query, **options)
+            for item in page.get(self._endpoint) or ():
+                yield item
+
+            next_cursor = page.get("next_cursor")
+            if not next_cursor:
+                return
+
+            delay = rate_limit_delay(page)
+            if delay:
+                await asyncio.sleep(delay)
@@ -0,0 +1,240 @@
+import abc
+import asyncio
+import functools
+
+from cloudinary.api_client.connection_pools import shared_http_connector
+
+
+class TransportResponse(object):
+    """
+    The response of an async transport, exposing the attributes of a urllib3 response used by the SDK
+    """
+    def __init__(self, status, headers, data):
+        """
+        Initialize the response
+
+        :param status:  The HTTP status code
+        :param headers: The case-insensitive response headers
+        :param data:    The response body, as bytes
+        """
+        self.status = status
+        self.headers = headers
+        self.data = data
+
+
+class AsyncTransport(abc.ABC):
+    """
+    Abstract base class of the transports sending the requests of the cloudinary.aio functions.
+
+    Transports raise urllib3 HTTPError (or socket.error) on connection failures, so they are reported the same way
+    as by the blocking API.
+    """
+    @abc.abstractmethod
+    async def request(self, method, url, fields=None, body=None, headers=None, timeout=None):
+        """
+        Sends a request
+
+        :param method:  The HTTP method
+        :param url:     The URL, including the query string
+        :param fields:  The form fields of the request, a dict or a list of (name, value) tuples.
+                        File fields are (filename, data) tuples
+        :param body:    A file-like multipart body, sent instead of the fields
+        :param headers: The request headers
+        :param timeout: The timeout of the request, in seconds
+
+        :return: The response, with status, headers and data attributes
+        """
+
+    async def close(self):
+        """
+        Releases the connections of the transport
+        """
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+class ThreadedTransport(AsyncTransport):
+    """
+    Sends the requests with a blocking urllib3 connector in an executor, so they do not block the event loop.
+
+    This is the default transport, it has no additional dependencies.
+    """
+    def __init__(self, http_connector=None, executor=None):
+        """
+        Initialize the transport
+
+        :param http_connector:  The urllib3 connector, defaults to the connector shared by the blocking API clients
+        :param executor:        The executor running the requests, defaults to the default executor of the loop
+        """
+        self.http_connector = http_connector
+        self.executor = executor
+
+    async def request(self, method, url, fields=None, body=None, headers=None, timeout=None):
+        http_connector = self.http_connector or shared_http_connector()
+
+        kw = {}
+        if body is not None:
+            kw["body"] = body
+        else:
+            kw["fields"] = fields
+        if timeout is not None:
+            kw["timeout"] = timeout
+
+        request = functools.partial(http_connector.request, method=method, url=url, headers=headers, **kw)
+
+        return await asyncio.get_running_loop().run_in_executor(self.executor, request)
+
+    async def close(self):
+        if self.http_connector is not None:
+            self.http_connector.clear()
+
+
+class AiohttpTransport(AsyncTransport):
+    """
+    Sends the requests with an aiohttp client session.
+
+    Requires the aiohttp package, which is not a dependency of the SDK.
+    """
+    def __init__(self, session=None, block_size=64 * 1024):
+        """
+        Initialize the transport
+
+        :param session:     The aiohttp ClientSession, created on first use if not provided.
+                            A provided session is not closed by the transport
+        :param block_size:  The size of the blocks of streamed request bodies, in bytes
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("AiohttpTransport requires the aiohttp package")
+
+        self._aiohttp = aiohttp
+        self.session = session
+        self.block_size = block_size
+
+        self._owns_session = session is None
+
+    async def request(self, method, url, fields=None, body=None, headers=None, timeout=None):
+        from urllib3.exceptions import HTTPError, TimeoutError
+
+        aiohttp = self._aiohttp
+
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+
+        kw = {}
+        if body is not None:
+            kw["data"] = self._read_blocks(body)
+        elif fields:
+            kw["data"] = self._form_data(fields)
+        if timeout is not None:
+            kw["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        try:
+            async with self.session.request(method, url, headers=headers, **kw) as response:
+                return TransportResponse(response.status, response.headers, await response.read())
+        except asyncio.TimeoutError as e:
+            raise TimeoutError("Request timed out: {0!r}".format(e))
+        except aiohttp.ClientError as e:
+            raise HTTPError(e)
+
+    async def close(self):
+        if self.session is not None and self._owns_session:
+            await self.session.close()
+            self.session = None
+
+    def _form_data(self, fields):
+        form = self._aiohttp.FormData()
+        for name, value in fields.items() if isinstance(fields, dict) else fields:
+            if isinstance(value, tuple):
+                form.add_field(name, bytes(value[1]) if isinstance(value[1], memoryview) else value[1],
+                               filename=value[0], content_type=value[2] if len(value) > 2 else None)
+            else:
+                form.add_field(name, value if isinstance(value, (bytes, str)) else str(value))
+
+        return form
+
+    async def _read_blocks(self, body):
+        loop = asyncio.get_running_loop()
+        while True:
+            block = await loop.run_in_executor(None, body.read, self.block_size)
+            if not block:
+                break
+            yield block
+
+
+_transport = None
+
+
+def get_transport():
+    """
+    Returns the default transport of the cloudinary.aio functions
+
+    :return: The transport set by set_transport, a ThreadedTransport by default
+    :rtype: AsyncTransport
+    """
+    global _transport
+    if _transport is None:
+        _transport = ThreadedTransport()
+
+    return _transport
+
+
+def set_transport(transport):
+    """
+    Sets the default transport of the cloudinary.aio functions
+
+    :param transport: The transport, None restores the default ThreadedTransport
+    :type transport: AsyncTransport
+    """
+    global _transport
+    _transport = transport
+
+
+class RecordedRequest(Exception):
+    """
+    Raised by the request recorder instead of sending the request, carries the request
+    """
+    def __init__(self, method, url, fields=None, body=None, headers=None, timeout=None):
+        super(RecordedRequest, self).__init__(method, url)
+        self.method = method
+        self.url = url
+        self.fields = fields
+        self.body = body
+        self.headers = headers
+        self.timeout = timeout
+
+
+class _RequestRecorder(object):
+    """
+    A connector that records the request instead of sending it
+    """
+    def request(self, method, url, fields=None, headers=None, body=None, timeout=None, **_):
+        raise RecordedRequest(method, url, fields, body, headers, timeout)
+
+
+_request_recorder = _RequestRecorder()
+
+
+def record_request(func, *args, **options):
+    """
+    Runs a blocking API function up to its request, so the request can be sent by an async transport.
+
+    The function builds and signs the request exactly as it does when blocking, it must send a single request and
+    accept the http_connector option.
+
+    :param func:    The blocking API function
+    :param args:    The positional arguments of the function
+    :param options: The options of the function
+
+    :return: The recorded request, or the result of the function if it returned without sending a request
+    """
+    try:
+        return func(*args, http_connector=_request_recorder, **options)
+    except RecordedRequest as request:
+        return request
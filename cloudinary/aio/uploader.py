@@ -0,0 +1,445 @@
+"""
+Awaitable Upload API functions.
+
+The functions take the arguments of their blocking counterparts in cloudinary.uploader, and an optional transport.
+"""
+import asyncio
+import functools
+import itertools
+import socket
+
+from urllib3.exceptions import HTTPError
+
+import cloudinary
+from cloudinary import uploader, utils
+from cloudinary.aio.retry import call_with_retries
+from cloudinary.aio.transport import RecordedRequest, get_transport, record_request
+from cloudinary.api_client import retry
+from cloudinary.exceptions import Error, AuthorizationRequired
+
+
+async def upload(file, **options):
+    """
+    Uploads a file (image, video, or raw) to your Cloudinary product environment.
+
+    See: cloudinary.uploader.upload
+
+    :param file: The asset to upload (local path, file-like object, Data URI, remote URL, or bucket URL).
+    :param options: Additional options for the upload.
+    :keyword AsyncTransport transport: The async transport sending the request.
+    :return: The result of the Upload API call.
+    :rtype: dict
+    """
+    conf = cloudinary.config_snapshot()
+    params = utils.build_upload_params(conf, **options)
+    return await call_cacheable_api("upload", params, file=file, conf=conf, **options)
+
+
+async def unsigned_upload(file, upload_preset, **options):
+    """
+    Uploads an asset to Cloudinary without requiring authentication.
+
+    See: cloudinary.uploader.unsigned_upload
+
+    :param file: The asset to upload.
+    :param upload_preset: The unsigned upload preset name to use.
+    :param options: Additional options for the upload.
+    :return: The result of the Upload API call.
+    :rtype: dict
+    """
+    return await upload(file, upload_preset=upload_preset, unsigned=True, **options)
+
+
+async def upload_large(file, **options):
+    """
+    Uploads a large file (in chunks) to Cloudinary.
+
+    See: cloudinary.uploader.upload_large
+
+    The chunks are read in an executor, so reading the file does not block the event loop.
+
+    :param file: The file to upload (local path or file-like object).
+    :param options: Additional options for the upload.
+    :keyword int max_workers: The number of chunks to upload concurrently (default=1).
+    :keyword AsyncTransport transport: The async transport sending the requests.
+    :return: The result of the upload API call.
+    :rtype: dict
+    """
+    if utils.is_remote_url(file):
+        return await upload(file, **options)
+
+    if hasattr(file, 'read') and callable(file.read):
+        file_io = file
+    else:
+        file_io = uploader._open_large_file(file)
+
+    with file_io:
+        large_upload = uploader._start_large_upload(file, file_io, options)
+        upload_result = await _upload_large_chunks(large_upload, options.get("max_workers") or 1)
+
+    if large_upload.journaled_upload is not None:
+        large_upload.journaled_upload.complete()
+
+    return upload_result
+
+
+async def _upload_large_chunks(large_upload, max_workers):
+    """
+    Uploads the chunks of a large file, at most max_workers chunks at a time.
+
+    Like the blocking concurrent upload, the first chunk is uploaded alone (unless the public ID is known from the
+    journal) and the final chunk is sent once all other chunks are uploaded.
+
+    :param large_upload: The state of the upload.
+    :type large_upload: cloudinary.uploader._LargeUpload
+    :param max_workers: The number of chunks to upload concurrently.
+    :return: The result of the final chunk upload API call.
+    :rtype: dict
+    """
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max_workers)
+    errors = []
+    tasks = []
+
+    upload_result = None
+    upload_alone = not large_upload.options.get("public_id") or large_upload.journaled_upload is None
+    final_location, final_chunk = None, None
+
+    async def upload_chunk(location, chunk, chunk_options):
+        try:
+            return await _upload_chunk(large_upload, location, chunk, chunk_options)
+        except Exception as e:
+            errors.append(e)
+            raise
+        finally:
+            slots.release()
+
+    try:
+        while not errors:
+            await slots.acquire()
+            location, chunk = await loop.run_in_executor(None, large_upload.next_chunk)
+            if not chunk or large_upload.is_final():
+                # the final chunk is sent once all other chunks are uploaded
+                slots.release()
+                final_location, final_chunk = location, chunk
+                break
+
+            if upload_alone:
+                slots.release()
+                upload_result = await _upload_chunk(large_upload, location, chunk)
+                large_upload.options["public_id"] = upload_result.get("public_id")
+                upload_alone = False
+                continue
+
+            tasks.append(asyncio.ensure_future(upload_chunk(location, chunk, dict(large_upload.options))))
+            chunk = None
+
+        if tasks:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    if errors:
+        raise errors[0]
+
+    if tasks:
+        upload_result = tasks[-1].result()
+
+    if final_chunk:
+        upload_result = await _upload_chunk(large_upload, final_location, final_chunk)
+
+    return upload_result
+
+
+async def _upload_chunk(large_upload, location, chunk, options=None):
+    """
+    Uploads a single chunk, recovering once from an expired OAuth token, and acknowledges it in the journal.
+
+    See: cloudinary.uploader._upload_large_part_with_auth_retry
+    """
+    options = large_upload.options if options is None else options
+    http_headers = large_upload.chunk_headers(location, chunk)
+    file = (large_upload.file_name, chunk)
+
+    token = cloudinary.config().oauth_token
+    pinned = dict(options, oauth_token=token) if token else options
+    try:
+        upload_result = await upload_large_part(file, http_headers=http_headers, **pinned)
+    except AuthorizationRequired:
+        callback = cloudinary.config().oauth_token_refresh_callback
+        if not callback:
+            raise
+        callback(token)
+        upload_result = await upload_large_part(file, http_headers=http_headers, **options)
+
+    large_upload.acknowledge(location, chunk, upload_result)
+
+    return upload_result
+
+
+async def upload_large_part(file, **options):
+    """
+    Uploads a large chunk (part) of a file to Cloudinary.
+
+    See: cloudinary.uploader.upload_large_part
+
+    :param file: A tuple of (filename, chunk_data) for the file part to upload.
+    :param options: Additional parameters for the chunk upload.
+    :return: The result of the chunk upload API call.
+    :rtype: dict
+    """
+    conf = cloudinary.config_snapshot()
+    params = utils.build_upload_params(conf, **options)
+
+    if 'resource_type' not in options:
+        options['resource_type'] = "raw"
+
+    return await call_cacheable_api("upload", params, file=file, conf=conf, **options)
+
+
+async def explicit(public_id, **options):
+    """
+    Applies actions to already uploaded assets (raw, image, or video) via an explicit call.
+
+    See: cloudinary.uploader.explicit
+
+    :param public_id: The public ID of the asset to process.
+    :param options: Additional options for the explicit API call.
+    :return: The result of the API call.
+    :rtype: dict
+    """
+    conf = cloudinary.config_snapshot()
+    params = utils.build_upload_params(conf, **options)
+    params["public_id"] = public_id
+    return await call_cacheable_api("explicit", params, conf=conf, **options)
+
+
+async def add_tag(tag, public_ids=None, **options):
+    """
+    Adds one or more tags to the specified assets.
+
+    See: cloudinary.uploader.add_tag
+    """
+    exclusive = options.pop("exclusive", None)
+    command = "set_exclusive" if exclusive else "add"
+    return await call_tags_api(tag, command, public_ids, **options)
+
+
+async def remove_tag(tag, public_ids=None, **options):
+    """
+    Removes one or more tags from the specified assets.
+
+    See: cloudinary.uploader.remove_tag
+    """
+    return await call_tags_api(tag, "remove", public_ids, **options)
+
+
+async def replace_tag(tag, public_ids=None, **options):
+    """
+    Replaces all existing tags on the specified assets with a given tag (or tags).
+
+    See: cloudinary.uploader.replace_tag
+    """
+    return await call_tags_api(tag, "replace", public_ids, **options)
+
+
+async def remove_all_tags(public_ids, **options):
+    """
+    Removes all tags from the specified public IDs.
+
+    See: cloudinary.uploader.remove_all_tags
+    """
+    return await call_tags_api(None, "remove_all", public_ids, **options)
+
+
+async def add_context(context, public_ids, **options):
+    """
+    Adds contextual metadata (key-value pairs) to the specified assets.
+
+    See: cloudinary.uploader.add_context
+    """
+    return await call_context_api(context, "add", public_ids, **options)
+
+
+async def remove_all_context(public_ids, **options):
+    """
+    Removes all custom contextual metadata from the specified public IDs.
+
+    See: cloudinary.uploader.remove_all_context
+    """
+    return await call_context_api(None, "remove_all", public_ids, **options)
+
+
+async def call_tags_api(tag, command, public_ids=None, **options):
+    """
+    Adds/removes/replaces tags on assets.
+
+    See: cloudinary.uploader.call_tags_api
+    """
+    return await call_batched_api("tags", uploader._tags_params(tag, command, **options), public_ids, **options)
+
+
+async def call_context_api(context, command, public_ids=None, **options):
+    """
+    Adds/removes context on assets.
+
+    See: cloudinary.uploader.call_context_api
+    """
+    return await call_batched_api("context", uploader._context_params(context, command, **options), public_ids,
+                                  **options)
+
+
+async def call_batched_api(action, params, public_ids, **options):
+    """
+    Calls an Upload API action on any number of public IDs, in batches sent concurrently.
+
+    See: cloudinary.uploader.call_batched_api
+    """
+    batch_size = options.pop("batch_size", uploader.PUBLIC_IDS_BATCH_SIZE)
+    max_workers = options.pop("max_workers", uploader.PUBLIC_IDS_MAX_WORKERS)
+
+    public_id_batches = uploader._split_public_ids(public_ids, batch_size)
+    first_batch = next(public_id_batches)
+    second_batch = next(public_id_batches, None)
+    if second_batch is None:
+        result = await call_api(action, dict(params, public_ids=first_batch), **options)
+        return uploader._merge_batch_results([(first_batch, result)])
+
+    # the batches are consumed lazily, at most max_workers batches are sent at a time
+    slots = asyncio.Semaphore(max_workers)
+    tasks = []
+
+    async def call_batch(batch):
+        try:
+            return batch, await call_api(action, dict(params, public_ids=batch, timestamp=utils.now()), **options)
+        except Exception as e:
+            return batch, e
+        finally:
+            slots.release()
+
+    try:
+        for batch in itertools.chain([first_batch, second_batch], public_id_batches):
+            await slots.acquire()
+            tasks.append(asyncio.ensure_future(call_batch(batch)))
+
+        batch_results = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return uploader._merge_batch_results(batch_results)
+
+
+async def call_cacheable_api(action, params, http_headers=None, return_error=False, unsigned=False, file=None,
+                             timeout=None, conf=None, **options):
+    """
+    Calls the Upload API and caches responsive breakpoints if enabled.
+
+    See: cloudinary.uploader.call_cacheable_api
+    """
+    conf = conf or cloudinary.config_snapshot()
+    result = await call_api(action, params, http_headers, return_error, unsigned, file, timeout, conf=conf, **options)
+    if "use_cache" in options or conf.use_cache:
+        uploader._save_responsive_breakpoints_to_cache(result)
+    return result
+
+
+async def call_api(action, params, http_headers=None, return_error=False, unsigned=False, file=None, timeout=None,
+                   extra_headers=None, conf=None, **options):
+    """
+    A low-level helper to call the Cloudinary Upload API asynchronously.
+
+    See: cloudinary.uploader.call_api
+
+    :keyword AsyncTransport transport: The async transport sending the request, defaults to the default transport.
+    :return: The parsed JSON response from Cloudinary.
+    :rtype: dict
+
+    :raises Error: If an HTTP error or a Cloudinary error occurs.
+    """
+    conf = conf or cloudinary.config_snapshot()
+    transport = options.pop("transport", None) or get_transport()
+    retry_policy = retry.RetryPolicy.from_options(options, conf)
+
+    # a stream is sent again from its current position, a stream that cannot be rewound is not retried
+    position = uploader._stream_position(file)
+    if position is None and hasattr(file, 'read'):
+        retry_policy.max_retries = 0
+
+    async def send():
+        if position is not None:
+            file.seek(position)
+
+        api_url, param_list, body, headers, kw = uploader._prepare_upload_request(
+            action, params, http_headers, unsigned, file, timeout, extra_headers, conf, **options)
+
+        try:
+            return await transport.request("POST", api_url, fields=param_list, body=body, headers=headers,
+                                           timeout=kw.get("timeout"))
+        finally:
+            if body is not None:
+                body.close()
+
+    return await _send(send, retry_policy, uploader._is_idempotent_upload(action, params, http_headers),
+                       return_error)
+
+
+async def _send(send, retry_policy, idempotent, return_error=False):
+    try:
+        response = await call_with_retries(send, retry_policy, idempotent)
+    except HTTPError as e:
+        raise Error("Unexpected error - {0!r}".format(e))
+    except socket.error as e:
+        raise Error("Socket error: {0!r}".format(e))
+
+    return uploader._parse_upload_response(response, return_error)
+
+
+async def call(func, *args, **options):
+    """
+    Calls a blocking Upload API function, which does not upload a file, asynchronously.
+
+    :param func:    The blocking Upload API function
+    :param args:    The positional arguments of the function
+    :param options: The options of the function
+    :keyword transport: The async transport sending the request, defaults to the default transport
+
+    :return: The result of the API call
+    :rtype: dict
+    """
+    transport = options.pop("transport", None) or get_transport()
+    retry_policy = retry.RetryPolicy.from_options(options)
+
+    request = record_request(func, *args, **options)
+    if not isinstance(request, RecordedRequest):
+        return request
+
+    async def send():
+        return await transport.request(request.method, request.url, fields=request.fields, body=request.body,
+                                       headers=request.headers, timeout=request.timeout)
+
+    action = request.url.rsplit("/", 1)[-1]
+    idempotent = uploader._is_idempotent_upload(action, dict(request.fields or ()), request.headers)
+
+    return await _send(send, retry_policy, idempotent)
+
+
+def _awaitable(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **options):
+        return await call(func, *args, **options)
+
+    return wrapper
+
+
+destroy = _awaitable(uploader.destroy)
+rename = _awaitable(uploader.rename)
+update_metadata = _awaitable(uploader.update_metadata)
+create_archive = _awaitable(uploader.create_archive)
+create_zip = _awaitable(uploader.create_zip)
+generate_sprite = _awaitable(uploader.generate_sprite)
+multi = _awaitable(uploader.multi)
+explode = _awaitable(uploader.explode)
+text = _awaitable(uploader.text)
+create_slideshow = _awaitable(uploader.create_slideshow)
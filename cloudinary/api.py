@@ -15,6 +15,8 @@ from cloudinary.api_client.call_api import (
     _call_v2_api,
 
 )
+from cloudinary.api_client import batches
+from cloudinary.api_client.paginator import paginate
 from cloudinary.exceptions import (
     BadRequest,
     AuthorizationRequired,
@@ -123,6 +125,22 @@ def resources(**options):
     return call_json_api("get", uri, params, **options)
 
 
+def iter_resources(**options):
+    """
+    Iterates over all the resources of the product environment, across pages.
+
+    The next page is fetched on a background thread while the current one is consumed.
+    See resources() for the supported options.
+
+    :param options: The optional parameters of resources().
+    :keyword int prefetch: The number of pages fetched ahead, 0 fetches the pages on demand. Defaults to 1.
+    :keyword int max_results: The page size. Defaults to 500.
+    :return: A generator of the resources.
+    :rtype: generator
+    """
+    return paginate(resources, "resources", **options)
+
+
 def resources_by_tag(tag, **options):
     """
     Lists resources (assets) with the specified tag.
@@ -147,6 +165,24 @@ def resources_by_tag(tag, **options):
     return call_json_api("get", uri, params, **options)
 
 
+def iter_resources_by_tag(tag, **options):
+    """
+    Iterates over all the resources with the specified tag, across pages.
+
+    The next page is fetched on a background thread while the current one is consumed.
+    See resources_by_tag() for the supported options.
+
+    :param tag: The tag value.
+    :type tag: str
+    :param options: The optional parameters of resources_by_tag().
+    :keyword int prefetch: The number of pages fetched ahead, 0 fetches the pages on demand. Defaults to 1.
+    :keyword int max_results: The page size. Defaults to 500.
+    :return: A generator of the resources.
+    :rtype: generator
+    """
+    return paginate(resources_by_tag, "resources", tag, **options)
+
+
 def resources_by_moderation(kind, status, **options):
     """
     Lists resources (assets) currently in the specified moderation queue and status.
@@ -172,6 +208,26 @@ def resources_by_moderation(kind, status, **options):
     return call_json_api("get", uri, params, **options)
 
 
+def iter_resources_by_moderation(kind, status, **options):
+    """
+    Iterates over all the resources in a moderation queue, across pages.
+
+    The next page is fetched on a background thread while the current one is consumed.
+    See resources_by_moderation() for the supported options.
+
+    :param kind: Type of image moderation queue to list.
+    :type kind: str
+    :param status: Moderation status of resources.
+    :type status: str
+    :param options: The optional parameters of resources_by_moderation().
+    :keyword int prefetch: The number of pages fetched ahead, 0 fetches the pages on demand. Defaults to 1.
+    :keyword int max_results: The page size. Defaults to 500.
+    :return: A generator of the resources.
+    :rtype: generator
+    """
+    return paginate(resources_by_moderation, "resources", kind, status, **options)
+
+
 def resources_by_ids(public_ids, **options):
     """
     Lists resources (assets) with the specified public IDs.
@@ -266,6 +322,26 @@ def resources_by_context(key, value=None, **options):
     return call_json_api("get", uri, params, **options)
 
 
+def iter_resources_by_context(key, value=None, **options):
+    """
+    Iterates over all the resources with the specified contextual metadata, across pages.
+
+    The next page is fetched on a background thread while the current one is consumed.
+    See resources_by_context() for the supported options.
+
+    :param key: Only assets with this context key are returned.
+    :type key: str
+    :param value: Only assets with this context value for the specified context key are returned.
+    :type value: str
+    :param options: The optional parameters of resources_by_context().
+    :keyword int prefetch: The number of pages fetched ahead, 0 fetches the pages on demand. Defaults to 1.
+    :keyword int max_results: The page size. Defaults to 500.
+    :return: A generator of the resources.
+    :rtype: generator
+    """
+    return paginate(resources_by_context, "resources", key, value, **options)
+
+
 def __resources_params(**options):
     """
     Prepares optional parameters for resources_* API calls.
@@ -506,6 +582,89 @@ def delete_resources(public_ids, **options):
     return call_json_api("delete", uri, params, **options)
 
 
+def delete_resources_bulk(public_ids, batch_size=100, max_workers=4, **options):
+    """
+    Deletes resources (assets) given any number of public IDs.
+
+    The public IDs are split into batches deleted concurrently by delete_resources. A batch is deleted again with
+    the returned next_cursor while its result is partial.
+
+    :param public_ids: The public IDs of the resources to delete.
+    :type public_ids: iterable[str]
+    :param batch_size: The number of public IDs deleted per call. Defaults to 100, the maximum.
+    :type batch_size: int
+    :param max_workers: The number of batches deleted concurrently.
+    :type max_workers: int
+    :param options: The options of delete_resources.
+    :return: The aggregated "deleted" and "deleted_counts" of all the batches.
+    :rtype: dict
+
+    :raises Error: The error of the first failed batch. No batches are started after a failure, and the error has a
+                   partial_result attribute: the aggregated "deleted" and "deleted_counts" of the deleted resources,
+                   including the ones deleted before the failure, and "failed_batches": a list of
+                   {"public_ids": batch, "error": exception}.
+    """
+    if "http_connector" not in options:
+        options["http_connector"] = batches.pooled_http_connector(max_workers)
+
+    result = {"deleted": {}, "deleted_counts": {}}
+    failed_batches = []
+
+    def until_failure(public_id_batches):
+        for batch in public_id_batches:
+            if failed_batches:
+                return
+            yield batch
+
+    deleted_batches = batches.run_concurrently(lambda batch: _until_complete(delete_resources, batch, **options),
+                                               until_failure(batches.split(public_ids, batch_size)), max_workers)
+    for batch, batch_result in deleted_batches:
+        if isinstance(batch_result, Exception):
+            failed_batches.append({"public_ids": batch, "error": batch_result})
+            # the resources deleted before the batch failed
+            batch_result = getattr(batch_result, "partial_result", None) or {}
+
+        result["deleted"].update(batch_result.get("deleted") or {})
+        result["deleted_counts"].update(batch_result.get("deleted_counts") or {})
+
+    if failed_batches:
+        error = failed_batches[0]["error"]
+        error.partial_result = dict(result, failed_batches=failed_batches)
+        raise error
+
+    return result
+
+
+def _until_complete(func, *args, **options):
+    """
+    Calls a delete method again with the returned next_cursor while its result is partial.
+
+    :param func: The delete method.
+    :param args: The positional arguments of the method.
+    :param options: The options of the method.
+    :return: The aggregated "deleted" and "deleted_counts" of the calls.
+    :rtype: dict
+    :raises Error: The error of the failed call, with the aggregated result of the previous calls as its
+                   partial_result attribute.
+    :internal
+    """
+    result = {"deleted": {}, "deleted_counts": {}}
+    while True:
+        try:
+            call_result = func(*args, **options)
+        except Exception as e:
+            e.partial_result = result
+            raise
+
+        result["deleted"].update(call_result.get("deleted") or {})
+        result["deleted_counts"].update(call_result.get("deleted_counts") or {})
+
+        if not call_result.get("partial") or not call_result.get("next_cursor"):
+            return result
+
+        options["next_cursor"] = call_result["next_cursor"]
+
+
 def delete_resources_by_asset_ids(asset_ids, **options):
     """
     Deletes resources (assets) by asset IDs.
@@ -775,6 +934,22 @@ def tags(**options):
     return call_json_api("get", uri, only(options, "next_cursor", "max_results", "prefix"), **options)
 
 
+def iter_tags(**options):
+    """
+    Iterates over all the tags used for a specified asset type, across pages.
+
+    The next page is fetched on a background thread while the current one is consumed.
+    See tags() for the supported options.
+
+    :param options: The optional parameters of tags().
+    :keyword int prefetch: The number of pages fetched ahead, 0 fetches the pages on demand. Defaults to 1.
+    :keyword int max_results: The page size. Defaults to 500.
+    :return: A generator of the tags.
+    :rtype: generator
+    """
+    return paginate(tags, "tags", **options)
+
+
 def transformations(**options):
     """
     Lists all transformations.
@@ -793,6 +968,22 @@ def transformations(**options):
     return call_json_api("get", uri, params, **options)
 
 
+def iter_transformations(**options):
+    """
+    Iterates over all the transformations, across pages.
+
+    The next page is fetched on a background thread while the current one is consumed.
+    See transformations() for the supported options.
+
+    :param options: The optional parameters of transformations().
+    :keyword int prefetch: The number of pages fetched ahead, 0 fetches the pages on demand. Defaults to 1.
+    :keyword int max_results: The page size. Defaults to 500.
+    :return: A generator of the transformations.
+    :rtype: generator
+    """
+    return paginate(transformations, "transformations", **options)
+
+
 def transformation(transformation, **options):
     """
     Returns the details of a single transformation.
@@ -1058,6 +1249,24 @@ def subfolders(of_folder_path, **options):
     return call_json_api("get", ["folders", of_folder_path], only(options, "next_cursor", "max_results"), **options)
 
 
+def iter_subfolders(of_folder_path, **options):
+    """
+    Iterates over all the subfolders of a folder, across pages.
+
+    The next page is fetched on a background thread while the current one is consumed.
+    See subfolders() for the supported options.
+
+    :param of_folder_path: The full path of the parent folder.
+    :type of_folder_path: str
+    :param options: The optional parameters of subfolders().
+    :keyword int prefetch: The number of pages fetched ahead, 0 fetches the pages on demand. Defaults to 1.
+    :keyword int max_results: The page size. Defaults to 500.
+    :return: A generator of the folders.
+    :rtype: generator
+    """
+    return paginate(subfolders, "folders", of_folder_path, **options)
+
+
 def create_folder(path, **options):
     """
     Creates a folder at the specified path.
@@ -1166,6 +1375,22 @@ def upload_mappings(**options):
     return call_json_api("get", uri, only(options, "next_cursor", "max_results"), **options)
 
 
+def iter_upload_mappings(**options):
+    """
+    Iterates over all the upload mappings, across pages.
+
+    The next page is fetched on a background thread while the current one is consumed.
+    See upload_mappings() for the supported options.
+
+    :param options: The optional parameters of upload_mappings().
+    :keyword int prefetch: The number of pages fetched ahead, 0 fetches the pages on demand. Defaults to 1.
+    :keyword int max_results: The page size. Defaults to 500.
+    :return: A generator of the upload mappings.
+    :rtype: generator
+    """
+    return paginate(upload_mappings, "mappings", **options)
+
+
 def upload_mapping(name, **options):
     """
     Retrieves a single upload mapping by folder name.
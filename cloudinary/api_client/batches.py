@@ -0,0 +1,88 @@
+import itertools
+
+from cloudinary.api_client.connection_pools import shared_http_connector
+from cloudinary.compat import copy_context
+
+try:  # Python 3.2+
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+except ImportError:
+    ThreadPoolExecutor = None
+
+
+def split(iterable, size):
+    """
+    Splits the iterable into lists of up to size items, consuming it lazily.
+
+    :param iterable: The iterable to split.
+    :param size: The maximal number of items in each batch.
+    :return: A generator of the batches.
+    :rtype: generator
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def run_concurrently(func, items, max_workers):
+    """
+    Calls the function with each item on a pool of max_workers threads.
+
+    The items are consumed lazily, at most max_workers calls run at a time. Closing the returned generator cancels
+    the calls that have not started yet and waits for the running ones. The calls run in the context of the caller,
+    so they use the configuration of its config_context.
+
+    :param func: The function to call with each item.
+    :param items: An iterable of the items.
+    :param max_workers: The number of concurrent calls.
+    :return: A generator of (item, result) tuples, in completion order.
+             The result is the exception raised by the call if it failed.
+    :rtype: generator
+    """
+    items = iter(items)
+
+    if ThreadPoolExecutor is None or max_workers <= 1:
+        for item in items:
+            try:
+                result = func(item)
+            except Exception as e:
+                result = e
+            yield item, result
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+    try:
+        for item in itertools.islice(items, max_workers):
+            pending[executor.submit(copy_context().run, func, item)] = item
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            # keep the workers busy while the results are consumed
+            for item in itertools.islice(items, len(done)):
+                pending[executor.submit(copy_context().run, func, item)] = item
+
+            for future in done:
+                item = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = e
+                yield item, result
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def pooled_http_connector(max_workers):
+    """
+    Returns the shared HTTP connector, keeping open at least a connection per concurrent call.
+
+    :param max_workers: The number of concurrent calls.
+    :return: The shared connector.
+    """
+    return shared_http_connector(min_pool_maxsize=max_workers)
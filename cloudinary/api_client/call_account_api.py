@@ -1,11 +1,11 @@
 import cloudinary
 from cloudinary.api_client.execute_request import execute_request
 from cloudinary.provisioning.account_config import account_config
-from cloudinary.utils import get_http_connector, json_body, normalize_params
+from cloudinary.api_client.connection_pools import shared_http_connector
+from cloudinary.utils import json_body, normalize_params
 
 PROVISIONING_SUB_PATH = "provisioning"
 ACCOUNT_SUB_PATH = "accounts"
-_http = get_http_connector(account_config(), cloudinary.CERT_KWARGS)
 
 
 # Account-scoped, authenticated call: provisioning/accounts/{account_id}/...
@@ -41,8 +41,8 @@ def _account_auth(options):
 # Core transport: builds the provisioning URL and dispatches with the resolved auth.
 # The API version can be overridden via the "api_version" option (defaults to cloudinary.API_VERSION).
 def _execute_account_request(method, uri, auth, params=None, headers=None, **options):
-    prefix = options.pop("upload_prefix",
-                         cloudinary.config().upload_prefix) or "https://api.cloudinary.com"
+    conf = cloudinary.config_snapshot()
+    prefix = options.pop("upload_prefix", conf.upload_prefix) or "https://api.cloudinary.com"
     api_version = options.pop("api_version", cloudinary.API_VERSION)
     provisioning_api_url = "/".join([prefix, api_version, PROVISIONING_SUB_PATH] + uri)
 
@@ -52,10 +52,11 @@ def _execute_account_request(method, uri, auth, params=None, headers=None, **opt
         options["body"], headers = json_body(params, headers)
         params = None
 
-    return execute_request(http_connector=_http,
+    return execute_request(http_connector=shared_http_connector(account_config()),
                            method=method,
                            params=params,
                            headers=headers,
                            auth=auth,
                            api_url=provisioning_api_url,
+                           conf=conf,
                            **options)
@@ -2,10 +2,10 @@ import json
 
 import cloudinary
 from cloudinary.api_client.execute_request import execute_request
-from cloudinary.utils import get_http_connector, json_body, normalize_params
+from cloudinary.api_client.connection_pools import shared_http_connector
+from cloudinary.utils import json_body, normalize_params
 
 logger = cloudinary.logger
-_http = get_http_connector(cloudinary.config(), cloudinary.CERT_KWARGS)
 
 
 def call_metadata_api(method, uri, params, **options):
@@ -77,17 +77,19 @@ def _call_api(method, uri, params=None, body=None, headers=None, extra_headers=N
                    the cloud name in the URL (`/{api_version}/{module}/{cloud_name}/...`),
                    which is the v2 API convention. When omitted, the cloud name comes first.
     :param options: Additional options
+    :keyword http_connector: The connector performing the request, defaults to the shared connector
     :rtype: Response
     """
-    prefix = options.pop("upload_prefix",
-                         cloudinary.config().upload_prefix) or "https://api.cloudinary.com"
-    cloud_name = options.pop("cloud_name", cloudinary.config().cloud_name)
+    conf = cloudinary.config_snapshot()
+    http_connector = options.pop("http_connector", None) or shared_http_connector()
+    prefix = options.pop("upload_prefix", conf.upload_prefix) or "https://api.cloudinary.com"
+    cloud_name = options.pop("cloud_name", conf.cloud_name)
     if not cloud_name:
         raise Exception("Must supply cloud_name")
 
-    api_key = options.pop("api_key", cloudinary.config().api_key)
-    api_secret = options.pop("api_secret", cloudinary.config().api_secret)
-    oauth_token = options.pop("oauth_token", cloudinary.config().oauth_token)
+    api_key = options.pop("api_key", conf.api_key)
+    api_secret = options.pop("api_secret", conf.api_secret)
+    oauth_token = options.pop("oauth_token", conf.oauth_token)
 
     _validate_authorization(api_key, api_secret, oauth_token)
     auth = {"key": api_key, "secret": api_secret, "oauth_token": oauth_token}
@@ -101,12 +103,13 @@ def _call_api(method, uri, params=None, body=None, headers=None, extra_headers=N
     if extra_headers is not None:
         headers.update(extra_headers)
 
-    return execute_request(http_connector=_http,
+    return execute_request(http_connector=http_connector,
                            method=method,
                            params=normalize_params(params),
                            headers=headers,
                            auth=auth,
                            api_url=api_url,
+                           conf=conf,
                            **options)
 
 
@@ -0,0 +1,100 @@
+import threading
+
+import cloudinary
+from cloudinary import utils
+from cloudinary.cache.lru_cache import LRUCache
+
+# The defaults of the pool settings, configurable with cloudinary.config(num_pools=..., pool_maxsize=..., pool_block=...)
+DEFAULT_NUM_POOLS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_POOL_BLOCK = False
+
+# The number of connectors kept for distinct cloud names and connection settings, the least recently used one is
+# dropped first
+CONNECTORS_CACHE_SIZE = 64
+
+_connectors = LRUCache(CONNECTORS_CACHE_SIZE)
+_connectors_lock = threading.Lock()
+
+# The configuration snapshot, minimal pool size and connector of the last lookup of the default configuration
+_last_lookup = None
+
+
+def shared_http_connector(conf=None, min_pool_maxsize=0):
+    """
+    Returns the HTTP connector shared by all the API clients.
+
+    A connector is created on first use for each cloud name and combination of connection settings, and reused by all
+    the calls with the same cloud name and settings, so changing the configuration rebuilds the connector and changing
+    it back reuses the previous one. Each product environment served from a config_context gets its own connection
+    pools. Dropped connectors are not cleared, as calls in progress may still use them.
+
+    Lookups with the default configuration are memoized by configuration snapshot, so the connection settings are only
+    read again once the configuration changes.
+
+    The proxy and TCP keep-alive settings are read from conf, the pool settings are read from cloudinary.config():
+
+    * num_pools      - The number of connection pools (one per host) kept by the connector.
+    * pool_maxsize   - The number of connections kept open per host, should match the number of concurrent calls.
+    * pool_block     - Whether calls wait for a free connection when pool_maxsize connections are in use,
+                       instead of opening (and then discarding) additional connections.
+
+    :param conf: The configuration of the connection, defaults to cloudinary.config().
+    :param min_pool_maxsize: The minimal number of connections kept open per host, regardless of the configuration.
+    :return: The shared connector.
+    :rtype: urllib3.PoolManager
+    """
+    global _last_lookup
+
+    pool_conf = cloudinary.config_snapshot()
+    if conf is None:
+        last_lookup = _last_lookup
+        if last_lookup is not None and last_lookup[0] is pool_conf and last_lookup[1] == min_pool_maxsize:
+            return last_lookup[2]
+
+    connector = _connector(conf or pool_conf, pool_conf, min_pool_maxsize)
+
+    if conf is None:
+        _last_lookup = pool_conf, min_pool_maxsize, connector
+
+    return connector
+
+
+def _connector(conf, pool_conf, min_pool_maxsize):
+    settings = (
+        pool_conf.cloud_name,
+        conf.api_proxy,
+        bool(conf.disable_tcp_keep_alive),
+        utils.safe_cast(pool_conf.num_pools, int, None) or DEFAULT_NUM_POOLS,
+        max(utils.safe_cast(pool_conf.pool_maxsize, int, None) or DEFAULT_POOL_MAXSIZE, min_pool_maxsize),
+        utils.to_bool(pool_conf.pool_block, DEFAULT_POOL_BLOCK),
+    )
+
+    connector = _connectors.get(settings)
+    if connector is not None:
+        return connector
+
+    with _connectors_lock:
+        connector = _connectors.get(settings)
+        if connector is None:
+            num_pools, maxsize, block = settings[-3:]
+            connector = utils.get_http_connector(
+                conf, dict(cloudinary.CERT_KWARGS, num_pools=num_pools, maxsize=maxsize, block=block))
+            _connectors.set(settings, connector)
+
+    return connector
+
+
+def clear():
+    """
+    Clears and drops all the shared connectors, closing their idle connections.
+    """
+    global _last_lookup
+
+    with _connectors_lock:
+        connectors = _connectors.values()
+        _connectors.clear()
+        _last_lookup = None
+
+    for connector in connectors:
+        connector.clear()
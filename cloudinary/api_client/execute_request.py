@@ -6,6 +6,7 @@ import urllib3
 from urllib3.exceptions import HTTPError
 
 import cloudinary
+from cloudinary.api_client import rate_limiter, retry
 from cloudinary.exceptions import (
     BadRequest,
     AuthorizationRequired,
@@ -16,7 +17,7 @@ from cloudinary.exceptions import (
     GeneralError
 )
 from cloudinary.utils import process_params, safe_cast, smart_escape, unquote, normalize_params, urlencode, \
-    bracketize_seq
+    bracketize_seq, to_bool
 
 EXCEPTION_CODES = {
     400: BadRequest,
@@ -42,7 +43,7 @@ class Response(dict):
         self.request_id = response.headers.get("x-request-id")
 
 
-def execute_request(http_connector, method, params, headers, auth, api_url, **options):
+def execute_request(http_connector, method, params, headers, auth, api_url, conf=None, **options):
     anonymous = auth.get("anonymous")
     key = auth.get("key")
     secret = auth.get("secret")
@@ -58,9 +59,14 @@ def execute_request(http_connector, method, params, headers, auth, api_url, **op
     if headers is not None:
         req_headers.update(headers)
 
+    conf = conf or cloudinary.config_snapshot()
+    retry_policy = retry.RetryPolicy.from_options(options, conf)
+    limiter = rate_limiter.get_rate_limiter(key)
+    paced = to_bool(options.pop("rate_limiter", conf.rate_limiter))
+
     api_url = smart_escape(unquote(api_url))
     kw = {}
-    timeout = options.get("timeout", cloudinary.config().timeout)
+    timeout = options.get("timeout", conf.timeout)
     if timeout is not None:
         kw["timeout"] = timeout
     if "body" in options:
@@ -74,14 +80,36 @@ def execute_request(http_connector, method, params, headers, auth, api_url, **op
     else:
         processed_params = process_params(params)
 
+    def send():
+        if paced:
+            limiter.acquire()
+
+        response = http_connector.request(method=method.upper(), url=api_url, fields=processed_params,
+                                          headers=req_headers, **kw)
+        limiter.update(response)
+
+        return response
+
     try:
-        response = http_connector.request(method=method.upper(), url=api_url, fields=processed_params, headers=req_headers, **kw)
-        body = response.data
+        response = retry.call_with_retries(send, retry_policy, method.upper() in retry.IDEMPOTENT_METHODS)
     except HTTPError as e:
         raise GeneralError("Unexpected error %s" % str(e))
     except socket.error as e:
         raise GeneralError("Socket Error: %s" % str(e))
 
+    return parse_response(response)
+
+
+def parse_response(response):
+    """
+    Parses the response of an API call, raising the matching exception on errors
+
+    :param response: The HTTP response, with status, headers and data attributes
+    :return: The parsed response
+    :rtype: Response
+    """
+    body = response.data
+
     try:
         result = json.loads(body.decode('utf-8'))
     except Exception as e:
@@ -0,0 +1,148 @@
+import calendar
+import threading
+import time
+
+from six.moves import queue
+
+from cloudinary.compat import copy_context
+
+# The page size of paginated calls, unless max_results is provided. The maximal page size of the Admin API
+PAGINATION_MAX_RESULTS = 500
+
+# The number of pages fetched ahead of the consumed page
+PAGINATION_PREFETCH = 1
+
+# Pages are not fetched while the remaining rate limit is at or below the threshold, until the rate limit resets
+RATE_LIMIT_REMAINING_THRESHOLD = 0
+RATE_LIMIT_MAX_DELAY = 60 * 60
+
+
+def paginate(func, items_key, *args, **options):
+    """
+    Iterates over the items of all the pages of a cursor paginated API call.
+
+    The next pages are fetched on a background thread while the items of the current page are consumed.
+    When the rate limit of the API is exhausted, the next page is fetched once the rate limit resets.
+
+    :param func: The API function returning a single page.
+    :param items_key: The key of the list of items in each page.
+    :param args: The positional arguments of the API function.
+    :param options: The options of the API function.
+    :keyword int prefetch: The number of pages fetched ahead of the consumed page, 0 fetches the pages on demand.
+    :keyword int max_results: The page size, defaults to PAGINATION_MAX_RESULTS.
+    :return: A generator of the items of all pages.
+    :rtype: generator
+    """
+    prefetch = options.pop("prefetch", PAGINATION_PREFETCH)
+    options.setdefault("max_results", PAGINATION_MAX_RESULTS)
+
+    pages = fetch_pages(func, *args, **options)
+    if prefetch > 0:
+        pages = prefetched(pages, prefetch)
+
+    for page in pages:
+        for item in page.get(items_key) or ():
+            yield item
+
+
+def fetch_pages(func, *args, **options):
+    """
+    Fetches the pages of a cursor paginated API call on demand, waiting for the rate limit to reset when exhausted.
+
+    :param func: The API function returning a single page.
+    :param args: The positional arguments of the API function.
+    :param options: The options of the API function.
+    :return: A generator of the pages.
+    :rtype: generator
+    """
+    while True:
+        page = func(*args, **options)
+        yield page
+
+        next_cursor = page.get("next_cursor")
+        if not next_cursor:
+            return
+
+        options["next_cursor"] = next_cursor
+        wait_for_rate_limit(page)
+
+
+def wait_for_rate_limit(response):
+    """
+    Sleeps until the rate limit resets, if the response shows the rate limit is exhausted.
+
+    :param response: The last response of the API.
+    :type response: cloudinary.api_client.execute_request.Response
+    """
+    delay = rate_limit_delay(response)
+    if delay:
+        time.sleep(delay)
+
+
+def rate_limit_delay(response):
+    """
+    Returns the time to wait before the next page is fetched.
+
+    :param response: The last response of the API.
+    :type response: cloudinary.api_client.execute_request.Response
+    :return: The delay in seconds until the rate limit resets if the response shows it is exhausted, otherwise 0.
+    :rtype: float
+    """
+    remaining = getattr(response, "rate_limit_remaining", None)
+    if remaining is None or remaining > RATE_LIMIT_REMAINING_THRESHOLD:
+        return 0
+
+    reset_at = getattr(response, "rate_limit_reset_at", None)
+    if not reset_at:
+        return 0
+
+    return min(max(calendar.timegm(reset_at) - time.time(), 0), RATE_LIMIT_MAX_DELAY)
+
+
+def prefetched(iterable, size):
+    """
+    Consumes the iterable on a background thread, at most size items ahead of the returned generator.
+
+    Exceptions raised by the iterable are raised by the generator. Closing the generator stops the thread once its
+    current item is produced.
+
+    :param iterable: The iterable to consume.
+    :param size: The number of items produced ahead of consumption.
+    :return: A generator of the items of the iterable.
+    :rtype: generator
+    """
+    items = queue.Queue()
+    slots = threading.Semaphore(size)
+    stopped = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                items.put((True, item))
+                slots.acquire()
+                if stopped.is_set():
+                    return
+            items.put((False, None))
+        except Exception as e:
+            items.put((False, e))
+
+    # the consumed item holds a slot, so the thread produces at most size items ahead of it
+    slots.acquire()
+
+    thread = threading.Thread(target=copy_context().run, args=(produce,))
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            is_item, value = items.get()
+            if not is_item:
+                if value is not None:
+                    raise value
+                return
+
+            slots.release()
+            yield value
+    finally:
+        stopped.set()
+        slots.release()
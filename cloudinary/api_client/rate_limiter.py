@@ -0,0 +1,157 @@
+import calendar
+import email.utils
+import threading
+import time
+
+import cloudinary
+from cloudinary.utils import safe_cast
+
+# The number of calls that may start at once, before calls are paced
+DEFAULT_RATE_LIMITER_BURST = 10
+
+# The period of the Admin API rate limit, used to pace the calls of a new period once the limit is exhausted
+RATE_LIMIT_PERIOD = 60 * 60
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+class RateLimiter(object):
+    """
+    A token bucket pacing the API calls of the process to the rate limit reported by the API.
+
+    Each response updates the rate: the remaining calls are spread evenly until the rate limit resets. Once the
+    limit is exhausted, calls wait for the reset and the calls of the new period are paced from there, so waiting
+    threads do not all call the API at once when the limit resets.
+
+    The limiter does not pace calls until it learns the rate limit from a response.
+    """
+    def __init__(self, burst=DEFAULT_RATE_LIMITER_BURST):
+        """
+        Initialize the limiter
+
+        :param burst: The number of calls that may start at once, before calls are paced
+        """
+        self.burst = burst
+        self._lock = threading.Lock()
+
+        self.allowed = None
+        self.remaining = None
+        self.reset_at = None
+
+        # The interval between calls, and the time the next call may start at (ignoring the burst)
+        self._interval = None
+        self._next_at = 0
+
+    def acquire(self):
+        """
+        Sleeps until the next call may start
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def reserve(self):
+        """
+        Reserves the next call without waiting, for callers that wait on their own (an event loop, for example)
+
+        :return: The delay in seconds before the call may start
+        """
+        with self._lock:
+            if self._interval is None:
+                return 0
+
+            now = time.time()
+            next_at = max(self._next_at, now)
+            delay = next_at - self._interval * (self.burst - 1) - now
+            self._next_at = next_at + self._interval
+
+        return max(delay, 0)
+
+    def update(self, response):
+        """
+        Updates the rate from the rate limit headers of a response, responses without them are ignored
+
+        :param response: The HTTP response
+        """
+        headers = response.headers or {}
+        allowed = safe_cast(headers.get("x-featureratelimit-limit"), int)
+        remaining = safe_cast(headers.get("x-featureratelimit-remaining"), int)
+        reset_at = safe_cast(headers.get("x-featureratelimit-reset"), email.utils.parsedate)
+        if not allowed or remaining is None or reset_at is None:
+            return
+
+        reset_at = calendar.timegm(reset_at)
+        now = time.time()
+
+        with self._lock:
+            self.allowed, self.remaining, self.reset_at = allowed, remaining, reset_at
+
+            if remaining > 0 and reset_at > now:
+                self._interval = (reset_at - now) / float(remaining)
+            else:
+                self._interval = RATE_LIMIT_PERIOD / float(allowed)
+                # no call starts before the reset, the burst is used up
+                self._next_at = max(self._next_at, reset_at + self._interval * (self.burst - 1))
+
+    def budget(self):
+        """
+        Returns the current budget of the limiter
+
+        :return: A dictionary with the rate limit reported by the API (allowed, remaining and the reset_at timestamp),
+                 the interval between paced calls in seconds and the delay before the next call may start in seconds.
+                 The values are None until the limiter learns the rate limit
+        :rtype: dict
+        """
+        with self._lock:
+            if self._interval is None:
+                delay = None
+            else:
+                delay = max(self._next_at - self._interval * (self.burst - 1) - time.time(), 0)
+
+            return {
+                "allowed": self.allowed,
+                "remaining": self.remaining,
+                "reset_at": self.reset_at,
+                "interval": self._interval,
+                "delay": delay,
+            }
+
+
+def get_rate_limiter(api_key):
+    """
+    Returns the rate limiter shared by the calls of the process with the API key, as each product environment has
+    its own rate limit
+
+    :param api_key: The API key of the calls
+
+    :return: The rate limiter
+    :rtype: RateLimiter
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(api_key)
+        if limiter is None:
+            burst = safe_cast(cloudinary.config().rate_limiter_burst, int, None) or DEFAULT_RATE_LIMITER_BURST
+            limiter = _limiters[api_key] = RateLimiter(burst)
+
+        return limiter
+
+
+def budget(api_key=None):
+    """
+    Returns the current budget of the rate limiter of the API key
+
+    :param api_key: The API key, defaults to the configured API key
+
+    :return: The budget, see RateLimiter.budget
+    :rtype: dict
+    """
+    return get_rate_limiter(api_key or cloudinary.config().api_key).budget()
+
+
+def reset():
+    """
+    Drops the rate limiters of the process, along with the rate limits they learned
+    """
+    with _limiters_lock:
+        _limiters.clear()
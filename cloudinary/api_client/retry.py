@@ -0,0 +1,234 @@
+import calendar
+import email.utils
+import random
+import socket
+import threading
+import time
+
+from urllib3.exceptions import HTTPError, MaxRetryError, NewConnectionError, ConnectTimeoutError
+
+import cloudinary
+from cloudinary.utils import safe_cast
+
+# The defaults of the retry policy, configurable with cloudinary.config(max_retries=..., retry_delay=...,
+# retry_max_delay=...) or per call with the same options. Requests are not retried unless max_retries is set
+DEFAULT_MAX_RETRIES = 0
+DEFAULT_RETRY_DELAY = 1
+DEFAULT_RETRY_MAX_DELAY = 60
+
+# Rate limited requests were rejected before being processed, so they are retried regardless of the HTTP method
+RATE_LIMIT_STATUSES = (420, 429)
+SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+
+RETRY_OPTIONS = ("max_retries", "retry_delay", "retry_max_delay")
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+class RetryPolicy(object):
+    """
+    Decides whether a failed request is retried, and how long to wait before retrying it.
+
+    Rate limited requests and requests that failed to connect are always retried, as the API did not process them.
+    Server errors and other connection errors are only retried for idempotent requests.
+
+    The delay before a retry is the one requested by the Retry-After header, or by the X-FeatureRateLimit-Reset
+    header of rate limited requests. Otherwise, it grows exponentially with each attempt, with a random jitter so
+    concurrent clients do not retry at the same time.
+    """
+    def __init__(self, max_retries=DEFAULT_MAX_RETRIES, delay=DEFAULT_RETRY_DELAY, max_delay=DEFAULT_RETRY_MAX_DELAY,
+                 jitter=True):
+        """
+        Initialize the policy
+
+        :param max_retries: The maximal number of retries of a request, 0 disables retries
+        :param delay:       The delay in seconds before the first retry, doubled on each retry
+        :param max_delay:   The maximal delay in seconds before a retry. A request whose Retry-After (or rate limit
+                            reset) is further away is not retried
+        :param jitter:      Whether the exponential delays are randomized
+        """
+        self.max_retries = max_retries
+        self.delay = delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    @classmethod
+    def from_options(cls, options, conf=None):
+        """
+        Creates the policy of a call, removing the retry options from its options
+
+        :param options: The options of the call, defaults to the configuration
+        :type options: dict
+        :param conf:    The configuration snapshot of the call, defaults to the current configuration
+
+        :return: The policy
+        :rtype: RetryPolicy
+        """
+        conf = conf or cloudinary.config_snapshot()
+        values = dict((name, options.pop(name, getattr(conf, name))) for name in RETRY_OPTIONS)
+
+        return cls(max_retries=safe_cast(values["max_retries"], int, None) or DEFAULT_MAX_RETRIES,
+                   delay=safe_cast(values["retry_delay"], float, None) or DEFAULT_RETRY_DELAY,
+                   max_delay=safe_cast(values["retry_max_delay"], float, None) or DEFAULT_RETRY_MAX_DELAY)
+
+    def retry_delay(self, attempt, idempotent, response=None, error=None):
+        """
+        Returns the delay before retrying a request, and records the retry in the statistics
+
+        :param attempt:     The number of previous retries of the request
+        :param idempotent:  Whether the request can be repeated without side effects
+        :param response:    The response of the request, if received
+        :param error:       The exception raised by the request, if no response was received
+
+        :return: The delay in seconds, or None if the request should not be retried
+        """
+        if self.max_retries <= 0:
+            # retries are disabled, nothing is given up
+            return None
+
+        if error is not None:
+            reason = type(getattr(error, "reason", None) or error).__name__
+            if not idempotent and not _is_connect_error(error):
+                return None
+        elif response.status in RATE_LIMIT_STATUSES or (response.status in SERVER_ERROR_STATUSES and idempotent):
+            reason = response.status
+        else:
+            return None
+
+        if attempt >= self.max_retries:
+            _record(reason, exhausted=True)
+            return None
+
+        delay = None if response is None else requested_delay(response)
+        if delay is None:
+            delay = self.backoff(attempt)
+        elif delay > self.max_delay:
+            _record(reason, exhausted=True)
+            return None
+
+        _record(reason, delay=delay)
+
+        return delay
+
+    def backoff(self, attempt):
+        """
+        Returns the exponential delay before a retry
+
+        :param attempt: The number of previous retries of the request
+
+        :return: The delay in seconds, between half and all of the exponential delay when jitter is enabled
+        """
+        delay = min(self.delay * 2 ** attempt, self.max_delay)
+        if self.jitter:
+            delay = delay / 2.0 + random.uniform(0, delay / 2.0)
+
+        return delay
+
+
+def call_with_retries(send, policy, idempotent):
+    """
+    Sends a request, retrying it according to the policy.
+
+    :param send:        A function sending the request and returning its HTTP response
+    :param policy:      The retry policy
+    :type policy: RetryPolicy
+    :param idempotent:  Whether the request can be repeated without side effects
+
+    :return: The HTTP response of the last attempt
+    :raises: The exception raised by the last attempt
+    """
+    attempt = 0
+    while True:
+        try:
+            response = send()
+        except (HTTPError, socket.error) as e:
+            delay = policy.retry_delay(attempt, idempotent, error=e)
+            if delay is None:
+                raise
+        else:
+            delay = policy.retry_delay(attempt, idempotent, response=response)
+            if delay is None:
+                return response
+
+        time.sleep(delay)
+        attempt += 1
+
+
+def requested_delay(response):
+    """
+    Returns the delay requested by the API before retrying a request
+
+    :param response: The HTTP response
+
+    :return: The delay in seconds from the Retry-After header, or from the X-FeatureRateLimit-Reset header of rate
+             limited requests. None if the response does not request a delay
+    """
+    headers = response.headers or {}
+
+    retry_after = headers.get("retry-after")
+    if retry_after is not None:
+        seconds = safe_cast(retry_after, float)
+        if seconds is not None:
+            return max(seconds, 0)
+        return _seconds_until(retry_after)
+
+    if response.status in RATE_LIMIT_STATUSES:
+        reset_at = headers.get("x-featureratelimit-reset")
+        if reset_at is not None:
+            return _seconds_until(reset_at)
+
+    return None
+
+
+def stats():
+    """
+    Returns the retry statistics of the process
+
+    :return: A dictionary of the retries taken and given up by reason (an HTTP status or an exception name), along
+             with their totals and the total delay in seconds
+    :rtype: dict
+    """
+    with _stats_lock:
+        by_reason = dict((reason, dict(counts)) for reason, counts in _stats.items())
+
+    return {
+        "retries": sum(counts["retries"] for counts in by_reason.values()),
+        "exhausted": sum(counts["exhausted"] for counts in by_reason.values()),
+        "delay": sum(counts["delay"] for counts in by_reason.values()),
+        "by_reason": by_reason,
+    }
+
+
+def reset_stats():
+    """
+    Resets the retry statistics of the process
+    """
+    with _stats_lock:
+        _stats.clear()
+
+
+def _record(reason, delay=None, exhausted=False):
+    with _stats_lock:
+        counts = _stats.setdefault(reason, {"retries": 0, "exhausted": 0, "delay": 0})
+        if exhausted:
+            counts["exhausted"] += 1
+        else:
+            counts["retries"] += 1
+            counts["delay"] += delay
+
+
+def _is_connect_error(error):
+    if isinstance(error, MaxRetryError):
+        error = error.reason
+
+    return isinstance(error, (NewConnectionError, ConnectTimeoutError))
+
+
+def _seconds_until(http_date):
+    parsed = safe_cast(http_date, email.utils.parsedate)
+    if parsed is None:
+        return None
+
+    return max(calendar.timegm(parsed) - time.time(), 0)
@@ -4,57 +4,190 @@ import re
 import time
 from binascii import a2b_hex
 
+from cloudinary.cache.lru_cache import LRUCache
+from cloudinary.compat import PY3, to_bytes, to_string
 
 AUTH_TOKEN_NAME = "__cld_token__"
 AUTH_TOKEN_SEPARATOR = "~"
 AUTH_TOKEN_UNSAFE_RE = r'([ "#%&\'\/:;<=>?@\[\\\]^`{\|}~]+)'
 
+_AUTH_TOKEN_UNSAFE_TEXT_RE = re.compile(AUTH_TOKEN_UNSAFE_RE)
+_AUTH_TOKEN_UNSAFE_BYTES_RE = re.compile(to_bytes(AUTH_TOKEN_UNSAFE_RE))
+
+_LOWER_BYTE_ESCAPES = tuple(to_bytes("%{0:02x}".format(b)) for b in range(256))
+
+_keyed_hmacs = LRUCache(16)
+
+
+class AuthTokenSigner(object):
+    """
+    Generates auth tokens with a single key.
+
+    The key is decoded and the HMAC is keyed only once, each token is signed with a copy of the keyed HMAC.
+    Token options passed to the constructor are used as defaults of the generated tokens.
+    """
+    def __init__(self, key=None, token_name=AUTH_TOKEN_NAME, start_time=None, duration=None,
+                 expiration=None, ip=None, acl=None, **_):
+        """
+        Initialize the signer
+
+        :param key:         The hex encoded key to sign the tokens with
+        :param token_name:  The name of the token query parameter
+        :param start_time:  The default start time of the tokens
+        :param duration:    The default duration of the tokens, in seconds
+        :param expiration:  The default expiration time of the tokens
+        :param ip:          The default IP address of the tokens
+        :param acl:         The default ACL of the tokens
+        """
+        self.key = key
+        self.token_name = token_name
+        self.start_time = start_time
+        self.duration = duration
+        self.expiration = expiration
+        self.ip = ip
+        self.acl = acl
+
+        self._hmac = None
+
+    def generate(self, url=None, acl=None, start_time=None, duration=None, expiration=None, ip=None, **_):
+        """
+        Generates an auth token of the url or the acl
+
+        :param url:         The URL (path) to sign, ignored if acl is provided
+        :param acl:         The ACL (or a list of ACLs) to sign
+        :param start_time:  The start time of the token, overrides the default one
+        :param duration:    The duration of the token, overrides the default one
+        :param expiration:  The expiration time of the token, overrides the default one
+        :param ip:          The IP address of the token, overrides the default one
+
+        :return: The auth token, in the "token_name=token" form
+        """
+        if acl is None:
+            acl = self.acl
+
+        prefix = self._token_prefix(start_time, duration, expiration, ip)
+
+        if url is None and acl is None:
+            raise Exception("Must provide either acl or url")
+
+        return self._generate(prefix, url, acl)
+
+    def generate_many(self, urls_or_acls, as_acl=False, start_time=None, duration=None, expiration=None, ip=None,
+                      **_):
+        """
+        Generates auth tokens of multiple URLs (or ACLs) sharing the same token options.
+
+        The expiration time is computed once for the whole batch.
+
+        :param urls_or_acls:    An iterable of URLs, or of ACLs (each one an ACL or a list of ACLs) if as_acl is True
+        :param as_acl:          Whether the items are ACLs rather than URLs
+        :param start_time:      The start time of the tokens, overrides the default one
+        :param duration:        The duration of the tokens, overrides the default one
+        :param expiration:      The expiration time of the tokens, overrides the default one
+        :param ip:              The IP address of the tokens, overrides the default one
+
+        :return: A list of auth tokens, in the order of urls_or_acls
+        """
+        prefix = self._token_prefix(start_time, duration, expiration, ip)
+
+        if as_acl:
+            return [self._generate(prefix, None, acl) for acl in urls_or_acls]
+
+        return [self._generate(prefix, url, self.acl) for url in urls_or_acls]
+
+    def _token_prefix(self, start_time, duration, expiration, ip):
+        start_time = _ensure_int(self.start_time if start_time is None else start_time)
+        duration = _ensure_int(self.duration if duration is None else duration)
+        expiration = _ensure_int(self.expiration if expiration is None else expiration)
+        ip = self.ip if ip is None else ip
+
+        if expiration is None:
+            if duration is not None:
+                start = start_time if start_time is not None else int(time.time())
+                expiration = start + duration
+            else:
+                raise Exception("Must provide either expiration or duration")
+
+        token_parts = []
+        if ip is not None:
+            token_parts.append("ip=" + ip)
+        if start_time is not None:
+            token_parts.append("st=%d" % start_time)
+        token_parts.append("exp=%d" % expiration)
+
+        return AUTH_TOKEN_SEPARATOR.join(token_parts)
+
+    def _generate(self, prefix, url, acl):
+        token = prefix
+        if acl is not None:
+            acl_list = acl if type(acl) is list else [acl]
+            token += AUTH_TOKEN_SEPARATOR + "acl=%s" % "!".join([_escape_to_lower(a) for a in acl_list])
+            to_sign = token
+        elif url is not None:
+            to_sign = token + AUTH_TOKEN_SEPARATOR + "url=%s" % _escape_to_lower(url)
+        else:
+            raise Exception("Must provide either acl or url")
+
+        token += AUTH_TOKEN_SEPARATOR + "hmac=%s" % self._digest(to_sign)
+
+        return "%(token_name)s=%(token)s" % {"token_name": self.token_name, "token": token}
+
+    def _digest(self, message):
+        if self._hmac is None:
+            self._hmac = _keyed_hmac(self.key)
+
+        digest = self._hmac.copy()
+        digest.update(message.encode('utf-8'))
+
+        return digest.hexdigest()
+
 
 def generate(url=None, acl=None, start_time=None, duration=None,
              expiration=None, ip=None, key=None, token_name=AUTH_TOKEN_NAME, **_):
-    start_time = _ensure_int(start_time)
-    duration = _ensure_int(duration)
-    expiration = _ensure_int(expiration)
-
-    if expiration is None:
-        if duration is not None:
-            start = start_time if start_time is not None else int(time.time())
-            expiration = start + duration
-        else:
-            raise Exception("Must provide either expiration or duration")
-
-    if url is None and acl is None:
-        raise Exception("Must provide either acl or url")
-
-    token_parts = []
-    if ip is not None:
-        token_parts.append("ip=" + ip)
-    if start_time is not None:
-        token_parts.append("st=%d" % start_time)
-    token_parts.append("exp=%d" % expiration)
-    if acl is not None:
-        acl_list = acl if type(acl) is list else [acl]
-        acl_list = [_escape_to_lower(a) for a in acl_list] 
-        token_parts.append("acl=%s" % "!".join(acl_list))
-    to_sign = list(token_parts)
-    if url is not None and acl is None:
-        to_sign.append("url=%s" % _escape_to_lower(url))
-    auth = _digest(AUTH_TOKEN_SEPARATOR.join(to_sign), key)
-    token_parts.append("hmac=%s" % auth)
-    return "%(token_name)s=%(token)s" % {"token_name": token_name, "token": AUTH_TOKEN_SEPARATOR.join(token_parts)}
+    return AuthTokenSigner(key, token_name).generate(url=url, acl=acl, start_time=start_time, duration=duration,
+                                                     expiration=expiration, ip=ip)
+
+
+def _keyed_hmac(key):
+    """
+    Returns the HMAC keyed with the hex encoded key, the HMAC should be copied before use.
+
+    :param key: The hex encoded key
+
+    :return: The keyed HMAC object
+    """
+    keyed = _keyed_hmacs.get(key)
+    if keyed is None:
+        keyed = hmac.new(a2b_hex(key), digestmod=hashlib.sha256)
+        _keyed_hmacs.set(key, keyed)
+
+    return keyed
 
 
 def _digest(message, key):
-    bin_key = a2b_hex(key)
-    return hmac.new(bin_key, message.encode('utf-8'), hashlib.sha256).hexdigest()
+    digest = _keyed_hmac(key).copy()
+    digest.update(message.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _escape_bytes_to_lower(match, escapes=_LOWER_BYTE_ESCAPES):
+    return b"".join([escapes[b] for b in bytearray(match.group(1))])
 
 
 def _escape_to_lower(url):
-    # There is a circular import issue in this file, need to resolve it in the next major release
-    from cloudinary.utils import smart_escape
-    escaped_url = smart_escape(url, unsafe=AUTH_TOKEN_UNSAFE_RE)
-    escaped_url = re.sub(r"%[0-9A-F]{2}", lambda x: x.group(0).lower(), escaped_url)
-    return escaped_url
+    """
+    Escapes the unsafe characters of the url, using lower case hex digits.
+
+    :param url: The url to escape
+
+    :return: The escaped url
+    """
+    if PY3 and isinstance(url, str) and not _AUTH_TOKEN_UNSAFE_TEXT_RE.search(url):
+        # nothing to escape
+        return url
+
+    return to_string(_AUTH_TOKEN_UNSAFE_BYTES_RE.sub(_escape_bytes_to_lower, to_bytes(url)))
+
 
 def _ensure_int(value):
     """
@@ -0,0 +1,132 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    A thread safe, size bounded in-memory cache that evicts the least recently used entries first
+    """
+    def __init__(self, max_size=1024):
+        """
+        Initialize the cache
+
+        :param max_size: The maximal number of entries to keep. 0 disables the cache
+        """
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_size(self):
+        """
+        The maximal number of entries kept in the cache
+        """
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, max_size):
+        with self._lock:
+            self._max_size = max_size
+            self._evict()
+
+    @property
+    def enabled(self):
+        """
+        Indicates whether cache is enabled or not
+
+        :return: True if the cache can hold at least one entry
+        """
+        return self._max_size > 0
+
+    def get(self, key, default=None):
+        """
+        Retrieve the value of the key, marking it as the most recently used one
+
+        :param key: The key of the entry
+        :param default: The value to return if the key is not found
+
+        :return: The cached value, or default if not found
+        """
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self._data[key] = value
+            self.hits += 1
+
+            return value
+
+    def set(self, key, value):
+        """
+        Set the value of the key, evicting the least recently used entries if the cache is full
+
+        :param key: The key of the entry
+        :param value: The value to store
+        """
+        with self._lock:
+            if not self._max_size:
+                return
+
+            self._data.pop(key, None)
+            self._data[key] = value
+            self._evict()
+
+    def delete(self, key):
+        """
+        Delete the entry of the key
+
+        :param key: The key of the entry
+
+        :return: True if the entry was found and deleted
+        """
+        with self._lock:
+            return self._data.pop(key, self) is not self
+
+    def values(self):
+        """
+        Returns the cached values, from the least to the most recently used one, without marking them as used
+
+        :return: A list of the values
+        """
+        with self._lock:
+            return list(self._data.values())
+
+    def clear(self):
+        """
+        Remove all entries, counters are kept
+        """
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """
+        Returns the usage statistics of the cache
+
+        :return: A dictionary with hits, misses, evictions, size and max_size of the cache
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "max_size": self._max_size,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def _evict(self):
+        while len(self._data) > max(self._max_size, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
@@ -1,4 +1,7 @@
 # Copyright Cloudinary
+import sys
+import threading
+
 import six.moves.urllib.parse
 from six import PY3, string_types, StringIO, BytesIO
 
@@ -8,9 +11,24 @@ urlparse = six.moves.urllib.parse.urlparse
 parse_qs = six.moves.urllib.parse.parse_qs
 parse_qsl = six.moves.urllib.parse.parse_qsl
 quote_plus = six.moves.urllib.parse.quote_plus
-httplib = six.moves.http_client
-urllib2 = six.moves.urllib.request
-NotConnected = six.moves.http_client.NotConnected
+
+
+def __getattr__(name):
+    # http.client and urllib.request are only used by cloudinary.poster, they are imported on first access (PEP 562)
+    if name == "httplib":
+        return six.moves.http_client
+    if name == "urllib2":
+        return six.moves.urllib.request
+    if name == "NotConnected":
+        return six.moves.http_client.NotConnected
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # Modules do not support __getattr__ before Python 3.7
+    httplib = six.moves.http_client
+    urllib2 = six.moves.urllib.request
+    NotConnected = six.moves.http_client.NotConnected
 
 if PY3:
     to_bytes = lambda s: s.encode('utf8')
@@ -33,3 +51,42 @@ try:
 except NameError:
     def advance_iterator(it):
         return it.next()
+
+try:  # Python 3.7+
+    from contextvars import ContextVar, copy_context
+except ImportError:
+    # Context variables are emulated with thread local values, copied to other threads by copy_context().run
+    _context_vars = []
+
+    class ContextVar(object):
+        def __init__(self, name, default=None):
+            self.name = name
+            self._default = default
+            self._local = threading.local()
+            _context_vars.append(self)
+
+        def get(self):
+            return getattr(self._local, "value", self._default)
+
+        def set(self, value):
+            token = self.get()
+            self._local.value = value
+            return token
+
+        def reset(self, token):
+            self._local.value = token
+
+    class _Context(object):
+        def __init__(self):
+            self._values = [(var, var.get()) for var in _context_vars]
+
+        def run(self, func, *args, **kwargs):
+            tokens = [(var, var.set(value)) for var, value in self._values]
+            try:
+                return func(*args, **kwargs)
+            finally:
+                for var, token in tokens:
+                    var.reset(token)
+
+    def copy_context():
+        return _Context()
@@ -1,10 +1,7 @@
 import json
 import socket
 
-import certifi
-from urllib3 import PoolManager
-from urllib3.exceptions import HTTPError
-
+from cloudinary.api_client.connection_pools import shared_http_connector
 from cloudinary.exceptions import GeneralError
 
 
@@ -12,17 +9,17 @@ class HttpClient:
     DEFAULT_HTTP_TIMEOUT = 60
 
     def __init__(self, **options):
-        # Lazy initialization of the client, to improve performance when HttpClient is initialized but not used
-        self._http_client_instance = None
+        # The connector shared by the API clients is used, unless a connector is provided
+        self._http_client_instance = options.get("http_connector")
         self.timeout = options.get("timeout", self.DEFAULT_HTTP_TIMEOUT)
 
     @property
     def _http_client(self):
-        if self._http_client_instance is None:
-            self._http_client_instance = PoolManager(cert_reqs='CERT_REQUIRED', ca_certs=certifi.where())
-        return self._http_client_instance
+        return self._http_client_instance or shared_http_connector()
 
     def get_json(self, url):
+        from urllib3.exceptions import HTTPError
+
         try:
             response = self._http_client.request(method="GET", url=url, timeout=self.timeout)
             body = response.data
@@ -298,7 +298,7 @@ class MultipartParam(object):
         else:
             valuesize = len(self.value)
 
-        return len(self.encode_hdr(boundary)) + 2 + valuesize
+        return len(to_bytes(self.encode_hdr(boundary))) + 2 + valuesize
 
 
 def encode_string(boundary, name, value):
@@ -350,10 +350,11 @@ def get_headers(params, boundary):
 
 
 class multipart_yielder:
-    def __init__(self, params, boundary, cb):
+    def __init__(self, params, boundary, cb, blocksize=4096):
         self.params = params
         self.boundary = boundary
         self.cb = cb
+        self.blocksize = blocksize
 
         self.i = 0
         self.p = None
@@ -394,7 +395,7 @@ class multipart_yielder:
             return block
 
         self.p = self.params[self.i]
-        self.param_iter = self.p.iter_encode(self.boundary)
+        self.param_iter = self.p.iter_encode(self.boundary, self.blocksize)
         self.i += 1
         return advance_iterator(self)
 
@@ -405,7 +406,7 @@ class multipart_yielder:
             param.reset()
 
 
-def multipart_encode(params, boundary=None, cb=None):
+def multipart_encode(params, boundary=None, cb=None, blocksize=4096):
     """Encode ``params`` as multipart/form-data.
 
     ``params`` should be a sequence of (name, value) pairs or MultipartParam
@@ -424,6 +425,8 @@ def multipart_encode(params, boundary=None, cb=None):
     indicating the current parameter being encoded, the current amount encoded,
     and the total amount to encode.
 
+    ``blocksize`` is the size of the blocks read from the file-like objects.
+
     Returns a tuple of `datagen`, `headers`, where `datagen` is a
     generator that will yield blocks of data that make up the encoded
     parameters, and `headers` is a dictionary with the assoicated
@@ -453,4 +456,4 @@ def multipart_encode(params, boundary=None, cb=None):
     headers = get_headers(params, boundary)
     params = MultipartParam.from_params(params)
 
-    return multipart_yielder(params, boundary, cb), headers
+    return multipart_yielder(params, boundary, cb, blocksize), headers
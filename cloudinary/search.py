@@ -2,6 +2,7 @@ import json
 
 import cloudinary
 from cloudinary.api_client.call_api import call_json_api
+from cloudinary.api_client.paginator import paginate, PAGINATION_MAX_RESULTS
 from cloudinary.utils import (unique, build_distribution_domain, base64url_encode, json_encode, compute_hex_hash,
                               SIGNATURE_SHA256, build_array)
 
@@ -77,9 +78,49 @@ class Search(object):
 
     def execute(self, **options):
         """Execute the search and return results."""
+        return self._execute(self.as_dict(), **options)
+
+    def iterate(self, page_size=None, prefetch=1, **options):
+        """
+        Execute the search and iterate over the results of all pages.
+
+        The next page is requested on a background thread while the current page is consumed.
+
+        :param page_size: The number of results per page, defaults to the max_results of the query,
+                          or to PAGINATION_MAX_RESULTS if not set.
+        :param prefetch: The number of pages requested ahead, 0 requests the pages on demand.
+        :param options: Additional options of the API call.
+        :return: A generator of the results (resources, or folders when searching folders).
+        """
+        query = self.as_dict()
+        next_cursor = query.pop("next_cursor", None)
+        page_size = self._page_size(query, page_size)
+
+        def execute_page(max_results, next_cursor=None, **page_options):
+            page_query = dict(query, max_results=max_results)
+            if next_cursor:
+                page_query["next_cursor"] = next_cursor
+            return self._execute(page_query, **page_options)
+
+        return paginate(execute_page, self._endpoint, prefetch=prefetch, max_results=page_size,
+                        next_cursor=next_cursor, **options)
+
+    @staticmethod
+    def _page_size(query, page_size=None):
+        """
+        Returns the page size of an iteration over the results of the query.
+
+        :param query: The query, as returned by as_dict.
+        :param page_size: The requested page size, if any.
+        :return: The page size.
+        :rtype: int
+        """
+        return page_size or query.get("max_results") or PAGINATION_MAX_RESULTS
+
+    def _execute(self, query, **options):
         options["content_type"] = 'application/json'
         uri = [self._endpoint, 'search']
-        return call_json_api('post', uri, self.as_dict(), **options)
+        return call_json_api('post', uri, query, **options)
 
     def as_dict(self):
         to_return = {}
@@ -17,15 +17,21 @@ register = template.Library()
 def cloudinary_url(context, source, options_dict=None, **options):
     if options_dict is None:
         options = dict(**options)
+    elif isinstance(options_dict, utils.CloudinaryUrlTemplate):
+        options = dict(options, template=options_dict)
     else:
         options = dict(options_dict, **options)
     try:
-        if context['request'].is_secure() and 'secure' not in options:
+        if context['request'].is_secure() and 'secure' not in options and 'template' not in options:
             options['secure'] = True
     except KeyError:
         pass
     if not isinstance(source, CloudinaryResource):
-        source = CloudinaryResource(source)
+        template = options.get('template')
+        if template is not None:
+            source = CloudinaryResource(source, type=template.type, resource_type=template.resource_type)
+        else:
+            source = CloudinaryResource(source)
     return source.build_url(**options)
 
 
@@ -0,0 +1,246 @@
+import errno
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from cloudinary import utils
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+
+def _user_cache_dir():
+    if os.name == "nt":
+        return os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+
+    return os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+
+
+# The journal is kept in the cache directory of the user, as the progress of other users' uploads cannot be trusted
+UPLOAD_JOURNAL_PATH = os.path.join(_user_cache_dir(), "cloudinary", "upload_large_journal.json")
+
+# Interrupted uploads older than this (in seconds) are not resumed
+UPLOAD_JOURNAL_MAX_AGE = 24 * 60 * 60
+
+
+class UploadJournal(object):
+    """
+    Persists the progress of chunked uploads of local files in a JSON file, so interrupted uploads can be resumed.
+
+    Uploads are keyed by the absolute path, the size and the modification time of the file, along with the
+    destination of the upload, so a modified file, or a file uploaded to another destination, is uploaded from scratch.
+
+    Changes are read, modified and written under an exclusive lock of the journal file, so concurrent uploads of
+    multiple processes sharing the journal keep each other's entries.
+    """
+    def __init__(self, path=None, max_age=UPLOAD_JOURNAL_MAX_AGE):
+        """
+        Initialize the journal
+
+        :param path:    The path of the journal file
+        :param max_age: The maximal age (in seconds) of an upload that can be resumed
+        """
+        self.path = path or UPLOAD_JOURNAL_PATH
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+
+    def open_upload(self, file_path, file_size, chunk_size, destination=None):
+        """
+        Returns the journaled upload of the file, resuming the previous upload of the same file if there is one
+
+        :param file_path:   The path of the uploaded file
+        :param file_size:   The size of the uploaded file, in bytes
+        :param chunk_size:  The size of the uploaded chunks, in bytes
+        :param destination: The values identifying the destination of the upload (the cloud name, the API key,
+                            the resource type, the type and the requested public ID, for example), only an upload
+                            of the file to the same destination is resumed
+        :type destination:  tuple
+
+        :return: The journaled upload
+        :rtype: JournaledUpload
+        """
+        key = self._key(file_path, file_size, destination)
+
+        with self._locked():
+            uploads = self._load()
+            entry = uploads.get(key)
+            if entry is None or entry.get("chunk_size") != chunk_size:
+                entry = {
+                    "upload_id": utils.random_public_id(),
+                    "public_id": None,
+                    "chunk_size": chunk_size,
+                    "ranges": [],
+                }
+            entry["updated_at"] = time.time()
+            uploads[key] = entry
+            self._save(uploads)
+
+        return JournaledUpload(self, key, entry)
+
+    def acknowledge(self, key, start, end, public_id):
+        """
+        Records an uploaded byte range
+
+        :param key:         The key of the upload
+        :param start:       The first byte of the range
+        :param end:         The last byte of the range
+        :param public_id:   The public ID returned by the server
+        """
+        with self._locked():
+            uploads = self._load()
+            entry = uploads.get(key)
+            if entry is None:
+                return
+
+            if [start, end] not in entry["ranges"]:
+                entry["ranges"].append([start, end])
+            entry["public_id"] = public_id or entry.get("public_id")
+            entry["updated_at"] = time.time()
+            self._save(uploads)
+
+    def remove(self, key):
+        """
+        Removes the upload from the journal
+
+        :param key: The key of the upload
+        """
+        with self._locked():
+            uploads = self._load()
+            if uploads.pop(key, None) is not None:
+                self._save(uploads)
+
+    @staticmethod
+    def _key(file_path, file_size, destination=None):
+        file_path = os.path.abspath(str(file_path))
+        return "{0}:{1}:{2!r}:{3}".format(file_path, file_size, os.path.getmtime(file_path),
+                                          json.dumps(list(destination or ()), sort_keys=True))
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as journal_file:
+                uploads = json.load(journal_file)
+        except (EnvironmentError, ValueError):
+            # missing or corrupted journal
+            return {}
+
+        min_updated_at = time.time() - self.max_age
+
+        return dict((key, entry) for key, entry in uploads.items() if entry.get("updated_at", 0) >= min_updated_at)
+
+    @contextmanager
+    def _locked(self):
+        """
+        Locks the journal for the threads of the process and, with a lock file, for the other processes
+        """
+        with self._lock:
+            _make_dirs(os.path.dirname(self.path))
+            lock_fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+            try:
+                _lock_file(lock_fd)
+                try:
+                    yield
+                finally:
+                    _unlock_file(lock_fd)
+            finally:
+                os.close(lock_fd)
+
+    def _save(self, uploads):
+        # write to a new temporary file, flushed to disk before replacing the journal, so the journal is never left
+        # half written
+        journal_dir, journal_name = os.path.split(self.path)
+        temp_fd, temp_path = tempfile.mkstemp(prefix=journal_name + ".", suffix=".tmp", dir=journal_dir or None)
+        try:
+            with os.fdopen(temp_fd, "w") as journal_file:
+                json.dump(uploads, journal_file)
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+
+            if hasattr(os, "replace"):  # Python 3.3+
+                os.replace(temp_path, self.path)
+            else:
+                if os.name == "nt" and os.path.exists(self.path):
+                    os.remove(self.path)
+                os.rename(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+def _make_dirs(path):
+    if not path:
+        return
+
+    try:
+        os.makedirs(path, 0o700)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+
+def _lock_file(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class JournaledUpload(object):
+    """
+    The journaled progress of a single chunked upload
+    """
+    def __init__(self, journal, key, entry):
+        self.journal = journal
+        self.key = key
+        self.upload_id = entry["upload_id"]
+        self.public_id = entry.get("public_id")
+
+        self._ranges = set(tuple(byte_range) for byte_range in entry["ranges"])
+
+    def is_acknowledged(self, start, end):
+        """
+        Indicates whether the byte range was already uploaded
+
+        :param start:   The first byte of the range
+        :param end:     The last byte of the range
+
+        :return: True if the range was uploaded
+        """
+        return (start, end) in self._ranges
+
+    def acknowledge(self, start, end, public_id):
+        """
+        Records an uploaded byte range
+
+        :param start:       The first byte of the range
+        :param end:         The last byte of the range
+        :param public_id:   The public ID returned by the server
+        """
+        self._ranges.add((start, end))
+        self.public_id = public_id or self.public_id
+        self.journal.acknowledge(self.key, start, end, public_id)
+
+    def complete(self):
+        """
+        Removes the completed upload from the journal
+        """
+        self.journal.remove(self.key)
@@ -1,17 +1,31 @@
 # Copyright Cloudinary
 
+import io
+import itertools
 import json
+import mimetypes
 import os
 import socket
+import threading
+import time
 
-from six import string_types
+from six import PY3, string_types, text_type
 from urllib3.exceptions import HTTPError
 
+try:  # urllib3 2.x
+    from urllib3.fields import format_multipart_header_param as _format_header_param
+except ImportError:
+    from urllib3.fields import format_header_param_html5 as _format_header_param
+
 import cloudinary
 from cloudinary import utils
+from cloudinary.api_client import batches, connection_pools, retry
 from cloudinary.api_client.execute_request import EXCEPTION_CODES
 from cloudinary.cache.responsive_breakpoints_cache import instance as responsive_breakpoints_cache_instance
-from cloudinary.exceptions import Error, AuthorizationRequired
+from cloudinary.compat import to_bytes, copy_context
+from cloudinary.exceptions import Error, AuthorizationRequired, RateLimited
+from cloudinary.poster.encode import MultipartParam, multipart_encode, multipart_yielder
+from cloudinary.upload_journal import UploadJournal
 from cloudinary.utils import build_eager
 
 try:
@@ -25,22 +39,51 @@ try:  # Python 2.7+
 except ImportError:
     from urllib3.packages.ordered_dict import OrderedDict
 
+try:  # Python 3.2+
+    from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+except ImportError:
+    ThreadPoolExecutor = None
+
 if is_appengine_sandbox():
     # AppEngineManager uses AppEngine's URLFetch API behind the scenes
     _http = AppEngineManager()
 else:
-    # PoolManager uses a socket-level API behind the scenes
-    _http = utils.get_http_connector(cloudinary.config(), cloudinary.CERT_KWARGS)
+    # The shared PoolManager, which uses a socket-level API behind the scenes, is looked up on each call
+    _http = None
 
 upload_options = [
     "filename",
     "timeout",
     "chunk_size",
-    "use_cache"
+    "use_cache",
+    "max_workers",
+    "resume",
+    "resume_journal"
 ]
 
 UPLOAD_LARGE_CHUNK_SIZE = 20000000
 
+# Files of at least this size are streamed instead of being read into memory
+UPLOAD_STREAMING_THRESHOLD = 10 * 1024 * 1024
+UPLOAD_STREAMING_BLOCK_SIZE = 64 * 1024
+
+# The maximal number of public IDs of a tags or context request, and the number of concurrent requests of larger calls
+PUBLIC_IDS_BATCH_SIZE = 1000
+PUBLIC_IDS_MAX_WORKERS = 4
+
+# Upload API actions retried after server errors, as repeating them has no side effects
+IDEMPOTENT_UPLOAD_ACTIONS = ("destroy", "tags", "context", "metadata")
+
+# Explicit calls with these parameters are not retried after server errors, as repeating them sends notifications
+# again or runs (and bills) add-ons again
+NON_IDEMPOTENT_EXPLICIT_PARAMS = ("notification_url", "eager_notification_url", "moderation", "ocr", "raw_convert",
+                                  "categorization", "detection", "background_removal", "auto_tagging",
+                                  "auto_transcription", "auto_chaptering")
+
+# upload_many retries rate limited uploads, backing off exponentially (in seconds) up to the maximal delay
+UPLOAD_MANY_RATE_LIMIT_RETRIES = 5
+UPLOAD_MANY_RATE_LIMIT_DELAY = 1
+UPLOAD_MANY_RATE_LIMIT_MAX_DELAY = 60
 
 def upload(file, **options):
     """
@@ -196,8 +239,9 @@ def upload(file, **options):
         - etc.
     :rtype: dict
     """
-    params = utils.build_upload_params(**options)
-    return call_cacheable_api("upload", params, file=file, **options)
+    conf = cloudinary.config_snapshot()
+    params = utils.build_upload_params(conf, **options)
+    return call_cacheable_api("upload", params, file=file, conf=conf, **options)
 
 
 def unsigned_upload(file, upload_preset, **options):
@@ -264,6 +308,116 @@ def upload_resource(file, **options):
     )
 
 
+def upload_many(files, max_workers=4, **options):
+    """
+    Uploads multiple files concurrently, using upload_large for files larger than UPLOAD_LARGE_CHUNK_SIZE.
+
+    The files are consumed lazily, at most max_workers files are uploaded at a time over a shared connection pool.
+    Rate limited uploads are retried after an exponential backoff, during which no other upload of the batch starts.
+
+    :param files: An iterable of the assets to upload (local paths, file-like objects, Data URIs or remote URLs).
+    :type files: iterable
+    :param max_workers: The number of files to upload concurrently.
+    :type max_workers: int
+    :param options: The options of each upload.
+    :return: A generator of (file, result) tuples, in completion order.
+             The result is the exception raised by the upload if it failed.
+    :rtype: generator
+    """
+    if "http_connector" not in options:
+        options["http_connector"] = batches.pooled_http_connector(max_workers)
+
+    backoff = _RateLimitBackoff()
+
+    for file, result in batches.run_concurrently(
+            lambda file: _upload_many_item(file, backoff, options), files, max_workers):
+        yield file, result
+
+
+def _upload_many_item(file, backoff, options):
+    """
+    Uploads a single file of upload_many, retrying it while it is rate limited.
+
+    :param file: The asset to upload.
+    :param backoff: The rate limit backoff shared by the uploads of the batch.
+    :type backoff: _RateLimitBackoff
+    :param options: The options of the upload, copied so each upload gets its own.
+    :return: The result of the upload API call.
+    :rtype: dict
+    """
+    is_stream = hasattr(file, 'read') and callable(file.read)
+    position = _stream_position(file)
+
+    size = _upload_size(file)
+    upload_func = upload_large if size is not None and size > UPLOAD_LARGE_CHUNK_SIZE else upload
+
+    attempt = 0
+    while True:
+        backoff.wait()
+        try:
+            return upload_func(file, **dict(options))
+        except RateLimited:
+            if attempt >= UPLOAD_MANY_RATE_LIMIT_RETRIES or (is_stream and position is None):
+                raise
+            backoff.back_off(attempt)
+            attempt += 1
+            if is_stream:
+                file.seek(position)
+
+
+class _RateLimitBackoff(object):
+    """
+    Delays the uploads of a batch after one of them is rate limited
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0
+
+    def wait(self):
+        """
+        Sleeps until the backoff period is over
+        """
+        delay = self._resume_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def back_off(self, attempt):
+        """
+        Starts (or extends) a backoff period after a rate limited upload
+
+        :param attempt: The number of previous retries of the upload
+        """
+        delay = min(UPLOAD_MANY_RATE_LIMIT_DELAY * 2 ** attempt, UPLOAD_MANY_RATE_LIMIT_MAX_DELAY)
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.time() + delay)
+
+
+def _upload_size(file):
+    """
+    Returns the size of the asset to upload, if it is a local file or a seekable stream.
+
+    :param file: The asset to upload.
+    :return: The size in bytes, or None if unknown (remote URLs, Data URIs, non-seekable streams).
+    """
+    if isinstance(getattr(file, 'size', None), int):
+        return file.size
+
+    if hasattr(file, 'read') and callable(file.read):
+        try:
+            return utils.file_io_size(file)
+        except (AttributeError, EnvironmentError, ValueError):
+            return None
+
+    if utils.PathLibPathType and isinstance(file, utils.PathLibPathType) or \
+            isinstance(file, string_types) and not utils.is_remote_url(file):
+        try:
+            return os.path.getsize(file)
+        except (EnvironmentError, TypeError, ValueError):
+            return None
+
+    return None
+
+
 def _upload_large_part_with_auth_retry(file, http_headers, options):
     """
     Uploads a single chunk, recovering once from an expired OAuth token via the
@@ -301,6 +455,11 @@ def upload_large(file, **options):
     :param options: Additional options for the upload.
     :keyword str filename: Override for the file name (for streams).
     :keyword int chunk_size: Size of each uploaded chunk (default=20000000).
+    :keyword int max_workers: The number of chunks to upload concurrently (default=1).
+                              At most max_workers chunks are held in memory.
+    :keyword bool resume: Whether to record the progress of the upload of a local file in a journal, and to resume
+                          a previously interrupted upload of the same file by skipping its uploaded chunks.
+    :keyword str resume_journal: The path of the journal file of resumable uploads.
     :keyword bool use_cache: Whether to store responsive breakpoints in cache after upload.
     :return: The result of the upload API call.
     :rtype: dict
@@ -311,38 +470,258 @@ def upload_large(file, **options):
     if hasattr(file, 'read') and callable(file.read):
         file_io = file
     else:
-        file_io = open(file, 'rb')
-
-    upload_result = None
+        file_io = _open_large_file(file)
 
     with file_io:
-        upload_id = utils.random_public_id()
-        current_loc = 0
-        chunk_size = options.get("chunk_size", UPLOAD_LARGE_CHUNK_SIZE)
-        file_size = utils.file_io_size(file_io)
-
-        file_name = options.get(
-            "filename",
-            file_io.name if hasattr(file_io, 'name') and isinstance(file_io.name, str) else "stream"
+        large_upload = _start_large_upload(file, file_io, options)
+
+        max_workers = options.get("max_workers") or 1
+        if max_workers > 1 and ThreadPoolExecutor is not None:
+            upload_result = _upload_large_chunks_concurrently(large_upload, max_workers)
+        else:
+            upload_result = _upload_large_chunks(large_upload)
+
+    if large_upload.journaled_upload is not None:
+        large_upload.journaled_upload.complete()
+
+    return upload_result
+
+
+def _start_large_upload(file, file_io, options):
+    """
+    Creates the state of a chunked upload, resuming the journaled upload of a local file if requested.
+
+    :param file: The uploaded file, as passed to upload_large.
+    :param file_io: The opened file-like object.
+    :param options: Upload options. The public ID assigned to a resumed upload is set in them, unless a public ID
+                    was requested.
+    :return: The state of the upload.
+    :rtype: _LargeUpload
+    """
+    chunk_size = options.get("chunk_size", UPLOAD_LARGE_CHUNK_SIZE)
+    file_size = utils.file_io_size(file_io)
+
+    file_name = options.get(
+        "filename",
+        file_io.name if hasattr(file_io, 'name') and isinstance(file_io.name, str) else "stream"
+    )
+
+    journaled_upload = None
+    if options.get("resume") and file_io is not file:
+        conf = cloudinary.config_snapshot()
+        destination = (
+            options.get("upload_prefix", conf.upload_prefix),
+            options.get("cloud_name", conf.cloud_name),
+            options.get("api_key", conf.api_key),
+            options.get("resource_type", "raw"),
+            options.get("type", "upload"),
+            options.get("public_id"),
+        )
+        journal = UploadJournal(options.get("resume_journal"))
+        journaled_upload = journal.open_upload(file, file_size, chunk_size, destination)
+        if journaled_upload.public_id and not options.get("public_id"):
+            options["public_id"] = journaled_upload.public_id
+
+    return _LargeUpload(file_io, file_name, file_size, chunk_size, options, journaled_upload)
+
+
+class _LargeUpload(object):
+    """
+    The state of a chunked upload of a single file
+    """
+    def __init__(self, file_io, file_name, file_size, chunk_size, options, journaled_upload=None):
+        self.file_io = file_io
+        self.file_name = file_name
+        self.file_size = file_size
+        self.chunk_size = chunk_size
+        self.options = options
+        self.journaled_upload = journaled_upload
+        self.upload_id = journaled_upload.upload_id if journaled_upload else utils.random_public_id()
+
+        self.location = 0
+
+    def next_chunk(self):
+        """
+        Reads the next chunk to upload, skipping the chunks acknowledged in the journal.
+        The final chunk is never skipped, its result is the result of the upload.
+
+        :return: A tuple of the location and the data of the chunk, the data is empty at the end of the file
+        """
+        if self.journaled_upload is not None:
+            location = self.location
+            while location + self.chunk_size < self.file_size and \
+                    self.journaled_upload.is_acknowledged(location, location + self.chunk_size - 1):
+                location += self.chunk_size
+
+            if location != self.location:
+                self.file_io.seek(location - self.location, os.SEEK_CUR)
+                self.location = location
+
+        location = self.location
+        chunk = self.file_io.read(self.chunk_size)
+        self.location += len(chunk)
+
+        return location, chunk
+
+    def is_final(self):
+        """
+        Indicates whether the last read chunk is the final chunk of the file
+        """
+        return self.location >= self.file_size
+
+    def upload_chunk(self, location, chunk, options=None):
+        """
+        Uploads a single chunk and acknowledges it in the journal
+
+        :param location: The location of the chunk in the file
+        :param chunk: The data of the chunk
+        :param options: Upload options, defaults to the options of the upload
+        :return: The result of the chunk upload API call.
+        :rtype: dict
+        """
+        upload_result = _upload_large_part_with_auth_retry(
+            (self.file_name, chunk), self.chunk_headers(location, chunk), self.options if options is None else options
         )
 
-        chunk = file_io.read(chunk_size)
+        self.acknowledge(location, chunk, upload_result)
 
-        while chunk:
-            content_range = "bytes {0}-{1}/{2}".format(current_loc, current_loc + len(chunk) - 1, file_size)
-            current_loc += len(chunk)
-            http_headers = {
-                "Content-Range": content_range,
-                "X-Unique-Upload-Id": upload_id
-            }
+        return upload_result
 
-            upload_result = _upload_large_part_with_auth_retry(
-                (file_name, chunk), http_headers, options
-            )
+    def chunk_headers(self, location, chunk):
+        """
+        Returns the HTTP headers of a chunk upload request
 
-            options["public_id"] = upload_result.get("public_id")
+        :param location: The location of the chunk in the file
+        :param chunk: The data of the chunk
+        :rtype: dict
+        """
+        return {
+            "Content-Range": "bytes {0}-{1}/{2}".format(location, location + len(chunk) - 1, self.file_size),
+            "X-Unique-Upload-Id": self.upload_id
+        }
 
-            chunk = file_io.read(chunk_size)
+    def acknowledge(self, location, chunk, upload_result):
+        """
+        Records the uploaded chunk in the journal, if the upload is journaled
+
+        :param location: The location of the chunk in the file
+        :param chunk: The data of the chunk
+        :param upload_result: The result of the chunk upload API call
+        """
+        if self.journaled_upload is not None:
+            self.journaled_upload.acknowledge(location, location + len(chunk) - 1, upload_result.get("public_id"))
+
+
+def _upload_large_chunks(large_upload):
+    """
+    Uploads the chunks of a large file one after another.
+
+    :param large_upload: The state of the upload.
+    :type large_upload: _LargeUpload
+    :return: The result of the final chunk upload API call.
+    :rtype: dict
+    """
+    upload_result = None
+
+    location, chunk = large_upload.next_chunk()
+
+    while chunk:
+        upload_result = large_upload.upload_chunk(location, chunk)
+
+        large_upload.options["public_id"] = upload_result.get("public_id")
+
+        location, chunk = large_upload.next_chunk()
+
+    return upload_result
+
+
+def _open_large_file(path):
+    """
+    Opens a local file for a chunked upload.
+
+    On Python 3 the file is memory-mapped, so its chunks are passed to the request without being copied.
+    Falls back to a regular file if the file cannot be mapped (pipes, special files).
+
+    :param path: The path of the local file.
+    :return: The opened file-like object.
+    """
+    if PY3:
+        try:
+            return utils.MappedFile(path)
+        except (ValueError, EnvironmentError):
+            pass
+
+    return open(path, 'rb')
+
+
+def _upload_large_chunks_concurrently(large_upload, max_workers):
+    """
+    Uploads the chunks of a large file using a pool of max_workers threads.
+
+    The first chunk is uploaded alone to obtain the public ID of the asset (unless it is known from the journal),
+    the middle chunks are uploaded concurrently and the final chunk is sent once all other chunks are uploaded,
+    so the server assembles the complete asset.
+    The number of chunks held in memory (read and not yet uploaded) is bounded by max_workers.
+
+    :param large_upload: The state of the upload.
+    :type large_upload: _LargeUpload
+    :param max_workers: The number of chunks to upload concurrently.
+    :return: The result of the final chunk upload API call.
+    :rtype: dict
+    """
+    upload_result = None
+
+    if not large_upload.options.get("public_id") or large_upload.journaled_upload is None:
+        location, chunk = large_upload.next_chunk()
+        if not chunk:
+            return None
+
+        upload_result = large_upload.upload_chunk(location, chunk)
+        large_upload.options["public_id"] = upload_result.get("public_id")
+
+    slots = threading.BoundedSemaphore(max_workers)
+    errors = []
+
+    def upload_chunk(location, chunk, chunk_options):
+        try:
+            return large_upload.upload_chunk(location, chunk, chunk_options)
+        except Exception as e:
+            errors.append(e)
+            raise
+        finally:
+            slots.release()
+
+    final_chunk = None
+    futures = []
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while not large_upload.is_final() and not errors:
+            slots.acquire()
+            location, chunk = large_upload.next_chunk()
+            if not chunk or large_upload.is_final():
+                # the final chunk is sent once all other chunks are uploaded
+                slots.release()
+                final_chunk = chunk
+                break
+
+            futures.append(executor.submit(copy_context().run, upload_chunk, location, chunk,
+                                           dict(large_upload.options)))
+            chunk = None
+
+        wait(futures, return_when=FIRST_EXCEPTION)
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+    if errors:
+        raise errors[0]
+
+    if futures:
+        upload_result = futures[-1].result()
+
+    if final_chunk:
+        upload_result = large_upload.upload_chunk(location, final_chunk)
 
     return upload_result
 
@@ -359,12 +738,13 @@ def upload_large_part(file, **options):
     :return: The result of the chunk upload API call.
     :rtype: dict
     """
-    params = utils.build_upload_params(**options)
+    conf = cloudinary.config_snapshot()
+    params = utils.build_upload_params(conf, **options)
 
     if 'resource_type' not in options:
         options['resource_type'] = "raw"
 
-    return call_cacheable_api("upload", params, file=file, **options)
+    return call_cacheable_api("upload", params, file=file, conf=conf, **options)
 
 
 def destroy(public_id, **options):
@@ -463,9 +843,10 @@ def explicit(public_id, **options):
     :return: The result of the API call.
     :rtype: dict
     """
-    params = utils.build_upload_params(**options)
+    conf = cloudinary.config_snapshot()
+    params = utils.build_upload_params(conf, **options)
     params["public_id"] = public_id
-    return call_cacheable_api("explicit", params, **options)
+    return call_cacheable_api("explicit", params, conf=conf, **options)
 
 
 def create_archive(**options):
@@ -596,8 +977,8 @@ def add_tag(tag, public_ids=None, **options):
 
     :param tag: A single tag or multiple tags (comma-separated string or list).
     :type tag: str or list[str]
-    :param public_ids: A list of public IDs (up to 1000).
-    :type public_ids: list[str], optional
+    :param public_ids: The public IDs, split into batches of up to 1000 public IDs.
+    :type public_ids: iterable[str], optional
     :param options: Additional options (e.g., exclusive).
     :keyword bool exclusive: If True, clears this tag from all other assets in the product environment.
     :return: Dictionary with a list of updated public IDs.
@@ -616,8 +997,8 @@ def remove_tag(tag, public_ids=None, **options):
 
     :param tag: A single tag or multiple tags (comma-separated string or list).
     :type tag: str or list[str]
-    :param public_ids: A list of public IDs (up to 1000).
-    :type public_ids: list[str], optional
+    :param public_ids: The public IDs, split into batches of up to 1000 public IDs.
+    :type public_ids: iterable[str], optional
     :param options: Additional options.
     :return: Dictionary with a list of updated public IDs.
     :rtype: dict
@@ -633,8 +1014,8 @@ def replace_tag(tag, public_ids=None, **options):
 
     :param tag: A single tag or multiple tags (comma-separated string or list).
     :type tag: str or list[str]
-    :param public_ids: A list of public IDs (up to 1000).
-    :type public_ids: list[str], optional
+    :param public_ids: The public IDs, split into batches of up to 1000 public IDs.
+    :type public_ids: iterable[str], optional
     :param options: Additional options.
     :return: Dictionary with a list of updated public IDs.
     :rtype: dict
@@ -648,8 +1029,8 @@ def remove_all_tags(public_ids, **options):
 
     See: https://cloudinary.com/documentation/image_upload_api_reference#removing_all_tags_syntax
 
-    :param public_ids: The public IDs of the assets.
-    :type public_ids: list[str]
+    :param public_ids: The public IDs of the assets, split into batches of up to 1000 public IDs.
+    :type public_ids: iterable[str]
     :param options: Additional options.
     :return: Dictionary with a list of updated public IDs.
     :rtype: dict
@@ -665,8 +1046,8 @@ def add_context(context, public_ids, **options):
 
     :param context: A dictionary of context key-value pairs.
     :type context: dict
-    :param public_ids: The public IDs of the assets to update.
-    :type public_ids: list[str]
+    :param public_ids: The public IDs of the assets to update, split into batches of up to 1000 public IDs.
+    :type public_ids: iterable[str]
     :param options: Additional options.
     :return: Dictionary with a list of updated public IDs.
     :rtype: dict
@@ -680,8 +1061,8 @@ def remove_all_context(public_ids, **options):
 
     See: https://cloudinary.com/documentation/image_upload_api_reference#removing_all_context_syntax
 
-    :param public_ids: The public IDs of the assets to update.
-    :type public_ids: list[str]
+    :param public_ids: The public IDs of the assets to update, split into batches of up to 1000 public IDs.
+    :type public_ids: iterable[str]
     :param options: Additional options.
     :return: Dictionary with a list of updated public IDs.
     :rtype: dict
@@ -699,20 +1080,22 @@ def call_tags_api(tag, command, public_ids=None, **options):
     :type tag: str or list[str], optional
     :param command: The command to execute ("add", "remove", "replace", or "remove_all").
     :type command: str
-    :param public_ids: A list of asset public IDs.
-    :type public_ids: list[str], optional
+    :param public_ids: The public IDs of the assets, see call_batched_api.
+    :type public_ids: iterable[str], optional
     :param options: Additional options (e.g., type).
     :return: The result of the API call.
     :rtype: dict
     """
-    params = {
+    return call_batched_api("tags", _tags_params(tag, command, **options), public_ids, **options)
+
+
+def _tags_params(tag, command, **options):
+    return {
         "timestamp": utils.now(),
         "tag": tag,
-        "public_ids": utils.build_array(public_ids),
         "command": command,
         "type": options.get("type")
     }
-    return call_api("tags", params, **options)
 
 
 def call_context_api(context, command, public_ids=None, **options):
@@ -725,20 +1108,111 @@ def call_context_api(context, command, public_ids=None, **options):
     :type context: dict or None
     :param command: The context command ("add", "remove_all").
     :type command: str
-    :param public_ids: A list of asset public IDs.
-    :type public_ids: list[str], optional
+    :param public_ids: The public IDs of the assets, see call_batched_api.
+    :type public_ids: iterable[str], optional
     :param options: Additional options (e.g., type).
     :return: The result of the API call.
     :rtype: dict
     """
-    params = {
+    return call_batched_api("context", _context_params(context, command, **options), public_ids, **options)
+
+
+def _context_params(context, command, **options):
+    return {
         "timestamp": utils.now(),
         "context": utils.encode_context(context),
-        "public_ids": utils.build_array(public_ids),
         "command": command,
         "type": options.get("type")
     }
-    return call_api("context", params, **options)
+
+
+def call_batched_api(action, params, public_ids, **options):
+    """
+    Calls an Upload API action on any number of public IDs, in batches of the number of public IDs the server accepts.
+
+    Multiple batches are sent concurrently, each one signed with a fresh timestamp, and their results are merged.
+    The call raises the error of the first batch only if all the batches fail.
+
+    :param action: The Upload API action (e.g. "tags", "context").
+    :type action: str
+    :param params: The parameters of the action, without the public IDs.
+    :type params: dict
+    :param public_ids: A public ID or an iterable of public IDs, consumed lazily.
+    :type public_ids: str or iterable[str]
+    :param options: Additional options.
+    :keyword int batch_size: The number of public IDs per request. Defaults to PUBLIC_IDS_BATCH_SIZE.
+    :keyword int max_workers: The number of batches sent concurrently. Defaults to PUBLIC_IDS_MAX_WORKERS.
+    :return: The result of the first successful batch (with its request_id), with the merged "public_ids" of the
+             successful batches, and "failed_batches": a list of {"public_ids": batch, "error": exception}.
+    :rtype: dict
+    """
+    batch_size = options.pop("batch_size", PUBLIC_IDS_BATCH_SIZE)
+    max_workers = options.pop("max_workers", PUBLIC_IDS_MAX_WORKERS)
+
+    public_id_batches = _split_public_ids(public_ids, batch_size)
+    first_batch = next(public_id_batches)
+    second_batch = next(public_id_batches, None)
+    if second_batch is None:
+        return _merge_batch_results([(first_batch, call_api(action, dict(params, public_ids=first_batch), **options))])
+
+    if "http_connector" not in options:
+        options["http_connector"] = batches.pooled_http_connector(max_workers)
+
+    def call_batch(batch):
+        return call_api(action, dict(params, public_ids=batch, timestamp=utils.now()), **options)
+
+    return _merge_batch_results(batches.run_concurrently(
+        call_batch, itertools.chain([first_batch, second_batch], public_id_batches), max_workers))
+
+
+def _split_public_ids(public_ids, batch_size):
+    """
+    Splits the public IDs into batches, a single public ID (or None) is a single batch.
+
+    :return: A generator of the batches, with at least one batch.
+    """
+    if public_ids is None or isinstance(public_ids, string_types):
+        yield utils.build_array(public_ids)
+        return
+
+    empty = True
+    for batch in batches.split(public_ids, batch_size):
+        empty = False
+        yield batch
+
+    if empty:
+        yield []
+
+
+def _merge_batch_results(batch_results):
+    """
+    Merges the results of the batches of call_batched_api.
+
+    :param batch_results: An iterable of (batch, result) tuples, the result is an exception if the batch failed.
+    :return: The merged result.
+    :rtype: dict
+
+    :raises Error: The error of the first batch, if all the batches failed.
+    """
+    result = None
+    public_ids = []
+    failed_batches = []
+    for batch, batch_result in batch_results:
+        if isinstance(batch_result, Exception):
+            failed_batches.append({"public_ids": batch, "error": batch_result})
+            continue
+
+        if result is None:
+            result = dict(batch_result)
+        public_ids.extend(batch_result.get("public_ids") or [])
+
+    if result is None:
+        raise failed_batches[0]["error"]
+
+    result["public_ids"] = public_ids
+    result["failed_batches"] = failed_batches
+
+    return result
 
 
 TEXT_PARAMS = [
@@ -839,7 +1313,7 @@ def _save_responsive_breakpoints_to_cache(result):
 
 
 def call_cacheable_api(action, params, http_headers=None, return_error=False, unsigned=False, file=None, timeout=None,
-                       **options):
+                       conf=None, **options):
     """
     Calls the Upload API and caches responsive breakpoints if enabled.
 
@@ -857,18 +1331,21 @@ def call_cacheable_api(action, params, http_headers=None, return_error=False, un
     :type file: Any, optional
     :param timeout: Request timeout in seconds.
     :type timeout: int, optional
+    :param conf: The configuration snapshot of the call, defaults to the current configuration.
+    :type conf: cloudinary.ConfigSnapshot, optional
     :param options: Additional Cloudinary configuration or parameters.
     :return: The parsed JSON response from Cloudinary.
     :rtype: dict
     """
-    result = call_api(action, params, http_headers, return_error, unsigned, file, timeout, **options)
-    if "use_cache" in options or cloudinary.config().use_cache:
+    conf = conf or cloudinary.config_snapshot()
+    result = call_api(action, params, http_headers, return_error, unsigned, file, timeout, conf=conf, **options)
+    if "use_cache" in options or conf.use_cache:
         _save_responsive_breakpoints_to_cache(result)
     return result
 
 
 def call_api(action, params, http_headers=None, return_error=False, unsigned=False, file=None, timeout=None,
-             extra_headers=None, **options):
+             extra_headers=None, conf=None, **options):
     """
     A low-level helper to call the Cloudinary Upload API.
 
@@ -888,12 +1365,98 @@ def call_api(action, params, http_headers=None, return_error=False, unsigned=Fal
     :type timeout: int, optional
     :param extra_headers: Additional headers to add/override.
     :type extra_headers: dict, optional
+    :param conf: The configuration snapshot of the call, defaults to the current configuration.
+                 All the configuration values of the call are read from it.
+    :type conf: cloudinary.ConfigSnapshot, optional
     :param options: Additional Cloudinary config or advanced parameters.
+    :keyword http_connector: The connector performing the request, defaults to the shared connector.
+    :keyword int max_retries: The number of retries of a failed request, see cloudinary.api_client.retry.
     :return: The parsed JSON response from Cloudinary.
     :rtype: dict
 
     :raises Error: If an HTTP error or a Cloudinary error occurs.
     """
+    conf = conf or cloudinary.config_snapshot()
+    http_connector = options.pop("http_connector", None) or _http or connection_pools.shared_http_connector()
+    retry_policy = retry.RetryPolicy.from_options(options, conf)
+
+    # a stream is sent again from its current position, a stream that cannot be rewound is not retried
+    position = _stream_position(file)
+    if position is None and hasattr(file, 'read'):
+        retry_policy.max_retries = 0
+
+    def send():
+        if position is not None:
+            file.seek(position)
+
+        api_url, param_list, body, headers, kw = _prepare_upload_request(
+            action, params, http_headers, unsigned, file, timeout, extra_headers, conf, **options)
+
+        try:
+            if body is not None:
+                return http_connector.request(method="POST", url=api_url, body=body, headers=headers, **kw)
+            return http_connector.request(method="POST", url=api_url, fields=param_list, headers=headers, **kw)
+        finally:
+            if body is not None:
+                body.close()
+
+    try:
+        response = retry.call_with_retries(send, retry_policy, _is_idempotent_upload(action, params, http_headers))
+    except HTTPError as e:
+        raise Error("Unexpected error - {0!r}".format(e))
+    except socket.error as e:
+        raise Error("Socket error: {0!r}".format(e))
+
+    return _parse_upload_response(response, return_error)
+
+
+def _stream_position(file):
+    """
+    Returns the current position of a stream to upload.
+
+    :param file: The asset to upload.
+    :return: The position, or None if the file is not a stream or its position is unknown.
+    """
+    if not (hasattr(file, 'read') and callable(file.read)):
+        return None
+
+    try:
+        return file.tell()
+    except (AttributeError, EnvironmentError, ValueError):
+        return None
+
+
+def _is_idempotent_upload(action, params, http_headers):
+    """
+    Indicates whether an Upload API call can be repeated without side effects.
+
+    Uploading an asset with a given public ID, or a chunk of a large upload, again overwrites the same asset.
+    An explicit call is repeatable unless it sends notifications or requests add-ons.
+
+    :param action: The Upload API action.
+    :param params: The parameters of the call.
+    :param http_headers: The HTTP headers of the call.
+    :return: True if the call can be retried after a server error.
+    :rtype: bool
+    """
+    if action in IDEMPOTENT_UPLOAD_ACTIONS:
+        return True
+
+    if action == "explicit":
+        return not any(params.get(name) for name in NON_IDEMPOTENT_EXPLICIT_PARAMS)
+
+    return action == "upload" and bool(params.get("public_id") or (http_headers or {}).get("Content-Range"))
+
+
+def _prepare_upload_request(action, params, http_headers=None, unsigned=False, file=None, timeout=None,
+                            extra_headers=None, conf=None, **options):
+    """
+    Prepares a request to the Upload API: signs the parameters and encodes the file.
+
+    :return: A tuple of the URL, the fields, the streaming body (or None), the headers and the extra keyword
+             arguments of the request. Either the fields or the body are sent, the body must be closed after use.
+    :rtype: tuple
+    """
     params = utils.cleanup_params(params)
 
     headers = {"User-Agent": cloudinary.get_user_agent()}
@@ -904,12 +1467,13 @@ def call_api(action, params, http_headers=None, return_error=False, unsigned=Fal
     if extra_headers is not None:
         headers.update(extra_headers)
 
-    oauth_token = options.get("oauth_token", cloudinary.config().oauth_token)
+    conf = conf or cloudinary.config_snapshot()
+    oauth_token = options.get("oauth_token", conf.oauth_token)
 
     if oauth_token:
         headers["authorization"] = "Bearer {}".format(oauth_token)
     elif not unsigned:
-        params = utils.sign_request(params, options)
+        params = utils.sign_request(params, options, conf)
 
     param_list = []
     for k, v in params.items():
@@ -919,23 +1483,37 @@ def call_api(action, params, http_headers=None, return_error=False, unsigned=Fal
         elif v:
             param_list.append((k, v))
 
-    api_url = utils.cloudinary_api_url(action, **options)
+    api_url = utils.cloudinary_api_url(action, conf, **options)
 
+    body = None
     if file:
         filename = options.get("filename")  # Custom filename for streams
-        param_list.append(("file", utils.handle_file_parameter(file, filename)))
+        streaming_file = _streaming_file_param(file, filename)
+        if streaming_file is not None:
+            file_param, owned = streaming_file
+            body = _MultipartBody(param_list + [file_param], [file_param.fileobj] if owned else [])
+            headers.update(body.headers)
+        else:
+            param_list.append(("file", utils.handle_file_parameter(file, filename)))
 
     kw = {}
     if timeout is not None:
         kw['timeout'] = timeout
 
-    try:
-        response = _http.request(method="POST", url=api_url, fields=param_list, headers=headers, **kw)
-    except HTTPError as e:
-        raise Error("Unexpected error - {0!r}".format(e))
-    except socket.error as e:
-        raise Error("Socket error: {0!r}".format(e))
+    return api_url, param_list, body, headers, kw
 
+
+def _parse_upload_response(response, return_error=False):
+    """
+    Parses the response of an Upload API call.
+
+    :param response: The HTTP response, with status, headers and data attributes.
+    :param return_error: If True, returns the error in the response instead of raising an exception.
+    :return: The parsed JSON response from Cloudinary.
+    :rtype: dict
+
+    :raises Error: If a Cloudinary error occurs.
+    """
     request_id = response.headers.get("x-request-id")
 
     try:
@@ -960,3 +1538,169 @@ def call_api(action, params, http_headers=None, return_error=False, unsigned=Fal
         result["request_id"] = request_id
 
     return result
+
+
+def _streaming_file_param(file, filename):
+    """
+    Builds the multipart parameter of a file that should be streamed rather than read into memory.
+
+    Local files, seekable binary streams and in-memory chunks of at least UPLOAD_STREAMING_THRESHOLD bytes
+    are streamed.
+
+    :param file: The file to upload, as passed to call_api.
+    :param filename: Custom filename.
+    :return: A tuple of the file parameter and whether its file was opened here (and should be closed),
+             or None if the file should be sent as a regular field.
+    :rtype: tuple
+    """
+    owned = False
+    if utils.PathLibPathType and isinstance(file, utils.PathLibPathType) or \
+            isinstance(file, string_types) and not utils.is_remote_url(file):
+        try:
+            size = os.path.getsize(str(file))
+        except EnvironmentError:
+            # let the regular file handling report the error
+            return None
+        if size < UPLOAD_STREAMING_THRESHOLD:
+            return None
+        name = filename or (file.name if not isinstance(file, string_types) else file)
+        fileobj = open(str(file), 'rb')
+        owned = True
+    elif hasattr(file, 'read') and callable(file.read):
+        if isinstance(file, io.TextIOBase):
+            return None
+        try:
+            size = utils.file_io_size(file) - file.tell()
+        except (AttributeError, EnvironmentError, ValueError):
+            # not seekable
+            return None
+        if size < UPLOAD_STREAMING_THRESHOLD:
+            return None
+        name = filename or (file.name if hasattr(file, 'name') and isinstance(file.name, str) else "stream")
+        fileobj = file
+    elif isinstance(file, tuple) and len(file) == 2:
+        name, data = file
+        try:
+            fileobj = _BufferReader(data)
+        except TypeError:
+            # not a bytes-like object
+            return None
+        size = len(fileobj)
+        if size < UPLOAD_STREAMING_THRESHOLD:
+            return None
+    else:
+        return None
+
+    param = MultipartParam("file", filetype=mimetypes.guess_type(name)[0] or "application/octet-stream",
+                           filesize=size, fileobj=fileobj)
+    param.filename = to_bytes(_format_filename(name))
+
+    return param, owned
+
+
+def _format_filename(name):
+    """
+    Escapes the file name the way the installed urllib3 does for the file names of regular fields.
+
+    :param name: The file name.
+    :type name: str
+
+    :return: The escaped file name.
+    :rtype: str
+    """
+    return _format_header_param("filename", text_type(name))[len('filename="'):-1]
+
+
+class _BufferReader(object):
+    """
+    A minimal file-like reader of a bytes-like object, that does not copy the data
+    """
+    def __init__(self, data):
+        self._view = memoryview(data)
+        if self._view.itemsize != 1:
+            self._view = self._view.cast("B")
+        self._position = 0
+
+    def __len__(self):
+        return len(self._view)
+
+    def read(self, size=-1):
+        start = self._position
+        end = len(self) if size is None or size < 0 else min(start + size, len(self))
+        self._position = max(start, end)
+        return self._view[start:end]
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        self._position = offset + {os.SEEK_SET: 0, os.SEEK_CUR: self._position, os.SEEK_END: len(self)}[whence]
+        return self._position
+
+
+class _MultipartBody(object):
+    """
+    A streaming multipart/form-data request body.
+
+    The body is read in blocks, so file parameters are never held in memory as a whole.
+    Supports rewinding to the start, so the request can be retried.
+    """
+    def __init__(self, params, owned_files=()):
+        """
+        :param params: A list of (name, value) pairs and MultipartParam objects.
+        :param owned_files: The file objects to close along with the body.
+        """
+        self._owned_files = owned_files
+        self._params = MultipartParam.from_params(params)
+        self._files = [(param.fileobj, param.fileobj.tell()) for param in self._params if param.fileobj is not None]
+
+        blocks, self.headers = multipart_encode(self._params, blocksize=UPLOAD_STREAMING_BLOCK_SIZE)
+        self._boundary = blocks.boundary
+        self._rewind(blocks)
+
+    def _rewind(self, blocks=None):
+        if blocks is None:
+            for fileobj, position in self._files:
+                fileobj.seek(position)
+            blocks = multipart_yielder(self._params, self._boundary, None, UPLOAD_STREAMING_BLOCK_SIZE)
+
+        self._blocks = blocks
+        self._block = b""
+        self._position = 0
+
+    def read(self, size=-1):
+        """
+        Reads the next block of the body, of up to size bytes.
+
+        :return: The next block, or an empty bytes object at the end of the body
+        """
+        if not self._block:
+            self._block = next(self._blocks, b"")
+
+        if size is None or size < 0:
+            block = b"".join([bytes(self._block)] + [bytes(b) for b in self._blocks])
+            self._block = b""
+        elif size >= len(self._block):
+            block, self._block = self._block, b""
+        else:
+            block = memoryview(self._block)[:size]
+            self._block = memoryview(self._block)[size:]
+
+        self._position += len(block)
+
+        return block
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if offset != 0 or whence != os.SEEK_SET:
+            raise io.UnsupportedOperation("Multipart body can only be rewound to its start")
+
+        self._rewind()
+
+        return self._position
+
+    def close(self):
+        for fileobj in self._owned_files:
+            fileobj.close()
@@ -2,12 +2,13 @@
 import base64
 import copy
 import hashlib
+import hmac
 import json
+import mmap
 import os
 import random
 import re
 import string
-import struct
 import time
 import urllib
 import zlib
@@ -18,12 +19,11 @@ from numbers import Number
 
 import six.moves.urllib.parse
 from six import iteritems
-from urllib3 import ProxyManager, PoolManager
 
 import cloudinary
 from cloudinary import auth_token
-from cloudinary.api_client.tcp_keep_alive_manager import TCPKeepAlivePoolManager, TCPKeepAliveProxyManager
-from cloudinary.compat import PY3, to_bytes, to_bytearray, to_string, string_types, urlparse
+from cloudinary.cache.lru_cache import LRUCache
+from cloudinary.compat import PY3, to_bytes, to_string, string_types, urlparse
 
 try:  # Python 3.4+
     from pathlib import Path as PathLibPathType
@@ -43,6 +43,7 @@ DEFAULT_RESPONSIVE_WIDTH_TRANSFORMATION = {"width": "auto", "crop": "limit"}
 RANGE_VALUE_RE = r'^(?P<value>(\d+\.)?\d+)(?P<modifier>[%pP])?$'
 RANGE_RE = r'^(\d+\.)?\d+[%pP]?\.\.(\d+\.)?\d+[%pP]?$'
 FLOAT_RE = r'^(\d+)\.(\d+)?$'
+_NUMBER_TYPES = six.integer_types + (float,)
 REMOTE_URL_RE = r'ftp:|https?:|s3:|gs:|data:([\w-]+\/[\w-]+(\+[\w-]+)?)?(;[\w-]+=[\w-]+)*;base64,([a-zA-Z0-9\/+\n=]+)$'
 __LAYER_KEYWORD_PARAMS = [("font_weight", "normal"),
                           ("font_style", "normal"),
@@ -172,6 +173,102 @@ signature_algorithms = {
     SIGNATURE_SHA256: hashlib.sha256,
 }
 
+TRANSFORMATION_CACHE_SIZE = 1024
+
+transformation_cache = LRUCache(TRANSFORMATION_CACHE_SIZE)
+"""
+Compiled transformations cache used by `generate_transformation_string`.
+Set `transformation_cache.max_size = 0` to disable it.
+"""
+
+
+class UrlSignatureCache(LRUCache):
+    """
+    Caches signatures of delivery URLs.
+
+    The cache keys hold a keyed fingerprint of the API secret instead of the secret itself,
+    the fingerprint key is random per process.
+    """
+    def __init__(self, max_size=0):
+        """
+        Initialize the cache
+
+        :param max_size: The maximal number of signatures to keep. 0 (default) disables the cache
+        """
+        super(UrlSignatureCache, self).__init__(max_size)
+
+        self._fingerprint_key = os.urandom(32)
+        self._last_fingerprint = (None, None)
+
+    def _fingerprint(self, api_secret):
+        """
+        Computes the keyed fingerprint of the API secret, reusing the last one for the same secret object.
+
+        :param api_secret: The API secret
+
+        :return: The fingerprint
+        """
+        secret, fingerprint = self._last_fingerprint
+        if secret is not api_secret:
+            fingerprint = hmac.new(self._fingerprint_key, to_bytes(api_secret), hashlib.sha256).digest()
+            self._last_fingerprint = (api_secret, fingerprint)
+
+        return fingerprint
+
+    def signature(self, to_sign, api_secret, signature_algorithm, chars_length):
+        """
+        Retrieves the signature from the cache, computing and storing it if not found.
+
+        See `compute_url_signature` for the parameters.
+
+        :return: The URL signature
+        """
+        key = (to_sign, self._fingerprint(api_secret), signature_algorithm, chars_length)
+
+        signature = self.get(key)
+        if signature is None:
+            signature = compute_url_signature(to_sign, api_secret, signature_algorithm, chars_length)
+            self.set(key, signature)
+
+        return signature
+
+
+url_signature_cache = UrlSignatureCache()
+"""
+Opt-in delivery URL signatures cache, enabled by `cloudinary.config(url_signature_cache_size=<size>)`.
+Cleared when the `api_secret` is changed by `cloudinary.config()`.
+"""
+
+
+def compute_url_signature(to_sign, api_secret, signature_algorithm, chars_length):
+    """
+    Computes the signature of a delivery URL.
+
+    :param to_sign:             The transformation and the source part of the URL
+    :param api_secret:          The API secret
+    :param signature_algorithm: The name of the hashing algorithm
+    :param chars_length:        The length of the signature
+
+    :return: The URL signature, of the "s--<signature>--" form
+    """
+    hash_fn = signature_algorithms[signature_algorithm]
+    return "s--" + to_string(
+        base64.urlsafe_b64encode(hash_fn(to_bytes(to_sign + api_secret)).digest())[0:chars_length]) + "--"
+
+
+def url_signature(to_sign, api_secret, signature_algorithm, chars_length):
+    """
+    Returns the signature of a delivery URL, using the `url_signature_cache` if it is enabled.
+
+    See `compute_url_signature` for the parameters.
+
+    :return: The URL signature
+    """
+    if url_signature_cache.enabled:
+        return url_signature_cache.signature(to_sign, api_secret, signature_algorithm, chars_length)
+
+    return compute_url_signature(to_sign, api_secret, signature_algorithm, chars_length)
+
 
 def compute_hex_hash(s, algorithm=SIGNATURE_SHA1):
     """
@@ -316,26 +413,171 @@ def encode_date_to_usage_api_format(date_obj):
     return date_obj.strftime('%d-%m-%Y')
 
 
-def patch_fetch_format(options):
+def patch_fetch_format(options, conf=None):
     """
     When upload type is fetch, remove the format options.
     In addition, set the fetch_format options to the format value unless it was already set.
     Mutates the "options" parameter!
 
     :param options: URL and transformation options
+    :param conf:    The configuration snapshot of the call, defaults to the current configuration
+
+    :return: True if the format is delivered as a part of the transformation, False otherwise
     """
-    use_fetch_format = options.pop("use_fetch_format", cloudinary.config().use_fetch_format)
+    if "use_fetch_format" in options:
+        use_fetch_format = options.pop("use_fetch_format")
+    else:
+        use_fetch_format = (conf or cloudinary.config_snapshot()).use_fetch_format
 
     if options.get("type", "upload") != "fetch" and not use_fetch_format:
-        return
+        return False
 
     resource_format = options.pop("format", None)
     if "fetch_format" not in options:
         options["fetch_format"] = resource_format
 
+    return True
+
 
 def generate_transformation_string(**options):
-    responsive_width = options.pop("responsive_width", cloudinary.config().responsive_width)
+    """
+    Generates the transformation string from the transformation options.
+
+    Results are kept in `transformation_cache`, keyed by the transformation parameters and the configuration values
+    the transformation depends on, so repeated calls with the same transformation skip the parsing altogether,
+    whatever the other (per asset) options are.
+
+    :param options: Transformation and URL options
+
+    :return: A tuple of the transformation string and the options left unprocessed
+    :rtype: tuple
+    """
+    return _transformation_string(options, cloudinary.config_snapshot())
+
+
+def _transformation_string(options, conf):
+    """
+    Generates the transformation string from the transformation options, see `generate_transformation_string`.
+
+    :param options: Transformation and URL options, left unchanged
+    :param conf:    The configuration snapshot of the call
+
+    :return: A tuple of the transformation string and the options left unprocessed
+    :rtype: tuple
+    """
+    if not transformation_cache.enabled:
+        return _generate_transformation_string(options, conf)
+
+    transformation_options = dict((name, value) for name, value in options.items() if _is_transformation_param(name))
+
+    try:
+        key = _transformation_cache_key(transformation_options, conf)
+    except TypeError:
+        # Some values cannot be hashed, the options cannot be cached
+        return _generate_transformation_string(options, conf)
+
+    cached = transformation_cache.get(key)
+    if cached is None:
+        transformation, leftover = _generate_transformation_string(transformation_options, conf)
+        cached = _compile_leftover_options(transformation, leftover, transformation_options)
+        if cached is None:
+            return _generate_transformation_string(options, conf)
+
+        transformation_cache.set(key, cached)
+
+    transformation, compiled_leftover = cached
+    kept = set(name for name, _, _ in compiled_leftover)
+    # the leftover options keep their order, as if updated in place by _generate_transformation_string
+    leftover = dict((name, value) for name, value in options.items()
+                    if name in kept or name not in transformation_options)
+    for name, passed_through, value in compiled_leftover:
+        if not passed_through:
+            leftover[name] = value
+
+    return transformation, leftover
+
+
+# The options read by _generate_transformation_string, along with the variables ($name options)
+_TRANSFORMATION_PARAMS = frozenset([
+    "angle", "aspect_ratio", "background", "border", "color", "crop", "custom_function", "custom_pre_function",
+    "dpr", "duration", "effect", "end_offset", "flags", "fps", "height", "if", "keyframe_interval", "offset",
+    "opacity", "overlay", "quality", "radius", "raw_transformation", "responsive_width", "size", "start_offset",
+    "transformation", "underlay", "variables", "video_codec", "width", "x", "y", "zoom",
+] + list(_SIMPLE_TRANSFORMATION_PARAMS.values()))
+
+
+def _is_transformation_param(name):
+    return name in _TRANSFORMATION_PARAMS or name.startswith("$")
+
+
+def _transformation_cache_key(options, conf):
+    """
+    Builds a hashable key of the transformation options.
+
+    The configuration values the transformation string depends on are part of the key.
+
+    :param options: Transformation options, without the other URL options (the API secret, for example)
+    :param conf:    The configuration snapshot of the call
+
+    :return: Hashable key
+    :raises TypeError: In case some of the values cannot be hashed
+    """
+    return (_freeze(options),
+            _freeze(conf.responsive_width),
+            _freeze(conf.dpr),
+            _freeze(conf.responsive_width_transformation))
+
+
+def _freeze(value):
+    """
+    Converts a value to a hashable representation.
+
+    Value types are preserved, so that, for example, `1`, `1.0` and `True` produce different keys,
+    as well as the order of dict items, which is significant for some of the parameters.
+
+    :param value: The value to convert
+
+    :return: Hashable representation of the value
+    :raises TypeError: In case the value cannot be hashed
+    """
+    if isinstance(value, dict):
+        return dict, tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_freeze(v) for v in value)
+
+    hash(value)
+
+    return type(value), value
+
+
+def _compile_leftover_options(transformation, leftover, options):
+    """
+    Prepares the result of `_generate_transformation_string` for caching.
+
+    Leftover options that were passed through are taken from the options of each call,
+    only the values produced by the transformation generation itself (for example `responsive`) are stored.
+
+    :param transformation: The generated transformation string
+    :param leftover: The leftover options
+    :param options: The original options
+
+    :return: A tuple of the transformation and the compiled leftover options, None if cannot be cached
+    """
+    compiled_leftover = []
+    for name, value in leftover.items():
+        if name in options and options[name] is value:
+            compiled_leftover.append((name, True, None))
+        elif value is None or isinstance(value, (bool, Number) + string_types):
+            compiled_leftover.append((name, False, value))
+        else:
+            return None
+
+    return transformation, tuple(compiled_leftover)
+
+
+def _generate_transformation_string(options, conf):
+    options = dict(options)
+    responsive_width = options.pop("responsive_width", conf.responsive_width)
     size = options.pop("size", None)
     if size:
         options["width"], options["height"] = size.split("x")
@@ -363,8 +605,8 @@ def generate_transformation_string(**options):
     if any(isinstance(bs, dict) for bs in base_transformations):
         def recurse(bs):
             if isinstance(bs, dict):
-                return generate_transformation_string(**bs)[0]
-            return generate_transformation_string(transformation=bs)[0]
+                return _transformation_string(bs, conf)[0]
+            return _transformation_string({"transformation": bs}, conf)[0]
 
         base_transformations = list(map(recurse, base_transformations))
         named_transformation = None
@@ -385,7 +627,7 @@ def generate_transformation_string(**options):
                                                   "width": str(border.get("width", 2))}
 
     flags = ".".join(build_array(options.pop("flags", None)))
-    dpr = options.pop("dpr", cloudinary.config().dpr)
+    dpr = options.pop("dpr", conf.dpr)
     duration = norm_range_value(options.pop("duration", None))
 
     so_raw = options.pop("start_offset", None)
@@ -478,9 +720,9 @@ def generate_transformation_string(**options):
     transformations = base_transformations + [transformation]
 
     if responsive_width:
-        responsive_width_transformation = cloudinary.config().responsive_width_transformation \
+        responsive_width_transformation = conf.responsive_width_transformation \
                                           or DEFAULT_RESPONSIVE_WIDTH_TRANSFORMATION
-        transformations += [generate_transformation_string(**responsive_width_transformation)[0]]
+        transformations += [_transformation_string(responsive_width_transformation, conf)[0]]
     url = "/".join([trans for trans in transformations if trans])
 
     if str(width).startswith("auto") or responsive_width:
@@ -628,15 +870,16 @@ def json_body(params, headers=None):
     return json.dumps(params).encode("utf-8"), headers
 
 
-def sign_request(params, options):
-    api_key = options.get("api_key", cloudinary.config().api_key)
+def sign_request(params, options, conf=None):
+    conf = conf or cloudinary.config_snapshot()
+    api_key = options.get("api_key", conf.api_key)
     if not api_key:
         raise ValueError("Must supply api_key")
-    api_secret = options.get("api_secret", cloudinary.config().api_secret)
+    api_secret = options.get("api_secret", conf.api_secret)
     if not api_secret:
         raise ValueError("Must supply api_secret")
-    signature_algorithm = options.get("signature_algorithm", cloudinary.config().signature_algorithm)
-    signature_version = options.get("signature_version", cloudinary.config().signature_version)
+    signature_algorithm = options.get("signature_algorithm", conf.signature_algorithm)
+    signature_version = options.get("signature_version", conf.signature_version)
 
     params = cleanup_params(params)
     params["signature"] = api_sign_request(params, api_secret, signature_algorithm, signature_version)
@@ -704,19 +947,20 @@ def _encode_param(value):
     return str(value).replace("&", "%26")
 
 
-def breakpoint_settings_mapper(breakpoint_settings):
+def breakpoint_settings_mapper(breakpoint_settings, conf=None):
     breakpoint_settings = copy.deepcopy(breakpoint_settings)
     transformation = breakpoint_settings.get("transformation")
     if transformation is not None:
-        breakpoint_settings["transformation"], _ = generate_transformation_string(**transformation)
+        breakpoint_settings["transformation"], _ = _transformation_string(
+            transformation, conf or cloudinary.config_snapshot())
     return breakpoint_settings
 
 
-def generate_responsive_breakpoints_string(breakpoints):
+def generate_responsive_breakpoints_string(breakpoints, conf=None):
     if breakpoints is None:
         return None
     breakpoints = build_array(breakpoints)
-    return json.dumps(list(map(breakpoint_settings_mapper, breakpoints)))
+    return json.dumps([breakpoint_settings_mapper(settings, conf) for settings in breakpoints])
 
 
 def finalize_source(source, format, url_suffix):
@@ -768,6 +1012,16 @@ def finalize_resource_type(resource_type, type, url_suffix, use_root_path, short
     return resource_type, upload_type
 
 
+CDN_SHARDS_COUNT = 5
+
+_SHARED_CDN_HOST_RE = re.compile('res.cloudinary.com')
+
+DISTRIBUTION_PREFIXES_CACHE_SIZE = 128
+
+_distribution_prefixes_cache = LRUCache(DISTRIBUTION_PREFIXES_CACHE_SIZE)
+_last_distribution_prefixes = None, None
+
+
 def unsigned_download_url_prefix(source, cloud_name, private_cdn, cdn_subdomain,
                                  secure_cdn_subdomain, cname, secure, secure_distribution):
     """cdn_subdomain and secure_cdn_subdomain
@@ -781,8 +1035,72 @@ def unsigned_download_url_prefix(source, cloud_name, private_cdn, cdn_subdomain,
     3) Customers with cname
       if cdn_domain is true uses a[1-5].cname for http. For https, uses the same naming scheme
       as 1 for shared distribution and as 2 for private distribution."""
+    prefixes = distribution_prefixes(cloud_name, private_cdn, cdn_subdomain, secure_cdn_subdomain, cname, secure,
+                                     secure_distribution)
+
+    return shard_prefix(prefixes, source)
+
+
+def distribution_prefixes(cloud_name, private_cdn, cdn_subdomain, secure_cdn_subdomain, cname, secure,
+                          secure_distribution):
+    """
+    Returns the possible download URL prefixes of the distribution configuration, one per CDN shard.
+
+    The prefixes are computed once per configuration.
+    If the configuration does not use CDN subdomains, a single prefix is returned.
+
+    :return: A tuple of the download URL prefixes, to be passed to `shard_prefix`
+    :rtype: tuple
+    """
+    global _last_distribution_prefixes
+
+    key = (cloud_name, private_cdn, cdn_subdomain, secure_cdn_subdomain, cname, secure, secure_distribution)
+
+    last_key, prefixes = _last_distribution_prefixes
+    if last_key == key:
+        # most calls share the same configuration, skip the cache lookup
+        return prefixes
+
+    try:
+        prefixes = _distribution_prefixes_cache.get(key)
+    except TypeError:
+        # unhashable configuration values
+        prefixes = None
+
+    if prefixes is None:
+        prefixes = tuple(_download_url_prefix(str(shard), *key)
+                         for shard in range(1, CDN_SHARDS_COUNT + 1))
+        if len(set(prefixes)) == 1:
+            prefixes = prefixes[:1]
+        try:
+            _distribution_prefixes_cache.set(key, prefixes)
+        except TypeError:
+            return prefixes
+
+    _last_distribution_prefixes = key, prefixes
+
+    return prefixes
+
+
+def shard_prefix(prefixes, source):
+    """
+    Returns the download URL prefix of the CDN shard of the source.
+
+    :param prefixes: The download URL prefixes, as returned by `distribution_prefixes`
+    :param source:   The source of the URL
+
+    :return: The download URL prefix
+    :rtype: str
+    """
+    if len(prefixes) == 1:
+        return prefixes[0]
+
+    return prefixes[(zlib.crc32(to_bytes(source)) & 0xffffffff) % CDN_SHARDS_COUNT]
+
+
+def _download_url_prefix(shard, cloud_name, private_cdn, cdn_subdomain,
+                         secure_cdn_subdomain, cname, secure, secure_distribution):
     shared_domain = not private_cdn
-    shard = __crc(source)
     if secure:
         if secure_distribution is None or secure_distribution == cloudinary.OLD_AKAMAI_SHARED_CDN:
             secure_distribution = cloud_name + "-res.cloudinary.com" \
@@ -793,8 +1111,7 @@ def unsigned_download_url_prefix(source, cloud_name, private_cdn, cdn_subdomain,
             secure_cdn_subdomain = cdn_subdomain
 
         if secure_cdn_subdomain:
-            secure_distribution = re.sub('res.cloudinary.com', "res-" + shard + ".cloudinary.com",
-                                         secure_distribution)
+            secure_distribution = _SHARED_CDN_HOST_RE.sub("res-" + shard + ".cloudinary.com", secure_distribution)
 
         prefix = "https://" + secure_distribution
     elif cname:
@@ -814,21 +1131,32 @@ def unsigned_download_url_prefix(source, cloud_name, private_cdn, cdn_subdomain,
 
 def build_distribution_domain(options):
     source = options.pop('source', '')
-    cloud_name = options.pop("cloud_name", cloudinary.config().cloud_name or None)
+
+    return unsigned_download_url_prefix(source, *_distribution_prefix_args(options))
+
+
+def _distribution_prefix_args(options, conf=None):
+    """
+    Pops the distribution options, falling back to the configuration.
+
+    :param options: Delivery URL options
+    :param conf:    The configuration snapshot of the call, defaults to the current configuration
+
+    :return: The arguments of `unsigned_download_url_prefix` following the source
+    :rtype: tuple
+    """
+    conf = conf or cloudinary.config_snapshot()
+    cloud_name = options.pop("cloud_name", conf.cloud_name or None)
     if cloud_name is None:
         raise ValueError("Must supply cloud_name in tag or in configuration")
-    secure = options.pop("secure", cloudinary.config().secure)
-    private_cdn = options.pop("private_cdn", cloudinary.config().private_cdn)
-    cname = options.pop("cname", cloudinary.config().cname)
-    secure_distribution = options.pop("secure_distribution",
-                                      cloudinary.config().secure_distribution)
-    cdn_subdomain = options.pop("cdn_subdomain", cloudinary.config().cdn_subdomain)
-    secure_cdn_subdomain = options.pop("secure_cdn_subdomain",
-                                       cloudinary.config().secure_cdn_subdomain)
+    secure = options.pop("secure", conf.secure)
+    private_cdn = options.pop("private_cdn", conf.private_cdn)
+    cname = options.pop("cname", conf.cname)
+    secure_distribution = options.pop("secure_distribution", conf.secure_distribution)
+    cdn_subdomain = options.pop("cdn_subdomain", conf.cdn_subdomain)
+    secure_cdn_subdomain = options.pop("secure_cdn_subdomain", conf.secure_cdn_subdomain)
 
-    return unsigned_download_url_prefix(
-        source, cloud_name, private_cdn, cdn_subdomain, secure_cdn_subdomain,
-        cname, secure, secure_distribution)
+    return cloud_name, private_cdn, cdn_subdomain, secure_cdn_subdomain, cname, secure, secure_distribution
 
 
 def merge(*dict_args):
@@ -843,87 +1171,247 @@ def merge(*dict_args):
 
 
 def cloudinary_url(source, **options):
-    original_source = source
+    return _UrlContext(options).build(source)
 
-    patch_fetch_format(options)
-    type = options.pop("type", "upload")
 
-    transformation, options = generate_transformation_string(**options)
+def cloudinary_urls(sources, **options):
+    """
+    Generates delivery URLs of multiple assets sharing the same options.
 
-    resource_type = options.pop("resource_type", "image")
+    The transformation, the distribution domain and the signing setup are resolved once for all the sources,
+    the resulting URLs are identical to the ones returned by `cloudinary_url`.
 
-    force_version = options.pop("force_version", cloudinary.config().force_version)
-    if force_version is None:
-        force_version = True
+    :param sources: An iterable of public IDs (or remote URLs), or of (source, version, format) tuples,
+                    tuple items that are None fall back to the shared options
+    :type sources:  collections.abc.Iterable
+    :param options: Delivery URL and transformation options shared by all the sources
 
-    version = options.pop("version", None)
+    :return: List of the resulting URLs, in the order of the sources
+    :rtype: list
+    """
+    original_options = options.copy()
+    context = _UrlContext(options)
 
-    format = options.pop("format", None)
-    shorten = options.pop("shorten", cloudinary.config().shorten)
+    urls = []
+    for source in sources:
+        version = file_format = None
+        if isinstance(source, (list, tuple)):
+            source, version, file_format = (tuple(source) + (None, None))[:3]
 
-    sign_url = options.pop("sign_url", cloudinary.config().sign_url)
-    api_secret = options.pop("api_secret", cloudinary.config().api_secret)
-    url_suffix = options.pop("url_suffix", None)
-    use_root_path = options.pop("use_root_path", cloudinary.config().use_root_path)
-    auth_token = options.pop("auth_token", None)
-    long_url_signature = options.pop("long_url_signature", cloudinary.config().long_url_signature)
-    signature_algorithm = options.pop("signature_algorithm", cloudinary.config().signature_algorithm)
-    if auth_token is not False:
-        auth_token = merge(cloudinary.config().auth_token, auth_token)
+        if file_format is not None and context.format_in_transformation:
+            # the format is part of the transformation, it cannot be shared
+            item_options = dict(original_options, format=file_format)
+            if version is not None:
+                item_options["version"] = version
+            urls.append(_UrlContext(item_options, context._conf).build(source)[0])
+            continue
 
-    if (not source) or type == "upload" and re.match(r'^https?:', source):
-        return original_source, options
+        urls.append(context.build(source, version, file_format)[0])
 
-    resource_type, type = finalize_resource_type(
-        resource_type, type, url_suffix, use_root_path, shorten)
-    source, source_to_sign = finalize_source(source, format, url_suffix)
+    return urls
 
-    if not version and force_version \
-            and source_to_sign.find("/") >= 0 \
-            and not re.match(r'^https?:/', source_to_sign) \
-            and not re.match(r'^v[0-9]+', source_to_sign):
-        version = "1"
-    if version:
-        version = "v" + str(version)
-    else:
-        version = None
-
-    transformation = re.sub(r'([^:])/+', r'\1/', transformation)
-
-    signature = None
-    if sign_url and (not auth_token or auth_token.pop('set_url_signature', False)):
-        if not api_secret:
-            raise ValueError("Must supply api_secret")
-        to_sign = "/".join(__compact([transformation, source_to_sign]))
-        if long_url_signature:
-            # Long signature forces SHA256
-            signature_algorithm = SIGNATURE_SHA256
-            chars_length = LONG_URL_SIGNATURE_LENGTH
+
+class _UrlContext(object):
+    """
+    Delivery URL options resolved from the options and the configuration,
+    used for building the URLs of one or more sources.
+
+    The configuration is read from a single snapshot, so a concurrent configuration change cannot mix two
+    configurations in one URL.
+    """
+    def __init__(self, options, conf=None):
+        """
+        :param options: Delivery URL and transformation options, consumed by the context
+        :param conf:    The configuration snapshot, defaults to the current configuration
+        """
+        conf = self._conf = conf or cloudinary.config_snapshot()
+        self.format_in_transformation = patch_fetch_format(options, conf)
+        self.type = options.pop("type", "upload")
+
+        self.transformation, options = _transformation_string(options, conf)
+
+        self.resource_type = options.pop("resource_type", "image")
+
+        force_version = options.pop("force_version", conf.force_version)
+        self.force_version = True if force_version is None else force_version
+
+        self.version = options.pop("version", None)
+
+        self.format = options.pop("format", None)
+        self.shorten = options.pop("shorten", conf.shorten)
+
+        self.sign_url = options.pop("sign_url", conf.sign_url)
+        self.api_secret = options.pop("api_secret", conf.api_secret)
+        self.url_suffix = options.pop("url_suffix", None)
+        self.use_root_path = options.pop("use_root_path", conf.use_root_path)
+        auth_token = options.pop("auth_token", None)
+        self.long_url_signature = options.pop("long_url_signature", conf.long_url_signature)
+        self.signature_algorithm = options.pop("signature_algorithm", conf.signature_algorithm)
+        if auth_token is not False:
+            auth_token = merge(conf.auth_token, auth_token)
+        self.set_url_signature = False
+        if auth_token:
+            auth_token = auth_token.copy()
+            self.set_url_signature = auth_token.pop('set_url_signature', False)
+        self.auth_token = auth_token
+        self._auth_token_signer = None
+
+        self.options = options
+
+        self._path_types = None
+        self._delivery = None
+
+    def build(self, source, version=None, format=None):
+        """
+        Builds the URL of the source.
+
+        :param source:  The public ID (or a remote URL) of the asset
+        :param version: The version of the asset, overrides the version option
+        :param format:  The format of the asset, overrides the format option
+
+        :return: A tuple of the resulting URL and the leftover options
+        """
+        if (not source) or self.type == "upload" and re.match(r'^https?:', source):
+            return source, self.options
+
+        resource_type, type = self._resolve_path_types()
+        source, source_to_sign = finalize_source(source, self.format if format is None else format, self.url_suffix)
+
+        version = self.version if version is None else version
+        if not version and self.force_version \
+                and source_to_sign.find("/") >= 0 \
+                and not re.match(r'^https?:/', source_to_sign) \
+                and not re.match(r'^v[0-9]+', source_to_sign):
+            version = "1"
+        if version:
+            version = "v" + str(version)
         else:
-            chars_length = SHORT_URL_SIGNATURE_LENGTH
-        if signature_algorithm not in signature_algorithms:
-            raise ValueError("Unsupported signature algorithm '{}'".format(signature_algorithm))
-        hash_fn = signature_algorithms[signature_algorithm]
-        signature = "s--" + to_string(
-            base64.urlsafe_b64encode(
-                hash_fn(to_bytes(to_sign + api_secret)).digest())[0:chars_length]) + "--"
-
-    options["source"] = source
-    prefix = build_distribution_domain(options)
-
-    source = "/".join(__compact(
-        [prefix, resource_type, type, signature, transformation, version, source]))
-    if sign_url and auth_token:
-        path = urlparse(source).path
-        token = cloudinary.auth_token.generate(**merge(auth_token, {"url": path}))
-        source = "%s?%s" % (source, token)
-    return source, options
-
-
-def base_api_url(path, **options):
-    cloudinary_prefix = options.get("upload_prefix", cloudinary.config().upload_prefix) \
-                        or "https://api.cloudinary.com"
-    cloud_name = options.get("cloud_name", cloudinary.config().cloud_name)
+            version = None
+
+        transformation, signature_algorithm, chars_length, prefixes, options = self._resolve_delivery()
+
+        signature = None
+        if signature_algorithm is not None:
+            to_sign = "/".join([part for part in [transformation, source_to_sign] if part])
+            signature = url_signature(to_sign, self.api_secret, signature_algorithm, chars_length)
+
+        prefix = shard_prefix(prefixes, source)
+
+        url = "/".join([part for part in [prefix, resource_type, type, signature, transformation, version, source]
+                        if part])
+        if self.sign_url and self.auth_token:
+            path = urlparse(url).path
+            if self._auth_token_signer is None:
+                self._auth_token_signer = auth_token.AuthTokenSigner(**self.auth_token)
+            token = self._auth_token_signer.generate(url=path)
+            url = "%s?%s" % (url, token)
+        return url, options
+
+    def _resolve_path_types(self):
+        if self._path_types is None:
+            self._path_types = finalize_resource_type(
+                self.resource_type, self.type, self.url_suffix, self.use_root_path, self.shorten)
+        return self._path_types
+
+    def _resolve_delivery(self):
+        if self._delivery is not None:
+            return self._delivery
+
+        transformation = re.sub(r'([^:])/+', r'\1/', self.transformation)
+
+        signature_algorithm = chars_length = None
+        if self.sign_url and (not self.auth_token or self.set_url_signature):
+            if not self.api_secret:
+                raise ValueError("Must supply api_secret")
+            signature_algorithm = self.signature_algorithm
+            if self.long_url_signature:
+                # Long signature forces SHA256
+                signature_algorithm = SIGNATURE_SHA256
+                chars_length = LONG_URL_SIGNATURE_LENGTH
+            else:
+                chars_length = SHORT_URL_SIGNATURE_LENGTH
+            if signature_algorithm not in signature_algorithms:
+                raise ValueError("Unsupported signature algorithm '{}'".format(signature_algorithm))
+
+        options = self.options.copy()
+        prefixes = distribution_prefixes(*_distribution_prefix_args(options, self._conf))
+
+        self._delivery = transformation, signature_algorithm, chars_length, prefixes, options
+
+        return self._delivery
+
+
+class CloudinaryUrlTemplate(_UrlContext):
+    """
+    Delivery URL options prepared once and reused for building URLs of many assets.
+
+    Everything `cloudinary_url` derives from the options and the configuration is resolved when the template
+    is created, later configuration changes do not affect it.
+
+    Example:
+        template = CloudinaryUrlTemplate(width=100, crop="scale", sign_url=True)
+        urls = [template.url(public_id) for public_id in public_ids]
+    """
+    def __init__(self, **options):
+        """
+        :param options: Delivery URL and transformation options, the same as of `cloudinary_url`
+
+        :raises ValueError: In case of invalid or missing options
+        """
+        self._options = options.copy()
+        self._format_templates = {}
+
+        super(CloudinaryUrlTemplate, self).__init__(options)
+
+        self._config_values = dict(vars(self._conf))
+        self._config_values.pop("version", None)
+
+        self._resolve_path_types()
+        self._resolve_delivery()
+
+    def url(self, public_id, version=None, format=None):
+        """
+        Builds the URL of the asset.
+
+        :param public_id: The public ID (or a remote URL) of the asset
+        :param version:   The version of the asset, overrides the version option of the template
+        :param format:    The format of the asset, overrides the format option of the template
+
+        :return: The resulting URL
+        :rtype: str
+        """
+        if format is not None and self.format_in_transformation:
+            return self._format_template(format).build(public_id, version)[0]
+
+        return self.build(public_id, version, format)[0]
+
+    def _format_template(self, format):
+        """
+        Returns the template of a format, for templates delivering the format as a part of the transformation
+        (fetch_format), prepared with the configuration of this template.
+
+        :param format: The format of the asset
+
+        :return: The template of the format
+        :rtype: CloudinaryUrlTemplate
+        """
+        if "fetch_format" in self._options:
+            # the format is ignored in favor of the fetch_format option, as by cloudinary_url
+            return self
+
+        template = self._format_templates.get(format)
+        if template is None:
+            with cloudinary.config_context(**self._config_values):
+                template = CloudinaryUrlTemplate(**dict(self._options, format=format))
+            self._format_templates[format] = template
+
+        return template
+
+
+def base_api_url(path, conf=None, **options):
+    conf = conf or cloudinary.config_snapshot()
+    cloudinary_prefix = options.get("upload_prefix", conf.upload_prefix) or "https://api.cloudinary.com"
+    cloud_name = options.get("cloud_name", conf.cloud_name)
 
     if not cloud_name:
         raise ValueError("Must supply cloud_name")
@@ -933,10 +1421,10 @@ def base_api_url(path, **options):
     return encode_unicode_url("/".join([cloudinary_prefix, cloudinary.API_VERSION, cloud_name] + path))
 
 
-def cloudinary_api_url(action='upload', **options):
+def cloudinary_api_url(action='upload', conf=None, **options):
     resource_type = options.get("resource_type", "image")
 
-    return base_api_url([resource_type, action], **options)
+    return base_api_url([resource_type, action], conf, **options)
 
 
 def cloudinary_api_download_url(action, params, **options):
@@ -978,7 +1466,45 @@ def cloudinary_scaled_url(source, width, transformation, options):
     return cloudinary_url(source, **url_options)[0]
 
 
-def smart_escape(source, unsafe=r"([^a-zA-Z0-9_.\-\/:]+)"):
+SMART_ESCAPE_UNSAFE_RE = r"([^a-zA-Z0-9_.\-\/:]+)"
+
+_BYTE_ESCAPES = tuple(to_bytes("%{0:02X}".format(b)) for b in range(256))
+
+_smart_escape_patterns = LRUCache(64)
+
+
+def _compile_smart_escape_pattern(unsafe):
+    """
+    Compiles the unsafe characters pattern of smart_escape, both for text and for bytes.
+
+    :param unsafe: Unsafe characters pattern
+
+    :return: A tuple of the compiled text and bytes patterns
+    """
+    patterns = _smart_escape_patterns.get(unsafe)
+    if patterns is None:
+        patterns = re.compile(unsafe), re.compile(to_bytes(unsafe))
+        _smart_escape_patterns.set(unsafe, patterns)
+
+    return patterns
+
+
+def _escape_bytes(match, escapes=_BYTE_ESCAPES):
+    return b"".join([escapes[b] for b in bytearray(match.group(1))])
+
+
+try:  # Python 3.7+
+    _is_ascii = str.isascii
+except AttributeError:
+    def _is_ascii(text):
+        try:
+            text.encode("ascii")
+        except UnicodeError:
+            return False
+        return True
+
+
+def smart_escape(source, unsafe=SMART_ESCAPE_UNSAFE_RE):
     """
     Based on ruby's CGI::unescape. In addition does not escape / :
 
@@ -987,12 +1513,13 @@ def smart_escape(source, unsafe=r"([^a-zA-Z0-9_.\-\/:]+)"):
 
     :return: Escaped string
     """
-    def pack(m):
-        return to_bytes('%' + "%".join(
-            ["%02X" % x for x in struct.unpack('B' * len(m.group(1)), m.group(1))]
-        ).upper())
+    text_pattern, bytes_pattern = _compile_smart_escape_pattern(unsafe)
+
+    if PY3 and isinstance(source, str) and _is_ascii(source) and not text_pattern.search(source):
+        # nothing to escape
+        return source
 
-    return to_string(re.sub(to_bytes(unsafe), pack, to_bytes(source)))
+    return to_string(bytes_pattern.sub(_escape_bytes, to_bytes(source)))
 
 
 def random_public_id():
@@ -1133,14 +1660,14 @@ def archive_params(**options):
     return params
 
 
-def build_eager(transformations):
+def build_eager(transformations, conf=None):
     if transformations is None:
         return None
 
-    return "|".join([build_single_eager(et) for et in build_array(transformations)])
+    return "|".join([build_single_eager(et, conf) for et in build_array(transformations)])
 
 
-def build_single_eager(options):
+def build_single_eager(options, conf=None):
     """
     Builds a single eager transformation which consists of transformation and (optionally) format joined by "/"
 
@@ -1149,12 +1676,14 @@ def build_single_eager(options):
         The latter leads to transformation ending with "/", which means "No extension, use original format"
         If format is not provided or set to None, only transformation is used (without the trailing "/")
 
+    :param conf: The configuration snapshot of the call, defaults to the current configuration
+
     :return: Resulting eager transformation string
     """
     if isinstance(options, string_types):
         return options
 
-    trans_str = generate_transformation_string(**options)[0]
+    trans_str = _transformation_string(options, conf or cloudinary.config_snapshot())[0]
 
     if not trans_str:
         return ""
@@ -1176,16 +1705,17 @@ def build_custom_headers(headers):
     return "\n".join(headers)
 
 
-def build_upload_params(**options):
+def build_upload_params(conf=None, **options):
+    conf = conf or cloudinary.config_snapshot()
     params = {param_name: options.get(param_name) for param_name in __SIMPLE_UPLOAD_PARAMS if param_name in options}
-    params["upload_preset"] = params.pop("upload_preset", cloudinary.config().upload_preset)
+    params["upload_preset"] = params.pop("upload_preset", conf.upload_preset)
 
     serialized_params = {
         "timestamp": now(),
         "metadata": encode_context(options.get("metadata")),
-        "transformation": generate_transformation_string(**options)[0],
+        "transformation": _transformation_string(options, conf)[0],
         "headers": build_custom_headers(options.get("headers")),
-        "eager": build_eager(options.get("eager")),
+        "eager": build_eager(options.get("eager"), conf),
         "tags": options.get("tags") and encode_list(build_array(options["tags"])),
         "allowed_formats": options.get("allowed_formats") and encode_list(build_array(options["allowed_formats"])),
         "face_coordinates": encode_double_array(options.get("face_coordinates")),
@@ -1193,7 +1723,7 @@ def build_upload_params(**options):
         "regions": json_encode(options.get("regions")),
         "context": encode_context(options.get("context")),
         "auto_tagging": options.get("auto_tagging") and str(options.get("auto_tagging")),
-        "responsive_breakpoints": generate_responsive_breakpoints_string(options.get("responsive_breakpoints")),
+        "responsive_breakpoints": generate_responsive_breakpoints_string(options.get("responsive_breakpoints"), conf),
         "access_control": options.get("access_control") and json_encode(
             build_list_of_dicts(options.get("access_control"))),
         "auto_transcription": json_encode(options.get("auto_transcription")),
@@ -1434,12 +1964,25 @@ PREDEFINED_VARS = {
 replaceRE = "((\\|\\||>=|<=|&&|!=|>|=|<|/|-|\\+|\\*|\\^)(?=[ _])|(\\$_*[^_ ]+)|(?<![\\$:])(" + \
             '|'.join(PREDEFINED_VARS.keys()) + "))"
 
+_EXPRESSION_TRANSLATIONS = dict(PREDEFINED_VARS, **IF_OPERATORS)
+
+_EXPRESSION_RE = re.compile(replaceRE)
+_PREDEFINED_VARS_RE = re.compile("|".join(PREDEFINED_VARS.keys()))
+_UNDERSCORES_RE = re.compile('[ _]+')
+_QUOTED_STRING_RE = re.compile(r'^!.+!$')
+
+EXPRESSION_CACHE_SIZE = 4096
+
+expression_cache = LRUCache(EXPRESSION_CACHE_SIZE)
+"""
+Recently normalized expressions used by `normalize_expression`.
+Set `expression_cache.max_size = 0` to disable it.
+"""
+
 
 def translate_if(match):
     name = match.group(0)
-    return IF_OPERATORS.get(name,
-                            PREDEFINED_VARS.get(name,
-                                                name))
+    return _EXPRESSION_TRANSLATIONS.get(name, name)
 
 
 def process_custom_function(custom_function):
@@ -1499,14 +2042,53 @@ def process_conditional(conditional):
 
 
 def normalize_expression(expression):
-    if re.match(r'^!.+!$', str(expression)):  # quoted string
+    """
+    Normalizes an expression used as a transformation parameter value.
+
+    Replaces operators and predefined variables with their short names and joins words with underscores.
+    Numbers are returned as strings as is, and normalized strings are kept in `expression_cache`.
+
+    :param expression: The expression to normalize
+
+    :return: The normalized expression
+    """
+    if not expression:
         return expression
-    elif expression:
-        result = str(expression)
-        result = re.sub(replaceRE, translate_if, result)
-        result = re.sub('[ _]+', '_', result)
-        return result
-    return expression
+
+    if isinstance(expression, _NUMBER_TYPES) and not isinstance(expression, bool):
+        return str(expression)
+
+    if not isinstance(expression, string_types):
+        if _QUOTED_STRING_RE.match(str(expression)):
+            return expression
+        return _normalize_expression_string(str(expression))
+
+    result = expression_cache.get(expression)
+    if result is None:
+        result = _normalize_expression_string(expression)
+        expression_cache.set(expression, result)
+
+    return result
+
+
+def _normalize_expression_string(expression):
+    """
+    Normalizes an expression string, see `normalize_expression`.
+
+    :param expression: The expression string to normalize
+
+    :return: The normalized expression string
+    """
+    if _QUOTED_STRING_RE.match(expression):
+        return expression
+
+    if expression.isalnum():
+        # no operators, user variables or separators, only predefined variables can be found
+        return _PREDEFINED_VARS_RE.sub(translate_if, expression)
+
+    result = _EXPRESSION_RE.sub(translate_if, expression)
+
+    return _UNDERSCORES_RE.sub('_', result)
 
 
 def __join_pair(key, value):
@@ -1533,14 +2115,6 @@ def __bool_string(v):
 
     return v
 
-def __crc(source):
-    return str((zlib.crc32(to_bytearray(source)) & 0xffffffff) % 5 + 1)
-
-
-def __compact(array):
-    return filter(lambda x: x, array)
-
-
 def base64_encode_url(url):
     """
     Returns the Base64-decoded version of url.
@@ -1625,6 +2199,96 @@ def file_io_size(file_io):
     return size
 
 
+class MappedFile(object):
+    """
+    A read-only file-like object over a memory-mapped local file.
+
+    Reading returns memoryview slices of the mapping instead of copying the data into new bytes objects.
+    The slices are released when the file is closed, so they must not be used afterwards.
+    """
+    def __init__(self, path):
+        """
+        Opens and maps the file
+
+        :param path: The path of the local file
+        :type path: str or pathlib.Path
+        """
+        self.name = str(path)
+        self._file = open(path, 'rb')
+        try:
+            self._size = os.fstat(self._file.fileno()).st_size
+            # an empty file cannot be mapped
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else None
+        except Exception:
+            self._file.close()
+            raise
+
+        self._view = memoryview(self._mmap) if self._mmap is not None else memoryview(b"")
+        self._chunks = []
+        self._position = 0
+
+    def read(self, size=-1):
+        """
+        Reads up to size bytes from the current position, without copying them
+
+        :param size: The number of bytes to read, a negative value reads until the end of the file
+
+        :return: A memoryview of the read bytes
+        :rtype: memoryview
+        """
+        start = self._position
+        end = self._size if size is None or size < 0 else min(start + size, self._size)
+        self._position = max(start, end)
+
+        chunk = self._view[start:end]
+        self._chunks.append(chunk)
+
+        return chunk
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._size
+        self._position = max(offset, 0)
+
+        return self._position
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def close(self):
+        """
+        Releases the read chunks and closes the mapping and the file
+        """
+        if self.closed:
+            return
+
+        for chunk in self._chunks:
+            chunk.release()
+        self._chunks = []
+        self._view.release()
+
+        try:
+            if self._mmap is not None:
+                self._mmap.close()
+        except BufferError:
+            # the buffer was exported by someone else, the mapping is closed when garbage collected
+            pass
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
 def check_property_enabled(f):
     """
     Used as a class method decorator to check whether class is enabled(self.enabled is True)
@@ -1731,6 +2395,10 @@ def get_http_connector(conf, options):
 
     :return: ProxyManager if api_proxy is set, otherwise PoolManager object
     """
+    # imported on first use, so processes that only build URLs do not import urllib3
+    from urllib3 import ProxyManager, PoolManager
+    from cloudinary.api_client.tcp_keep_alive_manager import TCPKeepAlivePoolManager, TCPKeepAliveProxyManager
+
     if conf.api_proxy:
         if conf.disable_tcp_keep_alive:
             return ProxyManager(conf.api_proxy, **options)
@@ -1766,6 +2434,24 @@ def safe_cast(val, casting_fn, default=None):
         return default
 
 
+def to_bool(value, default=False):
+    """
+    Converts a configuration value to a boolean, configuration values loaded from a URL are strings
+
+    :param value: The value to convert
+    :param default: The return value if the value is not set
+
+    :return: True for True and the strings "true", "1" and "yes" (case insensitive), False otherwise
+    """
+    if value is None or value == "":
+        return default
+
+    if isinstance(value, bool):
+        return value
+
+    return str(value).lower() in ("true", "1", "yes")
+
+
 def __id(x):
     """
     Identity function. Returns the passed in values.
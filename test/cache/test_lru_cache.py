@@ -0,0 +1,67 @@
+import unittest
+
+from cloudinary.cache.lru_cache import LRUCache
+
+
+class LRUCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = LRUCache(max_size=2)
+
+    def test_set_get(self):
+        self.cache.set("key", "value")
+
+        self.assertEqual("value", self.cache.get("key"))
+        self.assertIsNone(self.cache.get("missing"))
+        self.assertEqual("default", self.cache.get("missing", "default"))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set("key1", "value1")
+        self.cache.set("key2", "value2")
+
+        # mark key1 as recently used
+        self.cache.get("key1")
+
+        self.cache.set("key3", "value3")
+
+        self.assertIn("key1", self.cache)
+        self.assertNotIn("key2", self.cache)
+        self.assertIn("key3", self.cache)
+
+    def test_stats(self):
+        self.cache.set("key1", "value1")
+        self.cache.get("key1")
+        self.cache.get("key2")
+        self.cache.set("key2", "value2")
+        self.cache.set("key3", "value3")
+
+        self.assertEqual({"hits": 1, "misses": 1, "evictions": 1, "size": 2, "max_size": 2}, self.cache.stats())
+
+    def test_delete_and_clear(self):
+        self.cache.set("key1", "value1")
+        self.cache.set("key2", "value2")
+
+        self.assertTrue(self.cache.delete("key1"))
+        self.assertFalse(self.cache.delete("key1"))
+
+        self.cache.clear()
+
+        self.assertEqual(0, len(self.cache))
+
+    def test_max_size(self):
+        self.cache.set("key1", "value1")
+        self.cache.set("key2", "value2")
+
+        self.cache.max_size = 1
+
+        self.assertEqual(1, len(self.cache))
+        self.assertIn("key2", self.cache)
+
+        self.cache.max_size = 0
+        self.cache.set("key3", "value3")
+
+        self.assertFalse(self.cache.enabled)
+        self.assertEqual(0, len(self.cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,381 @@
+import json
+import threading
+import time
+import unittest
+from email.utils import formatdate
+from io import BytesIO
+
+import six
+from six.moves import BaseHTTPServer
+
+import cloudinary
+from cloudinary import api
+from cloudinary.compat import parse_qs, urlparse
+from cloudinary.api_client import rate_limiter
+from cloudinary.exceptions import Error, NotFound
+from test.helper_test import TEST_IMAGE, UNIQUE_TAG, patch
+
+if six.PY3:
+    import asyncio
+
+    from cloudinary import aio
+    from cloudinary.aio.transport import AsyncTransport, TransportResponse
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+API_OPTIONS = {"cloud_name": "test123", "api_key": "key", "api_secret": "secret"}
+
+
+def start_stub_api_server(requests, responses):
+    """
+    Starts a local HTTP server that records the requests and responds with the queued responses
+
+    :param requests:    The list the requests are appended to, as (method, path, headers, body) tuples
+    :param responses:   The queued (status, result) responses, a successful upload result is sent when empty
+
+    :return: The server, serving from a daemon thread
+    """
+    class StubApiHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+        def respond(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            requests.append((self.command, self.path, self.headers, body))
+
+            status, result = responses.pop(0) if responses else (200, {"public_id": "sample", "version": 1})
+            data = json.dumps(result).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("X-Request-Id", "stub_request_id")
+            self.send_header("X-FeatureRateLimit-Remaining", "499")
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PUT = do_DELETE = respond
+
+        def log_message(self, *_):
+            pass
+
+    server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), StubApiHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    return server
+
+
+@unittest.skipUnless(six.PY3, "cloudinary.aio requires Python 3")
+class AsyncClientTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.requests = []
+        cls.responses = []
+        cls.server = start_stub_api_server(cls.requests, cls.responses)
+        cls.options = dict(API_OPTIONS, upload_prefix="http://127.0.0.1:{0}".format(cls.server.server_address[1]))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        del self.requests[:]
+        del self.responses[:]
+
+    def test_api(self):
+        """should call the Admin API asynchronously with the parameters of the blocking call"""
+        self.responses.append((200, {"resources": []}))
+
+        result = asyncio.run(aio.api.resources(type="upload", prefix="folder/", max_results=10, **self.options))
+
+        self.assertEqual({"resources": []}, result)
+        self.assertEqual(499, result.rate_limit_remaining)
+        self.assertEqual("stub_request_id", result.request_id)
+
+        method, path, headers, _ = self.requests[0]
+        url = urlparse(path)
+        self.assertEqual("GET", method)
+        self.assertEqual("/v1_1/test123/resources/image/upload", url.path)
+        self.assertEqual({"prefix": ["folder/"], "max_results": ["10"]}, parse_qs(url.query))
+        self.assertTrue(headers["Authorization"].startswith("Basic "))
+
+    def test_api_errors(self):
+        """should raise the exceptions of the blocking Admin API"""
+        self.responses.append((404, {"error": {"message": "Resource not found"}}))
+
+        with self.assertRaisesRegex(NotFound, "Resource not found"):
+            asyncio.run(aio.api.resource("missing", **self.options))
+
+    def test_api_rate_limiter(self):
+        """should learn the rate limit from the async Admin API responses and pace the calls without blocking"""
+        rate_limiter.reset()
+        rate_limit_headers = {
+            "x-featureratelimit-limit": "500",
+            "x-featureratelimit-remaining": "0",
+            "x-featureratelimit-reset": formatdate(time.time() + 10, usegmt=True),
+        }
+        delays = []
+
+        class StubTransport(AsyncTransport):
+            async def request(self, method, url, fields=None, body=None, headers=None, timeout=None):
+                return TransportResponse(200, rate_limit_headers, b'{"status": "ok"}')
+
+        async def sleep(delay):
+            delays.append(delay)
+
+        try:
+            with patch("time.sleep") as blocking_sleep, patch("asyncio.sleep", sleep):
+                asyncio.run(aio.api.ping(transport=StubTransport(), **API_OPTIONS))
+                self.assertEqual(0, rate_limiter.budget("key")["remaining"])
+
+                asyncio.run(aio.api.ping(transport=StubTransport(), rate_limiter=True, **API_OPTIONS))
+
+            blocking_sleep.assert_not_called()
+            self.assertEqual(1, len(delays))
+            self.assertAlmostEqual(10, delays[0], delta=1.1)
+        finally:
+            rate_limiter.reset()
+
+    def test_retries(self):
+        """should retry async Admin and Upload API calls without blocking the event loop"""
+        responses = []
+        delays = []
+
+        class StubTransport(AsyncTransport):
+            async def request(self, method, url, fields=None, body=None, headers=None, timeout=None):
+                status, data = responses.pop(0)
+                return TransportResponse(status, {}, data)
+
+        async def sleep(delay):
+            delays.append(delay)
+
+        error = (503, b'{"error": {"message": "Unavailable"}}')
+        options = dict(API_OPTIONS, transport=StubTransport(), max_retries=2)
+
+        with patch("time.sleep") as blocking_sleep, patch("asyncio.sleep", sleep):
+            responses.extend([error, (200, b'{"status": "ok"}')])
+            self.assertEqual("ok", asyncio.run(aio.api.ping(**options))["status"])
+
+            responses.extend([error, (200, b'{"result": "ok"}')])
+            self.assertEqual("ok", asyncio.run(aio.uploader.destroy("sample", **options))["result"])
+
+            responses.extend([error, (200, b'{"public_id": "sample"}')])
+            self.assertEqual("sample", asyncio.run(aio.uploader.upload(BytesIO(b"header data"), public_id="sample",
+                                                                      **options))["public_id"])
+
+            responses.extend([error, (200, b'{"public_id": "sample"}')])
+            with self.assertRaisesRegex(Error, "Unavailable"):
+                asyncio.run(aio.uploader.upload(BytesIO(b"data"), **options))
+
+        blocking_sleep.assert_not_called()
+        self.assertEqual(3, len(delays))
+        self.assertEqual(1, len(responses))
+
+    def test_api_functions(self):
+        """should provide an awaitable counterpart of every Admin API call"""
+        for name in dir(api):
+            func = getattr(api, name)
+            if name.startswith(("_", "iter_")) or getattr(func, "__module__", None) != api.__name__ or \
+                    name in ("only", "transformation_string", "delete_resources_bulk"):
+                continue
+
+            self.assertTrue(asyncio.iscoroutinefunction(getattr(aio.api, name, None)), name)
+
+    def test_search(self):
+        """should execute searches asynchronously"""
+        self.responses.append((200, {"total_count": 0, "resources": []}))
+
+        result = asyncio.run(aio.Search().expression("tags={0}".format(UNIQUE_TAG)).max_results(1)
+                             .execute(**self.options))
+
+        self.assertEqual(0, result["total_count"])
+
+        method, path, _, body = self.requests[0]
+        self.assertEqual("POST", method)
+        self.assertEqual("/v1_1/test123/resources/search", path)
+        self.assertEqual({"expression": "tags={0}".format(UNIQUE_TAG), "max_results": 1}, json.loads(body))
+
+    def test_search_iterate(self):
+        """should iterate over the results of all pages asynchronously"""
+        self.responses.append((200, {"resources": [{"public_id": "sample1"}], "next_cursor": "cursor"}))
+        self.responses.append((200, {"resources": [{"public_id": "sample2"}]}))
+
+        async def iterate():
+            return [resource["public_id"] async for resource in
+                    aio.Search().expression("tags={0}".format(UNIQUE_TAG)).iterate(page_size=1, **self.options)]
+
+        with patch("cloudinary.api_client.paginator.prefetched") as prefetched_mock:
+            self.assertEqual(["sample1", "sample2"], asyncio.run(iterate()))
+        prefetched_mock.assert_not_called()
+
+        bodies = [json.loads(body) for _, _, _, body in self.requests]
+        self.assertEqual([{"expression": "tags={0}".format(UNIQUE_TAG), "max_results": 1},
+                          {"expression": "tags={0}".format(UNIQUE_TAG), "max_results": 1, "next_cursor": "cursor"}],
+                         bodies)
+
+    def test_upload(self):
+        """should upload files asynchronously"""
+        result = asyncio.run(aio.uploader.upload(TEST_IMAGE, public_id="sample", tags=[UNIQUE_TAG], **self.options))
+
+        self.assertEqual("sample", result["public_id"])
+        self.assertEqual("stub_request_id", result["request_id"])
+
+        method, path, _, body = self.requests[0]
+        self.assertEqual("POST", method)
+        self.assertEqual("/v1_1/test123/image/upload", path)
+        self.assertIn(b'name="signature"', body)
+        self.assertIn(UNIQUE_TAG.encode("utf-8"), body)
+        with open(TEST_IMAGE, "rb") as image:
+            self.assertIn(image.read(), body)
+
+    def test_upload_errors(self):
+        """should raise or return the errors of the Upload API"""
+        self.responses.append((400, {"error": {"message": "Invalid image file"}}))
+
+        with self.assertRaisesRegex(Error, "Invalid image file"):
+            asyncio.run(aio.uploader.upload(BytesIO(b"not an image"), **self.options))
+
+    def test_destroy(self):
+        """should call Upload API actions asynchronously with the parameters of the blocking call"""
+        self.responses.append((200, {"result": "ok"}))
+
+        result = asyncio.run(aio.uploader.destroy("sample", invalidate=True, **self.options))
+
+        self.assertEqual("ok", result["result"])
+
+        _, path, _, body = self.requests[0]
+        self.assertEqual("/v1_1/test123/image/destroy", path)
+        self.assertIn(b'name="public_id"\r\n\r\nsample', body)
+        self.assertIn(b'name="invalidate"\r\n\r\n1', body)
+
+    def test_add_tag_batches(self):
+        """should send the batches of public IDs concurrently and merge their results"""
+        self.responses.extend([(200, {"public_ids": ["a", "b"]}), (400, {"error": {"message": "Invalid"}})])
+
+        result = asyncio.run(aio.uploader.add_tag(UNIQUE_TAG, iter(["a", "b", "c"]), batch_size=2, **self.options))
+
+        self.assertEqual(2, len(self.requests))
+        self.assertEqual(["a", "b"], result["public_ids"])
+        self.assertEqual("stub_request_id", result["request_id"])
+        self.assertEqual(1, len(result["failed_batches"]))
+        self.assertIsInstance(result["failed_batches"][0]["error"], Error)
+
+        self.responses.extend([(400, {"error": {"message": "Invalid"}})] * 2)
+
+        with self.assertRaisesRegex(Error, "Invalid"):
+            asyncio.run(aio.uploader.add_tag(UNIQUE_TAG, ["a", "b", "c"], batch_size=2, **self.options))
+
+    def test_add_tag_lazy_batches(self):
+        """should consume the public IDs lazily, sending at most max_workers batches at a time"""
+        consumed = []
+        in_flight = []
+
+        def public_ids():
+            for index in range(10):
+                consumed.append(index)
+                yield "id_{0}".format(index)
+
+        class StubTransport(AsyncTransport):
+            async def request(self, method, url, fields=None, body=None, headers=None, timeout=None):
+                in_flight.append(len(consumed))
+                await asyncio.sleep(0)
+                batch = [value for name, value in fields if name == "public_ids[]"]
+                return TransportResponse(200, {}, json.dumps({"public_ids": batch}).encode("utf-8"))
+
+        result = asyncio.run(aio.uploader.add_tag(UNIQUE_TAG, public_ids(), batch_size=2, max_workers=2,
+                                                  transport=StubTransport(), **API_OPTIONS))
+
+        self.assertEqual(["id_{0}".format(index) for index in range(10)], result["public_ids"])
+        self.assertEqual([], result["failed_batches"])
+        self.assertEqual(5, len(in_flight))
+        self.assertLess(in_flight[0], 10)
+
+    def test_upload_large(self):
+        """should upload large files in chunks asynchronously, sending the final chunk last"""
+        data = bytes(bytearray(range(256))) * 40
+
+        result = asyncio.run(aio.uploader.upload_large(BytesIO(data), chunk_size=1024, max_workers=3,
+                                                       **self.options))
+
+        self.assertEqual("sample", result["public_id"])
+
+        ranges = [headers["Content-Range"] for _, _, headers, _ in self.requests]
+        self.assertEqual(10, len(ranges))
+        self.assertEqual("bytes 0-1023/10240", ranges[0])
+        self.assertEqual("bytes 9216-10239/10240", ranges[-1])
+        self.assertEqual(set("bytes {0}-{1}/10240".format(i, i + 1023) for i in range(0, 10240, 1024)), set(ranges))
+        self.assertEqual(1, len(set(headers["X-Unique-Upload-Id"] for _, _, headers, _ in self.requests)))
+
+    def test_config_context(self):
+        """should use the configuration of the config context of each task"""
+        async def upload(cloud_name):
+            with cloudinary.config_context(**dict(self.options, cloud_name=cloud_name)):
+                await asyncio.sleep(0)
+                return await aio.uploader.upload(BytesIO(b"data"))
+
+        async def upload_all():
+            return await asyncio.gather(upload("tenant1"), upload("tenant2"))
+
+        asyncio.run(upload_all())
+
+        self.assertEqual(["/v1_1/tenant1/image/upload", "/v1_1/tenant2/image/upload"],
+                         sorted(path for _, path, _, _ in self.requests))
+
+    def test_transport(self):
+        """should send the requests with the provided transport"""
+        requests = []
+
+        class StubTransport(AsyncTransport):
+            def request(self, method, url, fields=None, body=None, headers=None, timeout=None):
+                requests.append((method, url, fields))
+                response = asyncio.get_running_loop().create_future()
+                response.set_result(TransportResponse(200, {}, b'{"result": "ok"}'))
+                return response
+
+        result = asyncio.run(aio.uploader.add_tag(UNIQUE_TAG, ["sample"], transport=StubTransport(), **API_OPTIONS))
+
+        self.assertEqual("ok", result["result"])
+        self.assertEqual("POST", requests[0][0])
+        self.assertEqual("https://api.cloudinary.com/v1_1/test123/image/tags", requests[0][1])
+        self.assertIn(("tag", UNIQUE_TAG), requests[0][2])
+        self.assertEqual([], self.requests)
+
+    def test_abstract_transport(self):
+        """should require transports to implement request"""
+        with self.assertRaises(TypeError):
+            AsyncTransport()
+
+    @unittest.skipUnless(aiohttp, "requires aiohttp")
+    def test_aiohttp_transport(self):
+        """should send API calls and uploads with an aiohttp session"""
+        self.responses.append((200, {"resources": []}))
+
+        async def calls():
+            async with aio.AiohttpTransport() as transport:
+                resources = await aio.api.resources(prefix="folder/", transport=transport, **self.options)
+                uploaded = await aio.uploader.upload(TEST_IMAGE, public_id="sample", transport=transport,
+                                                     **self.options)
+            self.assertIsNone(transport.session)
+            return resources, uploaded
+
+        resources, uploaded = asyncio.run(calls())
+
+        self.assertEqual([], resources["resources"])
+        self.assertEqual(499, resources.rate_limit_remaining)
+        self.assertEqual("sample", uploaded["public_id"])
+
+        (api_method, api_path, _, _), (upload_method, upload_path, _, body) = self.requests
+        self.assertEqual("GET", api_method)
+        self.assertEqual("/v1_1/test123/resources/image", urlparse(api_path).path)
+        self.assertEqual({"prefix": ["folder/"]}, parse_qs(urlparse(api_path).query))
+        self.assertEqual("POST", upload_method)
+        self.assertEqual("/v1_1/test123/image/upload", upload_path)
+        self.assertIn(b'name="signature"', body)
+        with open(TEST_IMAGE, "rb") as image:
+            self.assertIn(image.read(), body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
 from datetime import datetime, timedelta
+import json
+import threading
 import time
 import unittest
 from collections import OrderedDict
@@ -13,7 +15,7 @@ from cloudinary.utils import fq_public_id
 from test.helper_test import SUFFIX, TEST_IMAGE, get_uri, get_headers, get_params, get_list_param, get_param, \
     TEST_DOC, get_method, UNIQUE_TAG, api_response_mock, ignore_exception, cleanup_test_resources_by_tag, \
     cleanup_test_transformation, cleanup_test_resources, UNIQUE_TEST_FOLDER, EVAL_STR, get_json_body, REMOTE_TEST_IMAGE, \
-    TEST_IMAGE_SIZE, URLLIB3_REQUEST, patch
+    TEST_IMAGE_SIZE, URLLIB3_REQUEST, patch, http_response_mock
 from cloudinary.exceptions import BadRequest, NotFound
 
 MOCK_RESPONSE = api_response_mock()
@@ -482,6 +484,59 @@ class ApiTest(unittest.TestCase):
         self.assertIn(API_TEST_ID, param)
         self.assertIn(API_TEST_ID2, param)
 
+    @patch(URLLIB3_REQUEST)
+    def test09_delete_resources_bulk(self, mocker):
+        """ should delete any number of resources in batches, following partial results """
+        public_ids = ["{0}_{1}".format(API_TEST_ID, i) for i in range(250)]
+        partial = {"sent": False}
+        lock = threading.Lock()
+
+        def side_effect(*args, **kwargs):
+            params = json.loads(kwargs["body"])
+            result = {"deleted": dict((public_id, "deleted") for public_id in params["public_ids"]),
+                      "deleted_counts": dict((public_id, {"original": 1, "derived": 0})
+                                             for public_id in params["public_ids"])}
+            with lock:
+                if public_ids[0] in params["public_ids"] and not partial["sent"]:
+                    partial["sent"] = True
+                    result.update(partial=True, next_cursor=NEXT_CURSOR)
+            return api_response_mock(json.dumps(result))
+
+        mocker.side_effect = side_effect
+
+        result = api.delete_resources_bulk(iter(public_ids), max_workers=3, keep_original=True)
+
+        self.assertEqual(dict((public_id, "deleted") for public_id in public_ids), result["deleted"])
+        self.assertEqual(250, len(result["deleted_counts"]))
+
+        bodies = [json.loads(c[1]["body"]) for c in mocker.call_args_list]
+        self.assertEqual(4, len(bodies))
+        self.assertEqual([50, 100, 100, 100], sorted(len(body["public_ids"]) for body in bodies))
+        for body in bodies:
+            self.assertTrue(body["keep_original"])
+
+        continued = [body for body in bodies if body.get("next_cursor") == NEXT_CURSOR]
+        self.assertEqual(1, len(continued))
+        self.assertEqual(public_ids[:100], continued[0]["public_ids"])
+
+    @patch(URLLIB3_REQUEST)
+    def test09_delete_resources_bulk_errors(self, mocker):
+        """ should raise the error of a failed batch, with the resources deleted before the failure """
+        deleted = {"deleted": {API_TEST_ID: "deleted", API_TEST_ID2: "deleted"}}
+        mocker.side_effect = [api_response_mock(json.dumps(deleted)),
+                              http_response_mock('{"error": {"message": "Not allowed"}}', status=400)]
+
+        with self.assertRaises(BadRequest) as context:
+            api.delete_resources_bulk([API_TEST_ID, API_TEST_ID2, API_TEST_ID3, API_TEST_ID4], batch_size=2,
+                                      max_workers=1)
+
+        self.assertEqual(2, mocker.call_count)
+
+        partial_result = context.exception.partial_result
+        self.assertEqual(deleted["deleted"], partial_result["deleted"])
+        self.assertEqual([[API_TEST_ID3, API_TEST_ID4]],
+                         [failed_batch["public_ids"] for failed_batch in partial_result["failed_batches"]])
+
     @patch(URLLIB3_REQUEST)
     @unittest.skipUnless(cloudinary.config().api_secret, "requires api_key/api_secret")
     def test09_delete_resources_by_asset_ids(self, mocker):
@@ -148,6 +148,42 @@ class AuthTokenTest(unittest.TestCase):
             "639406f8c07fc6a1613e1f6192baba631f9d5719185a32049281e94e15c5619b"
         )
 
+    def test_signer_generate_many(self):
+        signer = cloudinary.auth_token.AuthTokenSigner(KEY, start_time=222222222, duration=300)
+        urls = ["/image/authenticated/sample.jpg", "/image/authenticated/folder/sample with space.jpg"]
+
+        tokens = signer.generate_many(urls)
+
+        self.assertEqual([cloudinary.utils.generate_auth_token(key=KEY, start_time=222222222, duration=300, url=url)
+                          for url in urls], tokens)
+
+    def test_signer_generate_many_acls(self):
+        signer = cloudinary.auth_token.AuthTokenSigner(KEY, duration=3600)
+        acls = ["/i/a/*", ["/i/a/*", "/i/a/*", "/i/a/*"]]
+
+        tokens = signer.generate_many(acls, as_acl=True, start_time=222222222)
+
+        self.assertEqual(
+            "__cld_token__=st=222222222~exp=222225822~acl=%2fi%2fa%2f*!%2fi%2fa%2f*!"
+            "%2fi%2fa%2f*~hmac=10d9ad42d6ed66dce2386c4b564b2aa25a6ac668e5b90d070363a03c9842965f",
+            tokens[1]
+        )
+        self.assertEqual(cloudinary.utils.generate_auth_token(key=KEY, start_time=222222222, duration=3600,
+                                                              acl="/i/a/*"), tokens[0])
+
+    def test_signer_must_provide_expiration_or_duration(self):
+        signer = cloudinary.auth_token.AuthTokenSigner(KEY)
+        self.assertRaises(Exception, signer.generate_many, ["/image/*"], as_acl=True)
+
+    def test_url_template_with_auth_token(self):
+        cloudinary.config(private_cdn=True)
+        template = cloudinary.utils.CloudinaryUrlTemplate(sign_url=True, resource_type="image",
+                                                          type="authenticated", version="1486020273")
+        self.assertEqual(template.url("sample.jpg"),
+                         "http://test123-res.cloudinary.com/image/authenticated/v1486020273/sample.jpg"
+                         "?__cld_token__=st=11111111~exp=11111411~hmac"
+                         "=8db0d753ee7bbb9e2eaf8698ca3797436ba4c20e31f44527e43b6a6e995cfdb3")
+
 
 if __name__ == '__main__':
     unittest.main()
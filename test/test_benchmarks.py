@@ -0,0 +1,327 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import timeit
+import unittest
+import zlib
+
+import six
+
+import cloudinary
+from cloudinary import uploader, utils
+from cloudinary.compat import to_bytearray
+from cloudinary.utils import normalize_expression, replaceRE, translate_if, unsigned_download_url_prefix, \
+    expression_cache
+from test.helper_test import mock
+
+BENCHMARK_REPEAT = 5
+
+# Wall-clock comparisons are noisy on shared CI runners, they only run when requested
+timing_benchmark = unittest.skipUnless(os.environ.get("CLOUDINARY_BENCHMARKS"),
+                                       "set CLOUDINARY_BENCHMARKS to run the timing benchmarks")
+
+URL_WORKLOAD_TRANSFORMATIONS = [
+    {"width": 100, "height": 100, "crop": "fill", "gravity": "face"},
+    {"width": 0.5, "crop": "scale", "quality": "auto:good", "dpr": 2.0},
+    {"width": "iw_div_2", "height": "ih_mul_0.5", "crop": "crop", "x": 10, "y": 20},
+    {"width": "initial_width * 2", "crop": "limit", "quality": 80},
+    {"if": "width > 400 && aspect_ratio < 1", "width": 400, "crop": "scale"},
+    {"effect": "sepia", "opacity": 50, "radius": "max", "zoom": 1.5},
+]
+
+URL_WORKLOAD_EXPRESSIONS = [
+    value
+    for transformation in URL_WORKLOAD_TRANSFORMATIONS
+    for key, value in transformation.items()
+    if key in ("width", "height", "x", "y", "quality", "dpr", "if", "opacity", "zoom")
+] * 50
+
+
+def best_time(func, number=10):
+    """
+    Returns the best time of several runs of the function, to reduce the noise of the measurement
+    """
+    return min(timeit.repeat(func, number=number, repeat=BENCHMARK_REPEAT))
+
+
+def reference_normalize_expression(expression):
+    """
+    Expression normalization without precompiled patterns and memoization
+    """
+    if re.match(r'^!.+!$', str(expression)):
+        return expression
+    elif expression:
+        result = str(expression)
+        result = re.sub(replaceRE, translate_if, result)
+        result = re.sub('[ _]+', '_', result)
+        return result
+    return expression
+
+
+class ExpressionNormalizationBenchmarkTest(unittest.TestCase):
+    def test_normalize_expression_url_workload(self):
+        """should normalize each expression of a URL heavy workload once, as the regex based implementation does"""
+        expression_cache.clear()
+        hits, misses = expression_cache.hits, expression_cache.misses
+
+        expected = [reference_normalize_expression(e) for e in URL_WORKLOAD_EXPRESSIONS]
+        self.assertEqual(expected, [normalize_expression(e) for e in URL_WORKLOAD_EXPRESSIONS])
+
+        strings = [e for e in URL_WORKLOAD_EXPRESSIONS if isinstance(e, six.string_types)]
+        self.assertEqual(misses + len(set(strings)), expression_cache.misses)
+        self.assertEqual(hits + len(strings) - len(set(strings)), expression_cache.hits)
+
+    @timing_benchmark
+    def test_normalize_expression_url_workload_time(self):
+        """should normalize expressions of a URL heavy workload faster than the regex based implementation"""
+        def reference():
+            for e in URL_WORKLOAD_EXPRESSIONS:
+                reference_normalize_expression(e)
+
+        def optimized():
+            for e in URL_WORKLOAD_EXPRESSIONS:
+                normalize_expression(e)
+
+        self.assertLess(best_time(optimized), best_time(reference))
+
+
+URL_WORKLOAD_SOURCES = ["folder/sample_%d.jpg" % i for i in range(500)]
+
+CDN_SUBDOMAIN_CONFIGURATIONS = [
+    ("test123", False, True, None, None, False, None),
+    ("test123", True, True, None, None, False, None),
+    ("test123", False, True, None, None, True, None),
+    ("test123", True, True, True, None, True, None),
+    ("test123", False, True, None, "hello.com", False, None),
+]
+
+
+def reference_unsigned_download_url_prefix(source, cloud_name, private_cdn, cdn_subdomain,
+                                           secure_cdn_subdomain, cname, secure, secure_distribution):
+    """
+    Download URL prefix computed from scratch for each source
+    """
+    shared_domain = not private_cdn
+    shard = str((zlib.crc32(to_bytearray(source)) & 0xffffffff) % 5 + 1)
+    if secure:
+        if secure_distribution is None or secure_distribution == cloudinary.OLD_AKAMAI_SHARED_CDN:
+            secure_distribution = cloud_name + "-res.cloudinary.com" if private_cdn else cloudinary.SHARED_CDN
+
+        shared_domain = shared_domain or secure_distribution == cloudinary.SHARED_CDN
+        if secure_cdn_subdomain is None and shared_domain:
+            secure_cdn_subdomain = cdn_subdomain
+
+        if secure_cdn_subdomain:
+            secure_distribution = re.sub('res.cloudinary.com', "res-" + shard + ".cloudinary.com",
+                                         secure_distribution)
+
+        prefix = "https://" + secure_distribution
+    elif cname:
+        subdomain = "a" + shard + "." if cdn_subdomain else ""
+        prefix = "http://" + subdomain + cname
+    else:
+        subdomain = cloud_name + "-res" if private_cdn else "res"
+        if cdn_subdomain:
+            subdomain = subdomain + "-" + shard
+        prefix = "http://" + subdomain + ".cloudinary.com"
+
+    if shared_domain:
+        prefix += "/" + cloud_name
+
+    return prefix
+
+
+class DistributionPrefixBenchmarkTest(unittest.TestCase):
+    @mock.patch("cloudinary.utils._last_distribution_prefixes", (None, None))
+    def test_cdn_subdomain_prefix_url_workload(self):
+        """should compute the download URL prefixes once per distribution configuration, not per source"""
+        utils._distribution_prefixes_cache.clear()
+
+        with mock.patch("cloudinary.utils._download_url_prefix", wraps=utils._download_url_prefix) as prefix_mock:
+            for configuration in CDN_SUBDOMAIN_CONFIGURATIONS:
+                self.assertEqual(
+                    [reference_unsigned_download_url_prefix(s, *configuration) for s in URL_WORKLOAD_SOURCES],
+                    [unsigned_download_url_prefix(s, *configuration) for s in URL_WORKLOAD_SOURCES])
+
+        self.assertEqual(len(CDN_SUBDOMAIN_CONFIGURATIONS) * utils.CDN_SHARDS_COUNT, prefix_mock.call_count)
+
+    @timing_benchmark
+    def test_cdn_subdomain_prefix_url_workload_time(self):
+        """should compute sharded download URL prefixes faster than computing them from scratch"""
+        def reference():
+            for configuration in CDN_SUBDOMAIN_CONFIGURATIONS:
+                for s in URL_WORKLOAD_SOURCES:
+                    reference_unsigned_download_url_prefix(s, *configuration)
+
+        def optimized():
+            for configuration in CDN_SUBDOMAIN_CONFIGURATIONS:
+                for s in URL_WORKLOAD_SOURCES:
+                    unsigned_download_url_prefix(s, *configuration)
+
+        self.assertLess(best_time(optimized), best_time(reference))
+
+
+UPLOAD_BENCHMARK_SIZE = int(os.environ.get("CLOUDINARY_BENCHMARK_UPLOAD_SIZE", 64 * 1024 * 1024))
+UPLOAD_BENCHMARK_CHUNK_SIZE = int(os.environ.get("CLOUDINARY_BENCHMARK_CHUNK_SIZE", 8 * 1024 * 1024))
+
+
+def start_stub_upload_server():
+    """
+    Starts a local HTTP server that consumes uploaded bodies and responds like the Upload API
+
+    :return: The server, serving from a daemon thread
+    """
+    from six.moves import BaseHTTPServer
+
+    class StubUploadHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+        def do_POST(self):
+            remaining = int(self.headers.get("Content-Length", 0))
+            while remaining > 0:
+                remaining -= len(self.rfile.read(min(remaining, 64 * 1024)))
+
+            body = json.dumps({"public_id": "stub_public_id", "done": False}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_):
+            pass
+
+    server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), StubUploadHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    return server
+
+
+@unittest.skipUnless(six.PY3, "tracemalloc and memory-mapped chunks require Python 3")
+class UploadLargeMemoryBenchmarkTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = start_stub_upload_server()
+        cls.upload_prefix = "http://127.0.0.1:{0}".format(cls.server.server_address[1])
+
+        with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as sparse_file:
+            sparse_file.truncate(UPLOAD_BENCHMARK_SIZE)
+        cls.path = sparse_file.name
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        os.remove(cls.path)
+
+    def peak_memory(self, file):
+        import tracemalloc
+
+        tracemalloc.start()
+        try:
+            result = uploader.upload_large(file, chunk_size=UPLOAD_BENCHMARK_CHUNK_SIZE,
+                                           upload_prefix=self.upload_prefix, cloud_name="test123",
+                                           api_key="key", api_secret="secret")
+            return tracemalloc.get_traced_memory()[1], result
+        finally:
+            tracemalloc.stop()
+
+    def test_upload_large_path_memory(self):
+        """should upload local files in chunks without copying the chunks into new buffers"""
+        path_peak, path_result = self.peak_memory(self.path)
+
+        with open(self.path, "rb") as stream:
+            stream_peak, stream_result = self.peak_memory(stream)
+
+        self.assertEqual(stream_result, path_result)
+        self.assertLess(path_peak, stream_peak)
+        self.assertLess(path_peak, 2.5 * UPLOAD_BENCHMARK_CHUNK_SIZE)
+
+    def test_upload_path_memory(self):
+        """should stream large files to the Upload API instead of reading them into memory"""
+        import tracemalloc
+
+        tracemalloc.start()
+        try:
+            result = uploader.upload(self.path, upload_prefix=self.upload_prefix, cloud_name="test123",
+                                     api_key="key", api_secret="secret")
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual("stub_public_id", result["public_id"])
+        self.assertLess(peak, 2 * 1024 * 1024)
+
+
+@unittest.skipUnless(sys.version_info >= (3, 7), "lazy package attributes require Python 3.7")
+class ImportBenchmarkTest(unittest.TestCase):
+    """
+    Import time regression checks.
+
+    The default checks assert on the modules loaded by importing the package, which is deterministic, while the
+    `python -X importtime` comparison is a timing benchmark, like the other ones it runs only on request.
+    """
+    @staticmethod
+    def import_time(statement):
+        """
+        Returns the total import time, in microseconds, reported by `python -X importtime` for running the statement
+        in a new process
+        """
+        output = subprocess.check_output([sys.executable, "-X", "importtime", "-c", statement],
+                                         stderr=subprocess.STDOUT)
+
+        total = 0
+        for line in output.decode("utf-8").splitlines():
+            match = re.match(r"^import time:\s+\d+ \|\s+(\d+) \| (\S.*)$", line)
+            if match:
+                # top level imports only, nested imports are included in their cumulative time
+                total += int(match.group(1))
+
+        return total
+
+    @staticmethod
+    def imported_modules(statement):
+        """
+        Returns the modules imported by running the statement in a new process
+        """
+        statement += "; import sys; print(' '.join(sys.modules))"
+        output = subprocess.check_output([sys.executable, "-c", statement])
+
+        return set(output.decode("utf-8").split())
+
+    def test_import_cloudinary(self):
+        """should not import urllib3 or the API clients when importing the package to build URLs"""
+        modules = self.imported_modules("import cloudinary; cloudinary.CloudinaryImage('sample').build_url()")
+
+        self.assertIn("cloudinary.utils", modules)
+        for module in ("urllib3", "cloudinary.api_client.execute_request", "cloudinary.search", "cloudinary.uploader",
+                       "cloudinary.api"):
+            self.assertNotIn(module, modules)
+
+    def test_lazy_attributes(self):
+        """should load the submodules and the attributes of the package on first access"""
+        modules = self.imported_modules("import cloudinary; cloudinary.Search; cloudinary.uploader; "
+                                        "cloudinary.CERT_KWARGS")
+
+        self.assertIn("cloudinary.search", modules)
+        self.assertIn("cloudinary.uploader", modules)
+        self.assertIn("certifi", modules)
+
+    @timing_benchmark
+    def test_import_time(self):
+        """should import the package to build URLs faster than importing the API clients"""
+        url_time = min(self.import_time("import cloudinary; cloudinary.CloudinaryImage('sample').build_url()")
+                       for _ in range(BENCHMARK_REPEAT))
+        clients_time = min(self.import_time("import cloudinary.api, cloudinary.uploader, cloudinary.search")
+                           for _ in range(BENCHMARK_REPEAT))
+
+        self.assertGreater(url_time, 0)
+        self.assertLess(url_time, clients_time)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,11 @@
+import base64
 import os
 from unittest import TestCase
 
 import cloudinary
+from cloudinary import api, uploader, utils
 from cloudinary.provisioning import account_config
-from test.helper_test import mock
+from test.helper_test import mock, api_response_mock, uploader_response_mock, get_params, get_headers, URLLIB3_REQUEST
 
 CLOUD_NAME = 'test123'
 API_KEY = 'key'
@@ -148,3 +150,172 @@ class TestConfig(TestCase):
         self.assertEqual(config.oauth_token, OAUTH_TOKEN)
         self.assertEqual(config.api_key, API_KEY)
         self.assertEqual(config.api_secret, API_SECRET)
+
+    def test_config_snapshot(self):
+        cloudinary.reset_config()
+        cloudinary.config(cloud_name=CLOUD_NAME)
+
+        snapshot = cloudinary.config_snapshot()
+
+        self.assertEqual(CLOUD_NAME, snapshot.cloud_name)
+        self.assertIsNone(snapshot.missing_key)
+        self.assertIs(snapshot, cloudinary.config_snapshot())
+
+        with self.assertRaises(AttributeError):
+            snapshot.cloud_name = "other"
+
+        version = cloudinary.config_version()
+        self.assertEqual(version, snapshot.version)
+
+        cloudinary.config(cloud_name="other")
+        self.assertGreater(cloudinary.config_version(), version)
+        self.assertEqual(CLOUD_NAME, snapshot.cloud_name)
+        self.assertEqual("other", cloudinary.config_snapshot().cloud_name)
+
+        cloudinary.config().cloud_name = "assigned"
+        self.assertEqual("assigned", cloudinary.config_snapshot().cloud_name)
+
+        cloudinary.reset_config()
+        self.assertEqual(cloudinary.config().cloud_name, cloudinary.config_snapshot().cloud_name)
+
+    def test_config_version_unchanged_by_reads(self):
+        version = cloudinary.config_version()
+
+        cloudinary.config()
+        cloudinary.config_snapshot()
+
+        self.assertEqual(version, cloudinary.config_version())
+
+    def test_config_context(self):
+        cloudinary.reset_config()
+        global_cloud_name = cloudinary.config().cloud_name
+
+        with cloudinary.config_context(cloud_name="tenant", api_key=API_KEY) as scoped:
+            self.assertIs(scoped, cloudinary.config())
+            self.assertEqual("tenant", cloudinary.config().cloud_name)
+            self.assertEqual("tenant", cloudinary.config_snapshot().cloud_name)
+            self.assertIn("/tenant/", cloudinary.utils.cloudinary_url("sample")[0])
+
+            cloudinary.config(api_secret=API_SECRET)
+            self.assertEqual(API_SECRET, cloudinary.config().api_secret)
+
+            with cloudinary.config_context(cloud_name="nested"):
+                self.assertEqual("nested", cloudinary.config().cloud_name)
+                self.assertEqual(API_SECRET, cloudinary.config().api_secret)
+
+            self.assertEqual("tenant", cloudinary.config_snapshot().cloud_name)
+
+        self.assertEqual(global_cloud_name, cloudinary.config().cloud_name)
+        self.assertEqual(global_cloud_name, cloudinary.config_snapshot().cloud_name)
+
+    def test_config_context_version(self):
+        cloudinary.reset_config()
+        global_snapshot = cloudinary.config_snapshot()
+        version = cloudinary.config_version()
+
+        with cloudinary.config_context(cloud_name="tenant") as scoped:
+            snapshot = cloudinary.config_snapshot()
+            self.assertIs(snapshot, cloudinary.config_snapshot())
+
+            scoped.cloud_name = "changed"
+            self.assertEqual("changed", cloudinary.config_snapshot().cloud_name)
+
+            cloudinary.config(api_key=API_KEY)
+            self.assertEqual(API_KEY, cloudinary.config_snapshot().api_key)
+            self.assertNotIn("_scope", vars(cloudinary.config_snapshot()))
+
+        self.assertEqual(version, cloudinary.config_version())
+        self.assertIs(global_snapshot, cloudinary.config_snapshot())
+
+    def test_config_context_nested_values(self):
+        cloudinary.reset_config()
+        cloudinary.config(auth_token={"key": "global_key", "duration": 300})
+
+        with cloudinary.config_context() as scoped:
+            scoped.auth_token["key"] = "scoped_key"
+            self.assertEqual("scoped_key", cloudinary.config().auth_token["key"])
+
+        self.assertEqual({"key": "global_key", "duration": 300}, cloudinary.config().auth_token)
+        cloudinary.reset_config()
+
+    def test_config_context_url_signature_cache(self):
+        cache = cloudinary.utils.url_signature_cache
+        try:
+            with cloudinary.config_context():
+                cloudinary.config(url_signature_cache_size=10)
+                self.assertEqual(10, cache.max_size)
+
+                cloudinary.utils.cloudinary_url("sample", sign_url=True)
+                self.assertEqual(1, len(cache))
+
+                cloudinary.config(api_secret=API_SECRET)
+                self.assertEqual(0, len(cache))
+        finally:
+            cloudinary.config(url_signature_cache_size=0)
+
+    def test_config_context_threads(self):
+        from cloudinary.api_client import batches
+
+        with cloudinary.config_context(cloud_name="tenant"):
+            cloud_names = [result for _, result in batches.run_concurrently(
+                lambda _: cloudinary.config().cloud_name, range(4), 2)]
+
+        self.assertEqual(["tenant"] * 4, cloud_names)
+
+    def _change_config_after_first_snapshot(self):
+        """Returns a config_snapshot replacement whose snapshots after the first one have other credentials"""
+        snapshots = []
+
+        def config_snapshot():
+            if not snapshots:
+                snapshots.append(cloudinary.ConfigSnapshot(vars(cloudinary.config()), cloudinary.config_version()))
+            else:
+                snapshots.append(cloudinary.ConfigSnapshot(dict(vars(snapshots[0]), cloud_name="other",
+                                                                api_key="other_key", api_secret="other_secret"),
+                                                           snapshots[0].version + 1))
+            return snapshots[-1]
+
+        return mock.patch("cloudinary.config_snapshot", side_effect=config_snapshot)
+
+    def test_url_single_snapshot(self):
+        cloudinary.reset_config()
+        cloudinary.config(cloud_name=CLOUD_NAME, api_key=API_KEY, api_secret=API_SECRET)
+        options = {"sign_url": True, "transformation": [{"width": 100}, {"angle": 5}], "responsive_width": True}
+
+        expected = utils.cloudinary_url("sample", **options)[0]
+
+        with self._change_config_after_first_snapshot():
+            self.assertEqual(expected, utils.cloudinary_url("sample", **options)[0])
+        with self._change_config_after_first_snapshot():
+            self.assertEqual([expected], utils.cloudinary_urls(["sample"], **options))
+
+    @mock.patch(URLLIB3_REQUEST)
+    def test_upload_single_snapshot(self, request_mock):
+        request_mock.return_value = uploader_response_mock()
+        cloudinary.reset_config()
+        cloudinary.config(cloud_name=CLOUD_NAME, api_key=API_KEY, api_secret=API_SECRET)
+
+        with self._change_config_after_first_snapshot():
+            uploader.upload(("sample.txt", b"data"), eager=[{"width": 100}], responsive_breakpoints={
+                "transformation": {"angle": 5}}, max_retries=1)
+
+        self.assertIn("/" + CLOUD_NAME + "/image/upload", request_mock.call_args[1]["url"])
+        params = get_params(request_mock)
+        self.assertEqual(API_KEY, params["api_key"])
+        signature = params.pop("signature")
+        params.pop("api_key")
+        params.pop("file")
+        self.assertEqual(utils.api_sign_request(params, API_SECRET), signature)
+
+    @mock.patch(URLLIB3_REQUEST)
+    def test_admin_api_single_snapshot(self, request_mock):
+        request_mock.return_value = api_response_mock()
+        cloudinary.reset_config()
+        cloudinary.config(cloud_name=CLOUD_NAME, api_key=API_KEY, api_secret=API_SECRET)
+
+        with self._change_config_after_first_snapshot():
+            api.ping()
+
+        self.assertIn("/" + CLOUD_NAME + "/ping", request_mock.call_args[1]["url"])
+        self.assertEqual(b"Basic " + base64.b64encode((API_KEY + ":" + API_SECRET).encode()),
+                         get_headers(request_mock)["authorization"].encode())
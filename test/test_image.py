@@ -8,7 +8,7 @@ from collections import OrderedDict
 import six
 
 import cloudinary
-from cloudinary import CloudinaryImage
+from cloudinary import CloudinaryImage, CloudinaryVideo
 from test.helper_test import mock
 
 
@@ -50,6 +50,30 @@ class ImageTest(unittest.TestCase):
         """should generate url """
         self.assertEqual(self.image.build_url(), '{url}/{id}'.format(**self.common_format))
 
+    def test_build_url_with_template(self):
+        """should generate url with a prepared url template """
+        template = cloudinary.utils.CloudinaryUrlTemplate(cloud_name=self.cloud_name, effect="sepia", sign_url=True)
+
+        self.assertEqual(self.image.build_url(template=template),
+                         self.image.build_url(effect="sepia", sign_url=True))
+        self.assertEqual(self.image.build_url(template=template, public_id="other", format="png"),
+                         cloudinary.utils.cloudinary_url("other", format="png", effect="sepia", sign_url=True)[0])
+
+    def test_build_url_with_template_errors(self):
+        """should not build urls with a url template of another resource type, type or with other options """
+        template = cloudinary.utils.CloudinaryUrlTemplate(cloud_name=self.cloud_name, effect="sepia")
+
+        with six.assertRaisesRegex(self, ValueError, "image/upload cannot build URLs of video/upload"):
+            CloudinaryVideo(self.public_id).build_url(template=template)
+        with six.assertRaisesRegex(self, ValueError, "image/upload cannot build URLs of image/private"):
+            CloudinaryImage(self.public_id, type="private").build_url(template=template)
+        with six.assertRaisesRegex(self, ValueError, "Options cannot be combined with a URL template: width"):
+            self.image.build_url(template=template, width=100)
+
+        video_template = cloudinary.utils.CloudinaryUrlTemplate(resource_type="video", effect="sepia")
+        self.assertEqual(CloudinaryVideo(self.public_id).build_url(template=video_template),
+                         CloudinaryVideo(self.public_id).build_url(effect="sepia"))
+
     def test_url(self):
         """should url property """
         self.assertEqual(self.image.url, '{url}/{id}'.format(**self.common_format))
@@ -0,0 +1,128 @@
+import json
+import threading
+import time
+import unittest
+from email.utils import formatdate
+
+from urllib3 import disable_warnings
+
+import cloudinary
+from cloudinary import api
+from cloudinary.api_client import paginator
+from cloudinary.exceptions import NotFound
+from test.helper_test import URLLIB3_REQUEST, api_response_mock, http_response_mock, get_params, parse_query_params, \
+    patch
+
+disable_warnings()
+
+
+def page_mock(items_key, items, next_cursor=None):
+    result = {items_key: items}
+    if next_cursor:
+        result["next_cursor"] = next_cursor
+    return api_response_mock(json.dumps(result))
+
+
+class PaginatorTest(unittest.TestCase):
+    def setUp(self):
+        cloudinary.reset_config()
+
+    @patch(URLLIB3_REQUEST)
+    def test_iter_resources(self, mocker):
+        """should iterate over the resources of all pages"""
+        mocker.side_effect = [
+            page_mock("resources", [{"public_id": "a"}, {"public_id": "b"}], "cursor1"),
+            page_mock("resources", [{"public_id": "c"}], "cursor2"),
+            page_mock("resources", []),
+        ]
+
+        public_ids = [r["public_id"] for r in api.iter_resources(type="upload", prefix="folder/")]
+
+        self.assertEqual(["a", "b", "c"], public_ids)
+        self.assertEqual(3, mocker.call_count)
+
+        params = [parse_query_params(c[1]["url"]) for c in mocker.call_args_list]
+        self.assertEqual([None, "cursor1", "cursor2"], [p.get("next_cursor") for p in params])
+        for p in params:
+            self.assertEqual("500", p["max_results"])
+            self.assertEqual("folder/", p["prefix"])
+        self.assertTrue(mocker.call_args_list[0][1]["url"].split("?")[0].endswith("/resources/image/upload"))
+
+    @patch(URLLIB3_REQUEST)
+    def test_iter_subfolders(self, mocker):
+        """should iterate over the items of each listing"""
+        mocker.side_effect = [
+            page_mock("folders", [{"path": "parent/a"}], "cursor1"),
+            page_mock("folders", [{"path": "parent/b"}]),
+        ]
+
+        folders = list(api.iter_subfolders("parent", max_results=1, prefetch=0))
+
+        self.assertEqual(["parent/a", "parent/b"], [f["path"] for f in folders])
+        self.assertEqual("1", get_params(mocker)["max_results"])
+
+    @patch(URLLIB3_REQUEST)
+    def test_prefetch(self, mocker):
+        """should fetch the next page while the current page is consumed"""
+        fetched = threading.Event()
+        pages = [page_mock("tags", ["tag{0}".format(i)], "cursor{0}".format(i)) for i in range(10)]
+
+        def side_effect(*args, **kwargs):
+            if mocker.call_count == 2:
+                fetched.set()
+            return pages[mocker.call_count - 1]
+
+        mocker.side_effect = side_effect
+
+        tags = api.iter_tags()
+        self.assertEqual("tag0", next(tags))
+
+        self.assertTrue(fetched.wait(5))
+        time.sleep(0.1)
+        self.assertEqual(2, mocker.call_count)
+
+        self.assertEqual("tag1", next(tags))
+        tags.close()
+
+    @patch(URLLIB3_REQUEST)
+    def test_errors(self, mocker):
+        """should raise the error of a page once the previous pages are consumed"""
+        mocker.side_effect = [
+            page_mock("transformations", [{"name": "t_1"}], "cursor1"),
+            http_response_mock('{"error": {"message": "Not found"}}', status=404),
+        ]
+
+        transformations = api.iter_transformations()
+
+        self.assertEqual("t_1", next(transformations)["name"])
+        with self.assertRaises(NotFound):
+            next(transformations)
+
+    @patch("cloudinary.api_client.paginator.time.sleep")
+    @patch(URLLIB3_REQUEST)
+    def test_rate_limit(self, mocker, sleep_mock):
+        """should wait for the rate limit to reset when it is exhausted"""
+        reset_at = formatdate(time.time() + 30, usegmt=True)
+        mocker.side_effect = [
+            http_response_mock('{"mappings": [{"folder": "a"}], "next_cursor": "cursor1"}',
+                               {"x-featureratelimit-remaining": "0", "x-featureratelimit-reset": reset_at}),
+            http_response_mock('{"mappings": [{"folder": "b"}]}',
+                               {"x-featureratelimit-remaining": "0", "x-featureratelimit-reset": reset_at}),
+        ]
+
+        self.assertEqual(["a", "b"], [m["folder"] for m in api.iter_upload_mappings(prefetch=0)])
+
+        self.assertEqual(1, sleep_mock.call_count)
+        self.assertAlmostEqual(30, sleep_mock.call_args[0][0], delta=2)
+
+    def test_wait_for_rate_limit(self):
+        """should not wait while the rate limit is not exhausted"""
+        with patch("cloudinary.api_client.paginator.time.sleep") as sleep_mock:
+            paginator.wait_for_rate_limit({})
+            paginator.wait_for_rate_limit(api_response_mock())
+
+        self.assertEqual(0, sleep_mock.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import time
+import unittest
+from email.utils import formatdate
+
+from urllib3 import disable_warnings
+
+import cloudinary
+from cloudinary import api
+from cloudinary.api_client import rate_limiter
+from test.helper_test import URLLIB3_REQUEST, http_response_mock, patch
+
+disable_warnings()
+
+
+def rate_limited_response_mock(allowed, remaining, reset_in):
+    return http_response_mock('{"status": "ok"}', {
+        "x-featureratelimit-limit": str(allowed),
+        "x-featureratelimit-remaining": str(remaining),
+        "x-featureratelimit-reset": formatdate(time.time() + reset_in, usegmt=True),
+    })
+
+
+@patch("time.sleep")
+class RateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        cloudinary.reset_config()
+        rate_limiter.reset()
+
+    def tearDown(self):
+        cloudinary.reset_config()
+        rate_limiter.reset()
+
+    def test_not_paced_until_learned(self, sleep):
+        """should not pace calls before the rate limit is known"""
+        limiter = rate_limiter.RateLimiter(burst=1)
+
+        for _ in range(5):
+            limiter.acquire()
+
+        sleep.assert_not_called()
+        self.assertIsNone(limiter.budget()["interval"])
+
+    def test_spread_remaining_calls(self, sleep):
+        """should spread the remaining calls until the rate limit resets, after the burst"""
+        limiter = rate_limiter.RateLimiter(burst=2)
+        limiter.update(rate_limited_response_mock(500, 100, 200))
+
+        budget = limiter.budget()
+        self.assertEqual(500, budget["allowed"])
+        self.assertEqual(100, budget["remaining"])
+        self.assertAlmostEqual(2, budget["interval"], delta=0.1)
+
+        for _ in range(4):
+            limiter.acquire()
+
+        delays = [c[0][0] for c in sleep.call_args_list]
+        self.assertEqual(2, len(delays))
+        self.assertAlmostEqual(2, delays[0], delta=0.1)
+        self.assertAlmostEqual(4, delays[1], delta=0.1)
+
+    def test_exhausted_rate_limit(self, sleep):
+        """should pace the calls from the reset once the rate limit is exhausted"""
+        limiter = rate_limiter.RateLimiter(burst=1)
+        limiter.update(rate_limited_response_mock(3600, 0, 30))
+
+        self.assertAlmostEqual(time.time() + 30, limiter.budget()["reset_at"], delta=1.1)
+
+        limiter.acquire()
+        limiter.acquire()
+
+        delays = [c[0][0] for c in sleep.call_args_list]
+        self.assertAlmostEqual(30, delays[0], delta=1.1)
+        self.assertAlmostEqual(delays[0] + 1, delays[1], delta=0.1)
+
+    @patch(URLLIB3_REQUEST)
+    def test_admin_api_calls(self, mocker, sleep):
+        """should learn the rate limit from the Admin API responses and pace the calls when enabled"""
+        mocker.return_value = rate_limited_response_mock(500, 0, 10)
+
+        api.ping()
+        api.ping()
+
+        sleep.assert_not_called()
+        self.assertEqual(0, rate_limiter.budget()["remaining"])
+        self.assertAlmostEqual(10, rate_limiter.budget()["delay"], delta=1.1)
+
+        cloudinary.config(rate_limiter=True)
+        api.ping()
+
+        self.assertAlmostEqual(10, sleep.call_args[0][0], delta=1.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import json
+import time
+import unittest
+from email.utils import formatdate
+from io import BytesIO
+
+from urllib3 import disable_warnings
+from urllib3.exceptions import NewConnectionError, ReadTimeoutError
+
+import cloudinary
+from cloudinary import api, uploader
+from cloudinary.api_client import retry
+from cloudinary.exceptions import GeneralError, RateLimited, Error
+from test.helper_test import URLLIB3_REQUEST, api_response_mock, http_response_mock, uploader_response_mock, patch
+
+disable_warnings()
+
+
+def error_mock(status, headers=None):
+    return http_response_mock(json.dumps({"error": {"message": "Error {0}".format(status)}}), headers, status)
+
+
+@patch("time.sleep")
+class RetryTest(unittest.TestCase):
+    def setUp(self):
+        cloudinary.reset_config()
+        cloudinary.config(max_retries=3)
+        retry.reset_stats()
+
+    def tearDown(self):
+        cloudinary.reset_config()
+
+    @patch(URLLIB3_REQUEST)
+    def test_retry_server_errors(self, mocker, sleep):
+        """should retry idempotent Admin API calls after server errors, backing off exponentially"""
+        mocker.side_effect = [error_mock(503), error_mock(500), api_response_mock()]
+
+        result = api.ping(retry_delay=2)
+
+        self.assertEqual("bar", result["foo"])
+        self.assertEqual(3, mocker.call_count)
+
+        delays = [c[0][0] for c in sleep.call_args_list]
+        self.assertEqual(2, len(delays))
+        self.assertTrue(1 <= delays[0] <= 2)
+        self.assertTrue(2 <= delays[1] <= 4)
+
+        stats = retry.stats()
+        self.assertEqual(2, stats["retries"])
+        self.assertEqual({"retries": 1, "exhausted": 0, "delay": delays[0]}, stats["by_reason"][503])
+
+    @patch(URLLIB3_REQUEST)
+    def test_no_retries_by_default(self, mocker, _):
+        """should not retry calls unless max_retries is configured"""
+        cloudinary.reset_config()
+        mocker.return_value = error_mock(503)
+
+        with self.assertRaises(GeneralError):
+            api.ping()
+
+        self.assertEqual(1, mocker.call_count)
+        self.assertEqual(0, retry.stats()["exhausted"])
+
+    @patch(URLLIB3_REQUEST)
+    def test_max_retries(self, mocker, _):
+        """should raise the error of the last attempt once the retries are exhausted"""
+        mocker.return_value = error_mock(503)
+
+        with self.assertRaises(GeneralError):
+            api.ping(max_retries=2)
+
+        self.assertEqual(3, mocker.call_count)
+        self.assertEqual(1, retry.stats()["exhausted"])
+
+    @patch(URLLIB3_REQUEST)
+    def test_non_idempotent_calls(self, mocker, _):
+        """should not retry non-idempotent calls after server errors"""
+        mocker.return_value = error_mock(500)
+
+        with self.assertRaises(GeneralError):
+            api.create_upload_preset(name="preset")
+
+        self.assertEqual(1, mocker.call_count)
+
+    @patch(URLLIB3_REQUEST)
+    def test_explicit(self, mocker, _):
+        """should retry explicit calls unless they send notifications or request add-ons"""
+        mocker.side_effect = [error_mock(500), uploader_response_mock()]
+
+        uploader.explicit("sample", type="upload", eager=[{"width": 100}])
+
+        self.assertEqual(2, mocker.call_count)
+
+        mocker.side_effect = [error_mock(500), uploader_response_mock()]
+
+        with self.assertRaises(Error):
+            uploader.explicit("sample", type="upload", notification_url="https://example.com/notify")
+
+        self.assertEqual(3, mocker.call_count)
+
+    @patch(URLLIB3_REQUEST)
+    def test_connection_errors(self, mocker, _):
+        """should retry any call that failed to connect, and only idempotent calls after other connection errors"""
+        mocker.side_effect = [NewConnectionError(None, "refused"), api_response_mock()]
+
+        self.assertEqual("bar", api.create_upload_preset(name="preset")["foo"])
+
+        mocker.side_effect = [ReadTimeoutError(None, None, "timed out"), api_response_mock()]
+
+        with self.assertRaises(GeneralError):
+            api.create_upload_preset(name="preset")
+
+        mocker.side_effect = [ReadTimeoutError(None, None, "timed out"), api_response_mock()]
+
+        self.assertEqual("bar", api.ping()["foo"])
+
+    @patch(URLLIB3_REQUEST)
+    def test_rate_limit_reset(self, mocker, sleep):
+        """should retry rate limited calls once the rate limit resets"""
+        reset_at = formatdate(time.time() + 10, usegmt=True)
+        mocker.side_effect = [error_mock(420, {"x-featureratelimit-reset": reset_at}), api_response_mock()]
+
+        api.create_upload_preset(name="preset")
+
+        self.assertEqual(2, mocker.call_count)
+        self.assertTrue(8 <= sleep.call_args[0][0] <= 10)
+
+    @patch(URLLIB3_REQUEST)
+    def test_retry_after(self, mocker, sleep):
+        """should wait as long as requested by the Retry-After header, unless it exceeds the maximal delay"""
+        mocker.side_effect = [error_mock(429, {"retry-after": "7"}), api_response_mock()]
+
+        api.ping()
+
+        sleep.assert_called_once_with(7)
+
+        mocker.side_effect = [error_mock(429, {"retry-after": "120"}), api_response_mock()]
+
+        with self.assertRaises(RateLimited):
+            api.ping()
+
+        self.assertEqual(1, retry.stats()["by_reason"][429]["exhausted"])
+
+    @patch(URLLIB3_REQUEST)
+    def test_upload_retries(self, mocker, _):
+        """should send the stream again when retrying an upload with a public ID"""
+        mocker.side_effect = [error_mock(500), uploader_response_mock()]
+        file = BytesIO(b"header" + b"data")
+        file.read(6)
+
+        uploader.upload(file, public_id="sample")
+
+        self.assertEqual(2, mocker.call_count)
+        for call in mocker.call_args_list:
+            self.assertEqual(b"data", dict(call[1]["fields"])["file"][1])
+
+        mocker.side_effect = [error_mock(500), uploader_response_mock()]
+
+        with self.assertRaises(Error):
+            uploader.upload(BytesIO(b"data"))
+
+        self.assertEqual(3, mocker.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,7 @@ from urllib3 import disable_warnings
 import cloudinary
 from cloudinary import uploader, SearchFolders, Search
 from test.helper_test import SUFFIX, TEST_IMAGE, TEST_TAG, UNIQUE_TAG, TEST_FOLDER, UNIQUE_TEST_FOLDER, \
-    retry_assertion, cleanup_test_resources_by_tag, URLLIB3_REQUEST, get_json_body, get_uri, patch
+    retry_assertion, cleanup_test_resources_by_tag, URLLIB3_REQUEST, get_json_body, get_uri, patch, api_response_mock
 from test.test_api import MOCK_RESPONSE, NEXT_CURSOR
 from test.test_config import CLOUD_NAME, API_KEY, API_SECRET
 
@@ -336,6 +336,49 @@ class SearchTest(unittest.TestCase):
 
         self.assertEqual({'expression': FOLDERS_SEARCH_EXPRESSION}, result)
 
+    @patch(URLLIB3_REQUEST)
+    def test_should_iterate_pages(self, mocker):
+        pages = [
+            {"resources": [{"public_id": "a"}, {"public_id": "b"}], "next_cursor": NEXT_CURSOR},
+            {"resources": [{"public_id": "c"}]},
+        ]
+        mocker.side_effect = [api_response_mock(json.dumps(page)) for page in pages]
+
+        results = Search() \
+            .expression("tags={0}".format(UNIQUE_TAG)) \
+            .sort_by("public_id", "asc") \
+            .iterate(page_size=2)
+
+        self.assertEqual(["a", "b", "c"], [r["public_id"] for r in results])
+        self.assertEqual(2, mocker.call_count)
+
+        queries = [json.loads(c[1]["body"]) for c in mocker.call_args_list]
+        self.assertEqual({"expression": "tags={0}".format(UNIQUE_TAG), "sort_by": [{"public_id": "asc"}],
+                          "max_results": 2}, queries[0])
+        self.assertEqual(dict(queries[0], next_cursor=NEXT_CURSOR), queries[1])
+
+    @patch(URLLIB3_REQUEST)
+    def test_should_iterate_pages_of_max_results(self, mocker):
+        mocker.return_value = api_response_mock(json.dumps({"resources": [{"public_id": "a"}]}))
+
+        list(Search().expression("tags={0}".format(UNIQUE_TAG)).max_results(10).iterate(prefetch=0))
+
+        self.assertEqual(10, get_json_body(mocker)["max_results"])
+
+        list(Search().expression("tags={0}".format(UNIQUE_TAG)).max_results(10).iterate(page_size=5, prefetch=0))
+
+        self.assertEqual(5, get_json_body(mocker)["max_results"])
+
+    @patch(URLLIB3_REQUEST)
+    def test_should_iterate_folders(self, mocker):
+        mocker.return_value = api_response_mock(json.dumps({"folders": [{"path": TEST_FOLDER}]}))
+
+        results = list(SearchFolders().expression(FOLDERS_SEARCH_EXPRESSION).iterate(prefetch=0))
+
+        self.assertEqual([{"path": TEST_FOLDER}], results)
+        self.assertTrue(get_uri(mocker).endswith('folders/search'))
+        self.assertEqual({'expression': FOLDERS_SEARCH_EXPRESSION, 'max_results': 500}, get_json_body(mocker))
+
     @unittest.skipUnless(cloudinary.config().api_secret, "requires api_key/api_secret")
     def test_should_search_folders(self):
 
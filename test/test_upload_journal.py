@@ -0,0 +1,96 @@
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import unittest
+
+from cloudinary import upload_journal
+from cloudinary.upload_journal import UploadJournal
+
+
+class UploadJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "journal", "upload_large_journal.json")
+
+        self.files = []
+        for index in range(8):
+            file_path = os.path.join(self.temp_dir, "file{0}.bin".format(index))
+            with open(file_path, "wb") as f:
+                f.write(b"data")
+            self.files.append(file_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_default_path(self):
+        """should keep the journal in the cache directory of the user by default"""
+        self.assertFalse(upload_journal.UPLOAD_JOURNAL_PATH.startswith(tempfile.gettempdir()))
+        self.assertEqual(upload_journal.UPLOAD_JOURNAL_PATH, UploadJournal().path)
+
+    def test_resume(self):
+        """should resume the journaled upload of a file"""
+        journal = UploadJournal(self.path)
+        upload = journal.open_upload(self.files[0], 4, 2)
+        upload.acknowledge(0, 1, "sample")
+
+        resumed = UploadJournal(self.path).open_upload(self.files[0], 4, 2)
+
+        self.assertEqual(upload.upload_id, resumed.upload_id)
+        self.assertEqual("sample", resumed.public_id)
+        self.assertTrue(resumed.is_acknowledged(0, 1))
+
+        resumed.complete()
+
+        self.assertNotEqual(upload.upload_id, journal.open_upload(self.files[0], 4, 2).upload_id)
+
+    def test_other_destination(self):
+        """should not resume the upload of a file to another destination"""
+        upload = UploadJournal(self.path).open_upload(self.files[0], 4, 2, ("cloud", "key", "raw", "upload", None))
+        upload.acknowledge(0, 1, "sample")
+
+        for destination in [("other_cloud", "key", "raw", "upload", None),
+                            ("cloud", "key", "video", "upload", None),
+                            ("cloud", "key", "raw", "upload", "other")]:
+            other = UploadJournal(self.path).open_upload(self.files[0], 4, 2, destination)
+
+            self.assertNotEqual(upload.upload_id, other.upload_id)
+            self.assertIsNone(other.public_id)
+            self.assertFalse(other.is_acknowledged(0, 1))
+
+        resumed = UploadJournal(self.path).open_upload(self.files[0], 4, 2, ("cloud", "key", "raw", "upload", None))
+        self.assertEqual(upload.upload_id, resumed.upload_id)
+
+    @unittest.skipIf(os.name == "nt", "POSIX permissions")
+    def test_private_files(self):
+        """should create the journal in a private directory, without leaving temporary files behind"""
+        UploadJournal(self.path).open_upload(self.files[0], 4, 2)
+
+        journal_dir = os.path.dirname(self.path)
+        self.assertEqual(0o700, stat.S_IMODE(os.stat(journal_dir).st_mode))
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.path).st_mode))
+        self.assertEqual(sorted(["upload_large_journal.json", "upload_large_journal.json.lock"]),
+                         sorted(os.listdir(journal_dir)))
+
+    def test_concurrent_journals(self):
+        """should keep the entries of all the journals sharing the file, as the ones of concurrent processes"""
+        def upload(file_path):
+            journal = UploadJournal(self.path)
+            for start in range(0, 20, 2):
+                journal.open_upload(file_path, 4, 2).acknowledge(start, start + 1, None)
+
+        threads = [threading.Thread(target=upload, args=(file_path,)) for file_path in self.files]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        journal = UploadJournal(self.path)
+        for file_path in self.files:
+            upload = journal.open_upload(file_path, 4, 2)
+            self.assertTrue(all(upload.is_acknowledged(start, start + 1) for start in range(0, 20, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
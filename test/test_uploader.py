@@ -1,24 +1,29 @@
 import io
 import json
 import os
+import re
+import shutil
 import tempfile
+import threading
+import time
 import unittest
 from collections import OrderedDict
 from datetime import datetime
 
 import six
+import urllib3
 from urllib3 import disable_warnings
 
 import cloudinary
 from cloudinary import api, uploader, utils, exceptions
 from cloudinary.cache import responsive_breakpoints_cache
 from cloudinary.cache.adapter.key_value_cache_adapter import KeyValueCacheAdapter
-from cloudinary.compat import urlparse, parse_qs
+from cloudinary.compat import urlparse, parse_qs, to_bytes
 from test.cache.storage.dummy_cache_storage import DummyCacheStorage
 from test.helper_test import uploader_response_mock, SUFFIX, TEST_IMAGE, get_params, get_headers, TEST_ICON, TEST_DOC, \
     REMOTE_TEST_IMAGE, UTC, populate_large_file, TEST_UNICODE_IMAGE, get_uri, get_method, get_param, \
     cleanup_test_resources_by_tag, cleanup_test_transformation, cleanup_test_resources, EVAL_STR, ON_SUCCESS_STR, \
-    URLLIB3_REQUEST, patch, retry_assertion, CldTestCase, http_response_mock
+    URLLIB3_REQUEST, patch, retry_assertion, CldTestCase, http_response_mock, MOCK_REQUEST_ID
 from test.test_utils import TEST_ID, TEST_FOLDER
 
 MOCK_RESPONSE = uploader_response_mock()
@@ -748,6 +753,60 @@ P9/AFGGFyjOXZtQAAAAAElFTkSuQmCC\
         info = api.resource(result["public_id"], context=True)
         self.assertFalse("context" in info)
 
+    @patch(URLLIB3_REQUEST)
+    def test_add_tag_batches(self, request_mock):
+        """Should split any number of public IDs into batches, signing each batch"""
+        def request_side_effect(*args, **kwargs):
+            public_ids = [v for k, v in kwargs["fields"] if k == "public_ids[]"]
+            if public_ids[0] == "id_1000":
+                return http_response_mock('{"error": {"message": "Invalid public ID"}}', status=400)
+            return http_response_mock(json.dumps({"public_ids": public_ids}))
+
+        request_mock.side_effect = request_side_effect
+
+        public_ids = ["id_{0}".format(i) for i in range(2500)]
+        result = uploader.add_tag(UNIQUE_TAG, (public_id for public_id in public_ids), max_workers=2)
+
+        self.assertEqual(3, request_mock.call_count)
+        self.assertEqual(sorted(public_ids[:1000] + public_ids[2000:]), sorted(result["public_ids"]))
+        self.assertEqual(1, len(result["failed_batches"]))
+        self.assertEqual(public_ids[1000:2000], result["failed_batches"][0]["public_ids"])
+        self.assertIsInstance(result["failed_batches"][0]["error"], exceptions.BadRequest)
+
+        for call in request_mock.call_args_list:
+            params = dict((k, v) for k, v in call[1]["fields"] if k != "public_ids[]")
+            self.assertEqual(UNIQUE_TAG, params["tag"])
+            self.assertEqual("add", params["command"])
+            self.assertIn("signature", params)
+
+    @patch(URLLIB3_REQUEST)
+    def test_add_tag_batches_result(self, request_mock):
+        """Should return the same result shape for any number of batches, raising only if all the batches fail"""
+        request_mock.return_value = http_response_mock('{"public_ids": ["id_1"]}', {"x-request-id": MOCK_REQUEST_ID})
+
+        for public_ids in (["id_1"], ["id_1", "id_2", "id_3"]):
+            result = uploader.add_tag(UNIQUE_TAG, public_ids, batch_size=2)
+
+            self.assertEqual(MOCK_REQUEST_ID, result["request_id"])
+            self.assertEqual([], result["failed_batches"])
+
+        request_mock.return_value = http_response_mock('{"error": {"message": "Invalid credentials"}}', status=401)
+
+        with self.assertRaises(exceptions.AuthorizationRequired):
+            uploader.add_tag(UNIQUE_TAG, ["id_{0}".format(i) for i in range(1001)])
+
+    @patch(URLLIB3_REQUEST)
+    def test_remove_all_context_single_batch(self, request_mock):
+        """Should send a single batch of public IDs as is, raising its errors"""
+        request_mock.return_value = http_response_mock('{"error": {"message": "Invalid public ID"}}', status=400)
+
+        with self.assertRaises(exceptions.BadRequest):
+            uploader.remove_all_context(["id_1", "id_2"], batch_size=2)
+
+        self.assertEqual(1, request_mock.call_count)
+        self.assertEqual(["id_1", "id_2"], get_params(request_mock)["public_ids"])
+        self.assertEqual("remove_all", get_param(request_mock, "command"))
+
     @unittest.skipUnless(cloudinary.config().api_secret, "requires api_key/api_secret")
     def test_manual_moderation(self):
         """Should support setting manual moderation status """
@@ -1022,6 +1081,290 @@ P9/AFGGFyjOXZtQAAAAAElFTkSuQmCC\
 
         self.assertEqual(rejected_seen["token"], rejected_seen["sent"])
 
+    def _run_upload_large_concurrently(self, side_effect, file_size, max_workers=3):
+        """Runs upload_large over an in-memory file with upload_large_part mocked, using max_workers threads"""
+        with io.BytesIO() as temp_file:
+            populate_large_file(temp_file, file_size)
+            with patch("cloudinary.uploader.upload_large_part") as part_mock:
+                part_mock.side_effect = side_effect
+                result = uploader.upload_large(temp_file, chunk_size=self._OAUTH_CHUNK_SIZE, max_workers=max_workers,
+                                               tags=[UNIQUE_TAG], resource_type="image")
+        return result, part_mock
+
+    def test_upload_large_concurrently(self):
+        """Should upload the middle chunks concurrently and send the final chunk last"""
+        file_size = self._OAUTH_CHUNK_SIZE * 6 + 100
+        lock = threading.Lock()
+        in_flight = {"current": 0, "max": 0}
+
+        def side_effect(file, http_headers=None, **options):
+            with lock:
+                in_flight["current"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["current"])
+            time.sleep(0.05)
+            with lock:
+                in_flight["current"] -= 1
+            return self._oauth_part_response()
+
+        result, part_mock = self._run_upload_large_concurrently(side_effect, file_size)
+
+        self.assertEqual(result, self._oauth_part_response())
+        self.assertEqual(part_mock.call_count, 7)
+        self.assertLessEqual(in_flight["max"], 3)
+        self.assertGreater(in_flight["max"], 1)
+
+        calls = part_mock.call_args_list
+        upload_ids = [c[1]["http_headers"]["X-Unique-Upload-Id"] for c in calls]
+        self.assertEqual(len(set(upload_ids)), 1)
+
+        ranges = [c[1]["http_headers"]["Content-Range"] for c in calls]
+        expected_ranges = ["bytes {0}-{1}/{2}".format(start, min(start + self._OAUTH_CHUNK_SIZE, file_size) - 1,
+                                                      file_size)
+                           for start in range(0, file_size, self._OAUTH_CHUNK_SIZE)]
+        self.assertEqual(ranges[0], expected_ranges[0])
+        self.assertEqual(ranges[-1], expected_ranges[-1])
+        self.assertCountEqual(ranges, expected_ranges)
+
+        self.assertEqual(sum(len(c[0][0][1]) for c in calls), file_size)
+        for c in calls[1:]:
+            self.assertEqual(c[1]["public_id"], "test_public_id")
+
+    def test_upload_large_concurrently_propagates_errors(self):
+        """Should stop uploading and propagate the error when a chunk fails"""
+        calls = {"n": 0}
+        lock = threading.Lock()
+
+        def side_effect(file, http_headers=None, **options):
+            with lock:
+                calls["n"] += 1
+                n = calls["n"]
+            if n == 3:
+                raise exceptions.BadRequest("bad request")
+            return self._oauth_part_response()
+
+        with self.assertRaises(exceptions.BadRequest):
+            self._run_upload_large_concurrently(side_effect, self._OAUTH_CHUNK_SIZE * 20)
+
+        self.assertLess(calls["n"], 20)
+
+    def test_upload_large_resume(self):
+        """Should resume an interrupted upload of a local file, skipping the acknowledged chunks"""
+        chunk_size = self._OAUTH_CHUNK_SIZE
+        file_size = chunk_size * 5 + 100
+        calls = {"n": 0}
+
+        def side_effect(file, http_headers=None, **options):
+            calls["n"] += 1
+            if calls["n"] == 3:
+                raise exceptions.Error("Socket error: connection reset")
+            return self._oauth_part_response()
+
+        journal_dir = tempfile.mkdtemp()
+        journal_path = os.path.join(journal_dir, "journal.json")
+        with tempfile.NamedTemporaryFile(suffix=".bmp") as temp_file:
+            populate_large_file(temp_file, file_size)
+
+            with patch("cloudinary.uploader.upload_large_part") as part_mock:
+                part_mock.side_effect = side_effect
+                with self.assertRaises(exceptions.Error):
+                    uploader.upload_large(temp_file.name, chunk_size=chunk_size, resume=True,
+                                          resume_journal=journal_path, tags=[UNIQUE_TAG])
+                interrupted_calls = part_mock.call_args_list
+
+            self.assertTrue(os.path.exists(journal_path))
+
+            with patch("cloudinary.uploader.upload_large_part") as part_mock:
+                part_mock.side_effect = side_effect
+                result = uploader.upload_large(temp_file.name, chunk_size=chunk_size, resume=True,
+                                               resume_journal=journal_path, tags=[UNIQUE_TAG])
+                resumed_calls = part_mock.call_args_list
+
+        self.assertEqual(result, self._oauth_part_response())
+
+        upload_ids = [c[1]["http_headers"]["X-Unique-Upload-Id"] for c in interrupted_calls + resumed_calls]
+        self.assertEqual(len(set(upload_ids)), 1)
+
+        ranges = [c[1]["http_headers"]["Content-Range"] for c in resumed_calls]
+        self.assertEqual(ranges, ["bytes {0}-{1}/{2}".format(start, min(start + chunk_size, file_size) - 1, file_size)
+                                  for start in range(2 * chunk_size, file_size, chunk_size)])
+        self.assertEqual(resumed_calls[0][1]["public_id"], "test_public_id")
+
+        with open(journal_path) as journal_file:
+            self.assertEqual({}, json.load(journal_file))
+        shutil.rmtree(journal_dir)
+
+    def test_upload_large_resume_other_destination(self):
+        """Should not resume an interrupted upload of a file to another cloud or public ID"""
+        chunk_size = self._OAUTH_CHUNK_SIZE
+        file_size = chunk_size * 3 + 100
+        calls = {"n": 0}
+
+        def side_effect(file, http_headers=None, **options):
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise exceptions.Error("Socket error: connection reset")
+            return self._oauth_part_response()
+
+        journal_dir = tempfile.mkdtemp()
+        journal_path = os.path.join(journal_dir, "journal.json")
+        try:
+            with tempfile.NamedTemporaryFile(suffix=".bmp") as temp_file:
+                populate_large_file(temp_file, file_size)
+
+                with patch("cloudinary.uploader.upload_large_part") as part_mock:
+                    part_mock.side_effect = side_effect
+                    with self.assertRaises(exceptions.Error):
+                        uploader.upload_large(temp_file.name, chunk_size=chunk_size, resume=True,
+                                              resume_journal=journal_path, tags=[UNIQUE_TAG])
+                    interrupted_calls = part_mock.call_args_list
+
+                with patch("cloudinary.uploader.upload_large_part") as part_mock:
+                    part_mock.return_value = self._oauth_part_response()
+                    uploader.upload_large(temp_file.name, chunk_size=chunk_size, resume=True,
+                                          resume_journal=journal_path, cloud_name="other_cloud",
+                                          public_id="other_public_id", tags=[UNIQUE_TAG])
+                    other_calls = part_mock.call_args_list
+        finally:
+            shutil.rmtree(journal_dir)
+
+        self.assertNotEqual(interrupted_calls[0][1]["http_headers"]["X-Unique-Upload-Id"],
+                            other_calls[0][1]["http_headers"]["X-Unique-Upload-Id"])
+        self.assertEqual(4, len(other_calls))
+        self.assertEqual("bytes 0-{0}/{1}".format(chunk_size - 1, file_size),
+                         other_calls[0][1]["http_headers"]["Content-Range"])
+        self.assertEqual("other_public_id", other_calls[0][1]["public_id"])
+
+    @patch(URLLIB3_REQUEST)
+    def test_upload_streams_large_files(self, request_mock):
+        """Should stream files above the streaming threshold with a precomputed Content-Length"""
+        request_mock.return_value = MOCK_RESPONSE
+        bodies = []
+
+        def request_side_effect(*args, **kwargs):
+            body = kwargs.get("body")
+            if body is not None:
+                bodies.append(b"".join(iter(lambda: bytes(body.read(1000)), b"")))
+            return MOCK_RESPONSE
+
+        request_mock.side_effect = request_side_effect
+
+        with patch("cloudinary.uploader.UPLOAD_STREAMING_THRESHOLD", 1024):
+            with tempfile.NamedTemporaryFile(suffix=".bmp") as temp_file:
+                populate_large_file(temp_file, 5000)
+                uploader.upload(temp_file.name, tags=[UNIQUE_TAG])
+
+            with io.BytesIO() as small_file:
+                populate_large_file(small_file, 500)
+                uploader.upload(small_file, tags=[UNIQUE_TAG])
+
+        self.assertIsNone(request_mock.call_args_list[0][1].get("fields"))
+        headers = request_mock.call_args_list[0][1]["headers"]
+        self.assertTrue(headers["Content-Type"].startswith("multipart/form-data; boundary="))
+        self.assertEqual(int(headers["Content-Length"]), len(bodies[0]))
+        self.assertIn(b'name="file"; filename="' + to_bytes(temp_file.name) + b'"', bodies[0])
+        self.assertIn(b'name="tags"', bodies[0])
+
+        # files below the threshold are sent as regular fields
+        self.assertEqual(1, len(bodies))
+        self.assertEqual(get_param(request_mock, "tags"), UNIQUE_TAG)
+
+    @unittest.skipIf(os.name == "nt", "quotes and newlines in file names")
+    @patch(URLLIB3_REQUEST)
+    def test_upload_streamed_file_name(self, request_mock):
+        """Should send the same file name for streamed files as for files sent as regular fields"""
+        bodies = []
+
+        def request_side_effect(*args, **kwargs):
+            body = kwargs.get("body")
+            if body is not None:
+                bodies.append(b"".join(iter(lambda: bytes(body.read(1000)), b"")))
+            return MOCK_RESPONSE
+
+        request_mock.side_effect = request_side_effect
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            file_path = os.path.join(temp_dir, 'quote"d\nname.bmp')
+            with open(file_path, "wb") as f:
+                populate_large_file(f, 5000)
+
+            uploader.upload(file_path, tags=[UNIQUE_TAG])
+            with patch("cloudinary.uploader.UPLOAD_STREAMING_THRESHOLD", 1024):
+                uploader.upload(file_path, tags=[UNIQUE_TAG])
+                uploader.upload(file_path, tags=[UNIQUE_TAG], filename="custom.bmp")
+        finally:
+            shutil.rmtree(temp_dir)
+
+        regular_body = urllib3.encode_multipart_formdata(request_mock.call_args_list[0][1]["fields"],
+                                                         boundary="boundary")[0]
+        disposition = re.search(b'name="file"; filename="[^"]*"', regular_body).group(0)
+
+        self.assertIn(to_bytes(temp_dir), disposition)
+        self.assertIn(disposition, bodies[0])
+        self.assertIn(b'name="file"; filename="custom.bmp"', bodies[1])
+
+    @patch(URLLIB3_REQUEST)
+    def test_upload_many(self, request_mock):
+        """Should upload files concurrently, yielding the result or the exception of each file"""
+        lock = threading.Lock()
+        in_flight = {"current": 0, "max": 0}
+
+        def request_side_effect(*args, **kwargs):
+            with lock:
+                in_flight["current"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["current"])
+            time.sleep(0.05)
+            with lock:
+                in_flight["current"] -= 1
+
+            if dict(kwargs["fields"])["file"][0] == "invalid":
+                return http_response_mock('{"error": {"message": "Invalid public ID"}}', status=400)
+            return MOCK_RESPONSE
+
+        request_mock.side_effect = request_side_effect
+
+        files = [("{0}_{1}".format(UNIQUE_ID, i), b"data") for i in range(7)] + [("invalid", b"data")]
+
+        results = dict(uploader.upload_many(iter(files), max_workers=3, tags=[UNIQUE_TAG]))
+
+        self.assertEqual(sorted(files), sorted(results))
+        self.assertIsInstance(results.pop(("invalid", b"data")), exceptions.BadRequest)
+        for result in results.values():
+            self.assertEqual("bar", result["foo"])
+
+        self.assertLessEqual(in_flight["max"], 3)
+        self.assertGreater(in_flight["max"], 1)
+
+    @patch(URLLIB3_REQUEST)
+    def test_upload_many_rate_limited(self, request_mock):
+        """Should retry rate limited uploads of upload_many"""
+        request_mock.side_effect = [http_response_mock('{"error": {"message": "Rate limit exceeded"}}', status=420),
+                                    MOCK_RESPONSE]
+
+        with patch("cloudinary.uploader.UPLOAD_MANY_RATE_LIMIT_DELAY", 0.01):
+            with io.BytesIO(b"data") as stream:
+                results = list(uploader.upload_many([stream], tags=[UNIQUE_TAG]))
+
+        self.assertEqual(1, len(results))
+        self.assertEqual("bar", results[0][1]["foo"])
+        self.assertEqual(2, request_mock.call_count)
+        self.assertEqual(get_params(request_mock)["file"], ("stream", b"data"))
+
+    @patch(URLLIB3_REQUEST)
+    def test_upload_many_large_files(self, request_mock):
+        """Should upload files larger than UPLOAD_LARGE_CHUNK_SIZE in chunks"""
+        request_mock.return_value = MOCK_RESPONSE
+
+        with patch("cloudinary.uploader.UPLOAD_LARGE_CHUNK_SIZE", 1024):
+            with tempfile.NamedTemporaryFile(suffix=".bmp") as temp_file, io.BytesIO(b"data") as small_file:
+                populate_large_file(temp_file, 3000)
+                results = list(uploader.upload_many([temp_file.name, small_file], tags=[UNIQUE_TAG]))
+
+        self.assertEqual(2, len(results))
+        ranges = [c[1]["headers"].get("Content-Range") for c in request_mock.call_args_list]
+        self.assertEqual(4, len(ranges))
+        self.assertEqual(3, len([r for r in ranges if r]))
+
     @patch(URLLIB3_REQUEST)
     @unittest.skipUnless(cloudinary.config().api_secret, "requires api_key/api_secret")
     def test_upload_preset(self, mocker):
@@ -1640,6 +1640,219 @@ class TestUtils(unittest.TestCase):
         signature = api_sign_request(params, API_SIGN_REQUEST_TEST_SECRET)
         self.assertEqual(signature, "14c00ba6d0dfdedbc86b316847d95b9e6cd46d94")
 
+    def test_transformation_cache(self):
+        """should cache generated transformations and keep the leftover options of each call"""
+        cache = cloudinary.utils.transformation_cache
+        cache.clear()
+        hits = cache.hits
+
+        options = {"width": "auto", "crop": "scale", "html_width": 10}
+        first = generate_transformation_string(**options)
+        second = generate_transformation_string(**dict(options, html_width=20))
+        third = generate_transformation_string(**options)
+
+        self.assertEqual(("c_scale,w_auto", {"html_width": 10, "responsive": True}), first)
+        self.assertEqual(("c_scale,w_auto", {"html_width": 20, "responsive": True}), second)
+        self.assertEqual(first, third)
+        self.assertEqual(hits + 2, cache.hits)
+        self.assertEqual({"width": "auto", "crop": "scale", "html_width": 10}, options)
+
+    def test_transformation_cache_url_options(self):
+        """should share cached transformations between assets, keyed without the URL options"""
+        cache = cloudinary.utils.transformation_cache
+        cache.clear()
+        hits = cache.hits
+
+        for version in range(1, 11):
+            expected = "http://res.cloudinary.com/test123/image/upload/c_fill,w_100/v{0}/sample{0}".format(version)
+            self.assertEqual(expected, cloudinary.CloudinaryImage("sample{0}".format(version), version=version)
+                             .build_url(width=100, crop="fill"))
+            cloudinary_url("sample", width=100, crop="fill", sign_url=True, api_secret="TOPSECRET",
+                           auth_token={"key": "00112233FF99", "duration": 300})
+
+        self.assertEqual(1, len(cache))
+        self.assertEqual(hits + 19, cache.hits)
+        for key in cache._data:
+            self.assertNotIn("TOPSECRET", str(key))
+            self.assertNotIn("00112233FF99", str(key))
+
+    def test_transformation_cache_leftover_order(self):
+        """should keep the leftover options in order, with the values produced by the transformation"""
+        options = {"html_width": 10, "width": "auto", "responsive": False, "crop": "scale", "size": None}
+        for _ in range(2):
+            transformation, leftover = generate_transformation_string(**options)
+            self.assertEqual("c_scale,w_auto", transformation)
+            self.assertEqual([("html_width", 10), ("responsive", True)], list(leftover.items()))
+
+    def test_transformation_cache_value_types(self):
+        """should not mix up cached transformations of equal values of different types"""
+        self.assertEqual("w_1", generate_transformation_string(width=1)[0])
+        self.assertEqual("w_1.0", generate_transformation_string(width=1.0)[0])
+        self.assertEqual("e_sepia:50", generate_transformation_string(effect=["sepia", 50])[0])
+        self.assertEqual("e_('sepia',_50)", generate_transformation_string(effect=("sepia", 50))[0])
+
+    def test_transformation_cache_config(self):
+        """should not use cached transformations generated with a different configuration"""
+        self.assertEqual("c_scale,w_100", generate_transformation_string(width=100, crop="scale")[0])
+
+        cloudinary.config(dpr=2)
+        try:
+            self.assertEqual("c_scale,dpr_2,w_100", generate_transformation_string(width=100, crop="scale")[0])
+        finally:
+            cloudinary.config(dpr=None)
+
+    def test_transformation_cache_size_option(self):
+        """should cache the width and height derived from the size option"""
+        for _ in range(2):
+            self.assertEqual(("c_scale,h_20,w_10", {"width": "10", "height": "20"}),
+                             generate_transformation_string(size="10x20", crop="scale"))
+
+    def test_cloudinary_urls(self):
+        """should generate the same URLs as cloudinary_url"""
+        sources = ["sample", "folder/sample", ("sample", 1234, "png"), ("folder/sample", None, "jpg"),
+                   FETCH_URL, "", None]
+        options_list = [
+            {},
+            {"width": 100, "crop": "scale", "format": "webp"},
+            {"sign_url": True, "transformation": [API_TEST_TRANS_SCALE100, API_TEST_TRANS_SEPIA]},
+            {"sign_url": True, "long_url_signature": True, "version": 4321},
+            {"cdn_subdomain": True, "secure": True},
+            {"cdn_subdomain": True, "private_cdn": True},
+            {"cname": "example.com", "cdn_subdomain": True},
+            {"url_suffix": "hello", "private_cdn": True},
+            {"type": "fetch", "format": "png"},
+            {"use_fetch_format": True, "width": 50},
+            {"sign_url": True, "auth_token": {"key": "00112233FF99", "duration": 300, "start_time": 11111111}},
+        ]
+
+        for options in options_list:
+            expected = []
+            for source in sources:
+                source_options = dict(options)
+                if isinstance(source, tuple):
+                    source, version, file_format = source
+                    if version is not None:
+                        source_options["version"] = version
+                    source_options["format"] = file_format
+                expected.append(cloudinary_url(source, **source_options)[0])
+
+            self.assertEqual(expected, cloudinary.utils.cloudinary_urls(sources, **options), options)
+
+    def test_cloudinary_urls_errors(self):
+        """should raise the errors of cloudinary_url only when building URLs"""
+        self.assertEqual([], cloudinary.utils.cloudinary_urls([], url_suffix="hello", type="private"))
+        self.assertEqual([FETCH_URL], cloudinary.utils.cloudinary_urls([FETCH_URL], url_suffix="hello/world"))
+
+        with six.assertRaisesRegex(self, ValueError, "URL Suffix only supported"):
+            cloudinary.utils.cloudinary_urls(["sample"], url_suffix="hello", type="private")
+        with six.assertRaisesRegex(self, ValueError, "Must supply api_secret"):
+            cloudinary.utils.cloudinary_urls(["sample"], sign_url=True, api_secret=None)
+
+    def test_cloudinary_url_template(self):
+        """should generate the same URLs as cloudinary_url with the options frozen in the template"""
+        options = {"width": 100, "crop": "scale", "sign_url": True, "cdn_subdomain": True, "secure": True}
+        template = cloudinary.utils.CloudinaryUrlTemplate(**options)
+
+        for source, version in [("sample", None), ("folder/sample", None), ("sample", 1234)]:
+            self.assertEqual(cloudinary_url(source, version=version, **options)[0], template.url(source, version))
+
+        self.assertEqual(cloudinary_url("sample", format="png", **options)[0], template.url("sample", format="png"))
+
+        # configuration changes do not affect existing templates
+        expected = template.url("sample")
+        cloudinary.config(cloud_name="test321")
+        self.assertEqual(expected, template.url("sample"))
+
+    def test_cloudinary_url_template_fetch_format(self):
+        """should deliver the format of each asset in the transformation, as cloudinary_url does"""
+        for options in [{"width": 100, "use_fetch_format": True},
+                        {"width": 100, "use_fetch_format": True, "format": "jpg", "sign_url": True},
+                        {"width": 100, "use_fetch_format": True, "fetch_format": "auto"},
+                        {"type": "fetch", "width": 100}]:
+            template = cloudinary.utils.CloudinaryUrlTemplate(**options)
+
+            for source, version, file_format in [("sample", None, "png"), ("sample", 1234, "webp"),
+                                                 ("sample", None, None), (FETCH_URL, None, "png")]:
+                source_options = dict(options, version=version)
+                if file_format is not None:
+                    source_options["format"] = file_format
+                expected = cloudinary_url(source, **source_options)[0]
+                self.assertEqual(expected, template.url(source, version, file_format), options)
+
+        template = cloudinary.utils.CloudinaryUrlTemplate(width=100, use_fetch_format=True)
+        expected = template.url("sample", format="png")
+        cloudinary.config(cloud_name="test321")
+        self.assertEqual(expected, template.url("sample", format="png"))
+        self.assertIs(template._format_template("png"), template._format_template("png"))
+
+    def test_cloudinary_url_template_errors(self):
+        """should raise errors of invalid or missing options when the template is created"""
+        with six.assertRaisesRegex(self, ValueError, "Must supply api_secret"):
+            cloudinary.utils.CloudinaryUrlTemplate(sign_url=True, api_secret=None)
+        with six.assertRaisesRegex(self, ValueError, "Must supply cloud_name"):
+            cloudinary.utils.CloudinaryUrlTemplate(cloud_name=None)
+
+    def test_smart_escape(self):
+        """should escape unsafe characters with the default and custom unsafe patterns"""
+        smart_escape = cloudinary.utils.smart_escape
+
+        self.assertEqual("folder/sample_1.jpg", smart_escape("folder/sample_1.jpg"))
+        self.assertEqual("http://example.com/a%20b%3Fc%3Dd", smart_escape("http://example.com/a b?c=d"))
+        self.assertEqual("%D7%90%D7%91%20%C3%BC%7E", smart_escape(u"\u05d0\u05d1 \u00fc~"))
+        self.assertEqual("a%2Cb%2Fc d", smart_escape("a,b/c d", r"([,/])"))
+        self.assertEqual(u"\u00fc%2F", smart_escape(u"\u00fc/", r"([,/])"))
+
+    def test_url_signature_cache(self):
+        """should cache URL signatures when enabled, keyed without the api_secret"""
+        cache = cloudinary.utils.url_signature_cache
+        expected = cloudinary_url("sample", sign_url=True, width=10)[0]
+
+        cloudinary.config(url_signature_cache_size=10)
+        try:
+            hits = cache.hits
+            self.assertEqual(expected, cloudinary_url("sample", sign_url=True, width=10)[0])
+            self.assertEqual(expected, cloudinary_url("sample", sign_url=True, width=10)[0])
+            self.assertEqual(hits + 1, cache.hits)
+            self.assertEqual(1, len(cache))
+            for key in cache._data:
+                self.assertNotIn("b", key[1:])
+
+            cloudinary.config(api_secret="c")
+            self.assertEqual(0, len(cache))
+            self.assertNotEqual(expected, cloudinary_url("sample", sign_url=True, width=10)[0])
+            self.assertEqual(expected, cloudinary_url("sample", sign_url=True, width=10, api_secret="b")[0])
+        finally:
+            cloudinary.config(url_signature_cache_size=0)
+
+    def test_distribution_prefixes(self):
+        """should precompute one download URL prefix per CDN shard"""
+        prefixes = cloudinary.utils.distribution_prefixes("test123", False, True, None, None, False, None)
+        self.assertEqual(tuple("http://res-%d.cloudinary.com/test123" % shard for shard in range(1, 6)), prefixes)
+        self.assertEqual("http://res-4.cloudinary.com/test123", cloudinary.utils.shard_prefix(prefixes, "sample.jpg"))
+
+        self.assertEqual(("http://res.cloudinary.com/test123",),
+                         cloudinary.utils.distribution_prefixes("test123", False, False, None, None, False, None))
+
+    @unittest.skipUnless(six.PY3, "memoryview slices of the mapping require Python 3")
+    def test_mapped_file(self):
+        """should read memory-mapped chunks of a local file without copying them"""
+        with tempfile.NamedTemporaryFile() as temp_file:
+            temp_file.write(b"0123456789")
+            temp_file.flush()
+
+            with cloudinary.utils.MappedFile(temp_file.name) as mapped_file:
+                self.assertEqual(temp_file.name, mapped_file.name)
+                self.assertEqual(10, cloudinary.utils.file_io_size(mapped_file))
+
+                chunk = mapped_file.read(4)
+                self.assertIsInstance(chunk, memoryview)
+                self.assertEqual(b"0123", chunk.tobytes())
+                self.assertEqual(b"456789", mapped_file.read().tobytes())
+                self.assertFalse(mapped_file.read(4))
+
+            self.assertTrue(mapped_file.closed)
+            self.assertRaises(ValueError, chunk.tobytes)
+
 
 if __name__ == '__main__':
     unittest.main()